@@ -0,0 +1,31 @@
+"""Add composite index for label keyset pagination
+
+Revision ID: 3b9e2f4c6a10
+Revises: fd14238728a8
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e2f4c6a10"
+down_revision: Union[str, None] = "fd14238728a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ラベル一覧 (family_id で絞り込み、(name, id) 順) のキーセットページネーション用
+    op.create_index(
+        "ix_label_family_id_name_id",
+        "label",
+        ["family_id", "name", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_label_family_id_name_id", table_name="label")
@@ -0,0 +1,31 @@
+"""Add (family_id, next_occurrence_date) index for the agenda
+
+Revision ID: 5f0b3d8e9a21
+Revises: c2e7a9d4f613
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f0b3d8e9a21"
+down_revision: Union[str, None] = "c2e7a9d4f613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # アジェンダ (次回発生日が期間内の定常タスク) 用
+    op.create_index(
+        "ix_task_family_id_next_occurrence_date",
+        "task",
+        ["family_id", "next_occurrence_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_family_id_next_occurrence_date", table_name="task")
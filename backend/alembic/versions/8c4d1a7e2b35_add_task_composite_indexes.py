@@ -0,0 +1,66 @@
+"""Add composite and partial indexes for task list queries
+
+Revision ID: 8c4d1a7e2b35
+Revises: 3b9e2f4c6a10
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4d1a7e2b35"
+down_revision: Union[str, None] = "3b9e2f4c6a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 家族のタスク一覧 (期日順)
+    op.create_index(
+        "ix_task_family_id_due_date",
+        "task",
+        ["family_id", "due_date", "id"],
+        unique=False,
+    )
+    # 家族のタスク一覧 (完了状態で絞り込み、期日順)
+    op.create_index(
+        "ix_task_family_id_is_done_due_date",
+        "task",
+        ["family_id", "is_done", "due_date", "id"],
+        unique=False,
+    )
+    # 担当者ごとのタスク一覧 (完了状態で絞り込み、期日順)
+    op.create_index(
+        "ix_task_assignee_id_is_done_due_date",
+        "task",
+        ["assignee_id", "is_done", "due_date"],
+        unique=False,
+    )
+    # 家族のタスク一覧 (作成日時順)
+    op.create_index(
+        "ix_task_family_id_created_at",
+        "task",
+        ["family_id", "created_at", "id"],
+        unique=False,
+    )
+    # 未完了タスクの優先度順一覧 (部分インデックス)
+    op.create_index(
+        "ix_task_open_family_id_priority",
+        "task",
+        ["family_id", "priority", "due_date"],
+        unique=False,
+        postgresql_where=sa.text("is_done = false"),
+        sqlite_where=sa.text("is_done = 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_open_family_id_priority", table_name="task")
+    op.drop_index("ix_task_family_id_created_at", table_name="task")
+    op.drop_index("ix_task_assignee_id_is_done_due_date", table_name="task")
+    op.drop_index("ix_task_family_id_is_done_due_date", table_name="task")
+    op.drop_index("ix_task_family_id_due_date", table_name="task")
@@ -0,0 +1,30 @@
+"""Add family.cache_version for the family-versioned response cache
+
+Revision ID: a4d8c1f5e7b2
+Revises: 5f0b3d8e9a21
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8c1f5e7b2"
+down_revision: Union[str, None] = "5f0b3d8e9a21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 家族のデータを書き込むたびに増えるバージョン番号 (既存の行は 0 から始める)
+    op.add_column(
+        "family",
+        sa.Column("cache_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("family", "cache_version")
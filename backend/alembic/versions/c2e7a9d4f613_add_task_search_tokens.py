@@ -0,0 +1,129 @@
+"""Add task.search_tokens and full-text search index
+
+Revision ID: c2e7a9d4f613
+Revises: 8c4d1a7e2b35
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+import unicodedata
+from typing import List, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e7a9d4f613"
+down_revision: Union[str, None] = "8c4d1a7e2b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# --- このリビジョン時点のDDLとトークン分割の複製 ---
+# マイグレーションはアプリのコード (app.models.task / app.core.text_search) を
+# インポートしない。後でアプリ側を変更しても、このリビジョンの結果は変わらない。
+
+TASK_SEARCH_TSVECTOR = "to_tsvector('simple'::regconfig, COALESCE(search_tokens, ''))"
+
+TASK_FTS_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts "
+    "USING fts5(search_tokens, content='task', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, search_tokens) VALUES (new.id, new.search_tokens); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, search_tokens) "
+    "VALUES ('delete', old.id, old.search_tokens); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au "
+    "AFTER UPDATE OF search_tokens ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, search_tokens) "
+    "VALUES ('delete', old.id, old.search_tokens); "
+    "INSERT INTO task_fts(rowid, search_tokens) VALUES (new.id, new.search_tokens); "
+    "END",
+]
+
+
+def _bigram_tokens(text: Optional[str]) -> List[str]:
+    # NFKC + casefold で正規化し、文字・数字の区間ごとに文字バイグラムに分割する
+    # (1文字だけの区間はそのまま。重複は除き、出現順を保つ)
+    if not text:
+        return []
+    tokens: List[str] = []
+    run: List[str] = []
+    for char in unicodedata.normalize("NFKC", text).casefold() + " ":
+        if unicodedata.category(char)[0] in ("L", "N"):
+            run.append(char)
+            continue
+        if len(run) == 1:
+            tokens.append(run[0])
+        tokens.extend(run[i] + run[i + 1] for i in range(len(run) - 1))
+        run = []
+    return list(dict.fromkeys(tokens))
+
+
+def _build_search_tokens(*texts: Optional[str]) -> str:
+    tokens: List[str] = []
+    for text in texts:
+        tokens.extend(_bigram_tokens(text))
+    return " ".join(dict.fromkeys(tokens))
+
+
+def upgrade() -> None:
+    op.add_column("task", sa.Column("search_tokens", sa.TEXT(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # 既存行はバックフィル時の UPDATE トリガーで FTS5 に登録される
+        for statement in TASK_FTS_SQLITE_DDL:
+            op.execute(statement)
+
+    # 既存タスクの検索用トークンを作成 (このリビジョン時点のアプリと同じ分割処理)
+    task = sa.table(
+        "task",
+        sa.column("id", sa.Integer),
+        sa.column("title", sa.String),
+        sa.column("notes", sa.TEXT),
+        sa.column("search_tokens", sa.TEXT),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(task.c.id, task.c.title, task.c.notes)
+            .where(task.c.id > last_id)
+            .order_by(task.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            task.update()
+            .where(task.c.id == sa.bindparam("task_id"))
+            .values(search_tokens=sa.bindparam("tokens")),
+            [
+                {
+                    "task_id": row.id,
+                    "tokens": _build_search_tokens(row.title, row.notes) or None,
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            f"CREATE INDEX ix_task_search_tokens_gin "
+            f"ON task USING gin ({TASK_SEARCH_TSVECTOR})"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_task_search_tokens_gin")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("task_fts_ai", "task_fts_ad", "task_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS task_fts")
+    op.drop_column("task", "search_tokens")
@@ -1,28 +1,47 @@
 from typing import Annotated
 
-# Userモデルをインポート (ダミーユーザー作成と型ヒント用)
+from fastapi import Depends, Path
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# 仮の認証関数は app/core/security.py に定義 (テスト等からは従来通りここから参照できる)
+from app.core.security import get_current_active_user
+from app.db.session import get_db, get_read_db
 from app.models.user import User
-from fastapi import Depends
+from app.services.common import FamilyContext, resolve_family_context
+
 
+# FastAPIの Depends で使いやすくするために Annotated を使う (任意)
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
 
-# --- 仮の認証用 依存関係 ---
-async def get_current_active_user() -> User:
+
+# --- 家族スコープの認可 依存関係 ---
+async def get_family_context(
+    *,
+    family_id: int = Path(..., title="The ID of the family"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser,
+) -> FamilyContext:
     """
-    現在のログインユーザーを取得する仮の依存関係。
-    将来的には実際のOIDCトークン検証ロジックに置き換える。
-    現時点では、テスト用に固定のダミーユーザーを返すか、
-    あるいは未認証エラーを発生させる。
+    パスの family_id を解決し、現在のユーザーがメンバーであることを確認する依存関係。
+    家族とロールを1回のJOINクエリ (またはキャッシュ) で取得し、Service層へ渡す。
     """
-    print("警告: 仮の認証関数 get_current_active_user が使用されています。")
-    # ここでは、開発・テストしやすいようにID=1のダミーユーザーを返すことにします
-    # 必要に応じて raise HTTPException(status_code=401) に変更してください
-    return User(
-        id=1,
-        oidc_subject="dummy_oidc|123",
-        name="ダミーユーザー",
-        email="dummy@example.com",
-    )
+    return await resolve_family_context(db, family_id=family_id, user=current_user)
 
 
-# FastAPIの Depends で使いやすくするために Annotated を使う (任意)
-CurrentUser = Annotated[User, Depends(get_current_active_user)]
+CurrentFamily = Annotated[FamilyContext, Depends(get_family_context)]
+
+
+async def get_read_family_context(
+    *,
+    family_id: int = Path(..., title="The ID of the family"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: CurrentUser,
+) -> FamilyContext:
+    """
+    get_family_context の参照系エンドポイント版。
+    読み取り専用セッション (get_read_db) で認可クエリを実行する。
+    """
+    return await resolve_family_context(db, family_id=family_id, user=current_user)
+
+
+CurrentFamilyReadOnly = Annotated[FamilyContext, Depends(get_read_family_context)]
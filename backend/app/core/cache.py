@@ -0,0 +1,292 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+from app.core.config import settings
+
+ValueType = TypeVar("ValueType")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[ValueType]):
+    """
+    サイズ上限 (LRU) と有効期限 (TTL) 付きのシンプルなインメモリキャッシュ。
+    プロセス内でのみ共有される (ワーカー間では共有されない) ことに注意。
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        # key -> (有効期限, 値)。末尾ほど最近使われたエントリ
+        self._data: "OrderedDict[Hashable, tuple[float, ValueType]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # キャッシュサイズ調整用のカウンタ
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[ValueType]:
+        """キーに対応する値を返す。存在しない・期限切れの場合は default を返す"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                # 期限切れのエントリはその場で削除する
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: ValueType) -> None:
+        """値を登録する。上限を超えた場合は最も古く使われたエントリを追い出す"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """指定したキーのエントリを削除する (存在しなくてもエラーにしない)"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """条件に一致するキーのエントリをまとめて削除し、削除件数を返す"""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """全エントリとカウンタをリセットする"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット率などの統計情報を返す (キャッシュサイズのチューニング用)"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+# FamilyVersionedCache.get の結果の種類 (レスポンスの X-Cache ヘッダーにも使う)
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+
+class FamilyVersionedCache(Generic[ValueType]):
+    """
+    (family_id, 家族のバージョン, ルート, クエリ) をキーにするレスポンスキャッシュ。
+    家族のデータを書き込むと同じトランザクションで家族のバージョンが上がるため、
+    古いエントリは参照されなくなる (走査による無効化は不要)。古いエントリは LRU で追い出す。
+
+    stale_while_revalidate > 0 の場合、新しいバージョンのエントリがなくても、
+    バージョンが上がったのを最初に検知してからその秒数の間は、直前のバージョンの値を
+    CACHE_STALE として返せる (呼び出し元はその間に再計算する)。
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        stale_while_revalidate: float = 0.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.stale_while_revalidate = stale_while_revalidate
+        self._timer = timer
+        # (family_id, version, route, query) -> 値。末尾ほど最近使われたエントリ
+        self._data: "OrderedDict[Tuple[int, int, str, Hashable], ValueType]" = (
+            OrderedDict()
+        )
+        # (family_id, route, query) -> 保持している最新のバージョン (古い値を返すため)
+        self._latest: Dict[Tuple[int, str, Hashable], int] = {}
+        # (family_id, route, query) -> 新しいバージョンを最初に検知した時刻
+        self._superseded_at: Dict[Tuple[int, str, Hashable], float] = {}
+        # 再計算中の (family_id, route, query) (同じキーの再計算を重複させない)
+        self._revalidating: Set[Tuple[int, str, Hashable]] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self, family_id: int, version: int, route: str, query: Hashable
+    ) -> Tuple[Optional[ValueType], str]:
+        """(値, CACHE_HIT / CACHE_STALE / CACHE_MISS) を返す。ミスの場合の値は None"""
+        slot = (family_id, route, query)
+        with self._lock:
+            key = (family_id, version, route, query)
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value, CACHE_HIT
+            latest = self._latest.get(slot)
+            if (
+                self.stale_while_revalidate > 0
+                and latest is not None
+                and latest < version
+            ):
+                now = self._timer()
+                superseded_at = self._superseded_at.setdefault(slot, now)
+                if now - superseded_at <= self.stale_while_revalidate:
+                    self.stale_hits += 1
+                    return self._data[(family_id, latest, route, query)], CACHE_STALE
+            self.misses += 1
+            return None, CACHE_MISS
+
+    def set(
+        self,
+        family_id: int,
+        version: int,
+        route: str,
+        query: Hashable,
+        value: ValueType,
+    ) -> None:
+        """
+        値を登録する。同じルート・クエリの古いバージョンのエントリは削除し、
+        より新しいバージョンが登録済みなら何もしない。上限を超えた分は LRU で追い出す。
+        """
+        if self.maxsize <= 0:
+            return
+        slot = (family_id, route, query)
+        with self._lock:
+            latest = self._latest.get(slot)
+            if latest is not None:
+                if latest > version:
+                    return
+                if latest < version:
+                    del self._data[(family_id, latest, route, query)]
+                    self._superseded_at.pop(slot, None)
+            key = (family_id, version, route, query)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._latest[slot] = version
+            while len(self._data) > self.maxsize:
+                (old_family_id, old_version, old_route, old_query), _ = (
+                    self._data.popitem(last=False)
+                )
+                self._forget_slot((old_family_id, old_route, old_query), old_version)
+                self.evictions += 1
+
+    def _forget_slot(self, slot: Tuple[int, str, Hashable], version: int) -> None:
+        # ロックを取得した状態で呼ぶこと
+        if self._latest.get(slot) == version:
+            del self._latest[slot]
+            self._superseded_at.pop(slot, None)
+
+    def begin_revalidation(self, family_id: int, route: str, query: Hashable) -> bool:
+        """再計算を開始してよければ True (すでに他のリクエストが再計算中なら False)"""
+        slot = (family_id, route, query)
+        with self._lock:
+            if slot in self._revalidating:
+                return False
+            self._revalidating.add(slot)
+            return True
+
+    def end_revalidation(self, family_id: int, route: str, query: Hashable) -> None:
+        """再計算の終了を記録する (成功・失敗にかかわらず呼ぶ)"""
+        with self._lock:
+            self._revalidating.discard((family_id, route, query))
+
+    def invalidate_family(self, family_id: int) -> int:
+        """家族のエントリをまとめて削除し、削除件数を返す (家族の削除時用)"""
+        with self._lock:
+            keys = [key for key in self._data if key[0] == family_id]
+            for key in keys:
+                del self._data[key]
+                _, version, route, query = key
+                self._forget_slot((family_id, route, query), version)
+            return len(keys)
+
+    def clear(self) -> None:
+        """全エントリとカウンタをリセットする"""
+        with self._lock:
+            self._data.clear()
+            self._latest.clear()
+            self._superseded_at.clear()
+            self._revalidating.clear()
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット率などの統計情報を返す"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "stale_while_revalidate_seconds": self.stale_while_revalidate,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "revalidating": len(self._revalidating),
+            "hit_ratio": ((self.hits + self.stale_hits) / lookups) if lookups else 0.0,
+        }
+
+
+# --- 認可チェック用キャッシュ ---
+# (user_id, family_id) -> MembershipRole を保持する。
+# メンバーシップの作成・削除、家族の削除時に crud 層から無効化される (コミット後にも再度)。
+# 他のワーカーのエントリは消えないため、権限の剥奪は最大 TTL 秒遅れて反映される。
+membership_cache: "TTLCache[Any]" = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_MAXSIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+# --- アジェンダ用キャッシュ ---
+# (task_id, updated_at, start, end) -> 期間内の発生日のタプルを保持する。
+# タスクが更新されると updated_at が変わり別のキーになるため、明示的な無効化は不要。
+occurrence_cache: "TTLCache[Any]" = TTLCache(
+    maxsize=settings.AGENDA_CACHE_MAXSIZE,
+    ttl=settings.AGENDA_CACHE_TTL_SECONDS,
+)
+
+
+# --- 家族スコープのレスポンスキャッシュ ---
+# (family_id, family.cache_version, ルート, クエリ) -> レスポンスモデルを保持する。
+# crud 層の書き込みで家族の cache_version が上がるため、明示的な無効化は家族の削除時のみ。
+response_cache: "FamilyVersionedCache[Any]" = FamilyVersionedCache(
+    maxsize=settings.RESPONSE_CACHE_MAXSIZE,
+    stale_while_revalidate=settings.RESPONSE_CACHE_STALE_WHILE_REVALIDATE_SECONDS,
+)
@@ -14,6 +14,58 @@ class Settings(BaseSettings):
 
     # データベース接続URLを構築
     DATABASE_URL: str | None = None
+    # 接続プール設定 (uvicornワーカー数 x (POOL_SIZE + MAX_OVERFLOW) がDBの接続上限を超えないように)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # 接続待ちの上限秒数
+    DB_POOL_RECYCLE: int = 1800  # この秒数を超えた接続は再接続する (-1で無効)
+    DB_POOL_PRE_PING: bool = True  # チェックアウト時に接続の生存確認を行う
+    DB_ECHO: bool = False  # True にすると実行されるSQLがログに出力される (開発時用)
+    # 起動時 (lifespan) にあらかじめ開いておくプールの接続数 (DB_POOL_SIZE が上限, 0で無効)
+    # 各接続でよく使うクエリを1度実行し、SQLのコンパイル結果とプリペアドステートメントを温める
+    DB_WARMUP_CONNECTIONS: int = 1
+    # この時間 (ミリ秒) 以上かかったクエリをスロークエリとしてログに出力する
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    # 1リクエスト内で同じ形のクエリがこの回数以上発行されたら N+1 の疑いとして警告する
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # リードレプリカの接続URLリスト (任意, 例: '["postgresql+asyncpg://..."]')
+    DATABASE_REPLICA_URLS: list[str] = []
+    # 書き込み後、そのユーザーの読み取りをプライマリに固定する秒数 (read-your-writes)
+    # (書き込み時刻は Cookie でクライアントに持たせるため、複数ワーカーでも有効)
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 5.0
+
+    # 認可チェック (user_id, family_id) -> role のインメモリキャッシュ設定
+    # (プロセスごとのキャッシュのため、メンバーの削除が他のワーカーに反映されるまで
+    # 最大でこの秒数かかる。即時に反映したい場合は TTL を短くする)
+    MEMBERSHIP_CACHE_MAXSIZE: int = 10000
+    MEMBERSHIP_CACHE_TTL_SECONDS: float = 60.0
+
+    # アジェンダ (定常タスクの展開結果) のキャッシュ設定と、1回で取得できる最大日数
+    AGENDA_CACHE_MAXSIZE: int = 50000
+    AGENDA_CACHE_TTL_SECONDS: float = 3600.0
+    AGENDA_MAX_DAYS: int = 92
+
+    # 家族スコープの一覧レスポンスのキャッシュ設定 (キーに家族のバージョン番号を含む)
+    RESPONSE_CACHE_MAXSIZE: int = 5000
+    # 家族のデータが更新された後も、この秒数の間は再計算中に古いレスポンスを返す (0で無効)
+    RESPONSE_CACHE_STALE_WHILE_REVALIDATE_SECONDS: float = 0.0
+
+    # タスクのエクスポートで、サーバーサイドカーソルから1回に取り出す行数
+    # (ラベル・担当者もこの単位でまとめて取得する。メモリ使用量はこの件数分で頭打ちになる)
+    TASK_EXPORT_CHUNK_SIZE: int = 1000
+    # タスクのインポートで、検証・書き込みをまとめて行う行数
+    TASK_IMPORT_CHUNK_SIZE: int = 1000
+
+    # 運用向けの内部メトリクス (/api/v1/internal/metrics/*)。SQLのフィンガープリントや
+    # 接続プール・キャッシュの状態を返すため、既定では無効 (404)。有効にする場合は
+    # トークンも設定し、Authorization: Bearer <トークン> を付けて呼び出す
+    INTERNAL_METRICS_ENABLED: bool = False
+    INTERNAL_METRICS_TOKEN: str | None = None
+
+    # 事前に生成した OpenAPI スキーマ (scripts/export_openapi.py で出力した openapi.json)
+    # 指定すると起動時に読み込み、/docs の初回表示時にスキーマを生成しない
+    OPENAPI_SCHEMA_PATH: str | None = None
 
     # Pydantic V2 スタイル: model_post_initを使用
     def model_post_init(self, __context) -> None:
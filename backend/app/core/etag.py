@@ -0,0 +1,32 @@
+import hashlib
+from typing import Any, Optional
+
+from starlette.responses import Response
+
+# --- 条件付きGET (ETag / If-None-Match) ---
+# 参照系エンドポイントは、本体を読み込む前に updated_at (一覧は件数と max(updated_at)) から
+# 弱いETagを計算し、クライアントの If-None-Match と一致すれば 304 (本文なし) を返す。
+
+
+def make_weak_etag(*parts: Any) -> str:
+    """バージョンを表す値 (updated_at、件数、クエリパラメータなど) から弱いETagを作る"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーが etag と一致するか (弱い比較、カンマ区切り・* に対応)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """304 Not Modified レスポンス (本文なし) を返す"""
+    return Response(status_code=304, headers={"ETag": etag})
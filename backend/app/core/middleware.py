@@ -0,0 +1,112 @@
+import logging
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import RequestQueryStats, current_request_stats
+from app.db.routing import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesState,
+    current_read_your_writes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryContextMiddleware:
+    """
+    リクエストごとのクエリ件数・DB時間を集計するミドルウェア。
+    - 集計結果を Server-Timing レスポンスヘッダーに出力する
+    - 同じ形のクエリが n_plus_one_threshold 回以上発行されたら N+1 の疑いとして警告する
+    - スロークエリログで発行元のルート (メソッド + パス) を特定できるようにする
+    """
+
+    def __init__(self, app: ASGIApp, *, n_plus_one_threshold: int = 5) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_stats = RequestQueryStats(route=f"{scope['method']} {scope['path']}")
+        token = current_request_stats.set(request_stats)
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # yield 依存関係 (コミット) はレスポンス送信前に終了しているので全件含まれる
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={request_stats.total_ms:.2f};desc="{request_stats.count} queries"',
+                )
+                self._warn_repeated_queries(request_stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_request_stats.reset(token)
+
+    def _warn_repeated_queries(self, request_stats: RequestQueryStats) -> None:
+        for statement, count in request_stats.repeated_queries(
+            self.n_plus_one_threshold
+        ):
+            logger.warning(
+                f"Possible N+1 query in {request_stats.route}: "
+                f"executed {count} times: {statement}"
+            )
+
+
+class ReadYourWritesMiddleware:
+    """
+    書き込んだクライアントに最後の書き込み時刻を Cookie で返し、次のリクエストで
+    その Cookie を current_read_your_writes に設定するミドルウェア。
+    どのワーカーが読み取りを受けても、期間内なら ReplicaRouter がプライマリから読む。
+    """
+
+    def __init__(self, app: ASGIApp, *, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = ReadYourWritesState(
+            client_last_write_at=self._parse_cookie(
+                HTTPConnection(scope).cookies.get(READ_YOUR_WRITES_COOKIE)
+            )
+        )
+        token = current_read_your_writes.set(state)
+
+        async def send_with_write_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.committed_at:
+                # get_db のコミットはレスポンス送信前に終わっている
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={state.committed_at:.3f}; "
+                    f"Max-Age={math.ceil(self.window_seconds)}; Path=/; "
+                    "HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_write_cookie)
+        finally:
+            current_read_your_writes.reset(token)
+
+    @staticmethod
+    def _parse_cookie(value: str | None) -> float | None:
+        if not value:
+            return None
+        try:
+            written_at = float(value)
+        except ValueError:
+            return None
+        return written_at if math.isfinite(written_at) else None
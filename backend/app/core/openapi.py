@@ -0,0 +1,40 @@
+import logging
+
+import orjson
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+# --- 事前生成した OpenAPI スキーマ ---
+# FastAPI は /openapi.json (/docs) への最初のアクセス時に全ルートからスキーマを生成する。
+# scripts/export_openapi.py で出力したファイルを起動時に app.openapi_schema に設定しておくと、
+# app.openapi() は生成せずにそれを返す。エンドポイントを変更したら出力し直すこと。
+
+
+def dump_openapi(app: FastAPI) -> bytes:
+    """app の OpenAPI スキーマをJSONにする (scripts/export_openapi.py 用)"""
+    return orjson.dumps(app.openapi(), option=orjson.OPT_INDENT_2)
+
+
+def load_prebuilt_openapi(app: FastAPI, path: str) -> bool:
+    """
+    path の openapi.json を app.openapi_schema に設定し、設定できたら True を返す。
+    読み込めない場合や、スキーマのバージョンが app.version と異なる (古い) 場合は
+    WARNING ログを出して False を返す (従来どおり最初のアクセス時に生成される)。
+    """
+    try:
+        with open(path, "rb") as f:
+            schema = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Failed to load prebuilt OpenAPI schema from {path}: {e}")
+        return False
+    version = schema.get("info", {}).get("version")
+    if version != app.version:
+        logger.warning(
+            f"Ignoring prebuilt OpenAPI schema {path}: version {version!r} "
+            f"does not match app version {app.version!r}"
+        )
+        return False
+    app.openapi_schema = schema
+    logger.info(f"Loaded prebuilt OpenAPI schema from {path}")
+    return True
@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Optional, Tuple
+
+from sqlalchemy import and_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+# --- キーセット (シーク) ページネーション用のカーソル ---
+# カーソルは (並び替えキー名, 並び替えキーの値, id) をJSON化してURL-safe base64にした不透明な文字列。
+# クライアントは中身を解釈せず、レスポンスの next_cursor をそのまま次のリクエストに渡す。
+
+
+class InvalidCursorError(ValueError):
+    """カーソルの形式が不正、または別の並び順で発行されたカーソルの場合"""
+
+
+def encode_cursor(sort_key: str, value: Any, last_id: int) -> str:
+    """最後に返した行の (並び替えキーの値, id) からカーソル文字列を作る"""
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    payload = json.dumps([sort_key, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    *,
+    sort_key: str,
+    parse_value: Callable[[Any], Any] = lambda value: value,
+) -> Tuple[Any, int]:
+    """カーソル文字列を (並び替えキーの値, id) に戻す。不正な場合は InvalidCursorError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_key, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor.") from e
+    if cursor_sort_key != sort_key or not isinstance(last_id, int):
+        raise InvalidCursorError("Cursor does not match the requested sort order.")
+    try:
+        return (None if value is None else parse_value(value)), last_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor.") from e
+
+
+def keyset_after(
+    sort_column: Any,
+    id_column: Any,
+    value: Any,
+    last_id: Optional[int],
+    *,
+    descending: bool = False,
+    nullable: bool = False,
+) -> ColumnElement[bool]:
+    """
+    ORDER BY sort_column, id_column (NULLは末尾) で (value, last_id) より後ろの行を表す条件。
+    nullable=True の場合は昇順のみ対応 (ORDER BY sort_column ASC NULLS LAST, id ASC)。
+
+    条件はどれも複合インデックスの1つの範囲 (シーク) になるようにしている。
+    nullable=True で value が NULL でない場合、条件は非NULLの区間だけを表す
+    (OR で NULL の区間をつなぐとインデックスの範囲として使えないため)。
+    非NULLの区間を読み終えたら、呼び出し側が value=None, last_id=None
+    (NULLの区間の先頭) で続きを取得すること。
+    """
+    if nullable and descending:
+        raise ValueError(
+            "Descending keyset pagination on nullable columns is not supported."
+        )
+    # 行値比較 (a, b) > (x, y) にすると複合インデックスの範囲スキャンになる
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+    if value is None:
+        # NULLの区間に入っている: 残りは NULL かつ id が大きい行のみ
+        if last_id is None:
+            return sort_column.is_(None)
+        return and_(sort_column.is_(None), id_column > last_id)
+    # NULL との行値比較は真にならないため、非NULLの区間だけが対象になる
+    return tuple_(sort_column, id_column) > tuple_(value, last_id)
+
+
+def next_cursor_for(
+    sort_key: str, value: Any, last_id: Optional[int], *, has_more: bool
+) -> Optional[str]:
+    """続きがある場合のみ、最後の行からカーソルを作る"""
+    if not has_more or last_id is None:
+        return None
+    return encode_cursor(sort_key, value, last_id)
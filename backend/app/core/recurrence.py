@@ -0,0 +1,202 @@
+import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+# --- 定常タスクの次回発生日の計算 ---
+# routine_settings (RoutineSettings を辞書化したもの) を解釈し、指定日より後の最初の発生日を求める。
+# 大量のタスク (夜間の一括更新で10万件など) を1回で処理できるよう、NumPy の datetime64 配列で計算する。
+#
+# 規則 (anchor はタスクの期日。なければ計算開始日 = after の翌日):
+# - daily: 毎日
+# - weekly: weekdays (0=月曜 ... 6=日曜) の曜日。未指定なら anchor と同じ曜日
+# - monthly: 毎月 day_of_month 日。未指定なら anchor の日。月末を超える日 (31日など) はその月の末日
+# - yearly: 毎年 anchor の月日 (2/29 は平年では 2/28)
+
+REPEAT_CODES = {"daily": 0, "weekly": 1, "monthly": 2, "yearly": 3}
+_INVALID = -1
+
+DateLike = Union[datetime.date, np.datetime64]
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 は木曜日 (月曜=0 で 3)
+    return (days.astype("int64") + 3) % 7
+
+
+def _clamped_day_in_month(months: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """各月の day 日 (月の日数を超える場合は末日) を返す"""
+    first = months.astype("datetime64[D]")
+    length = ((months + 1).astype("datetime64[D]") - first).astype("int64")
+    return first + (np.minimum(day, length) - 1)
+
+
+def _day_of_month(days: np.ndarray) -> np.ndarray:
+    return (days - days.astype("datetime64[M]").astype("datetime64[D]")).astype(
+        "int64"
+    ) + 1
+
+
+def next_occurrences_array(
+    repeat: np.ndarray,
+    weekday_mask: np.ndarray,
+    day_of_month: np.ndarray,
+    anchor: np.ndarray,
+    after: np.ndarray,
+) -> np.ndarray:
+    """
+    配列版: after より後 (after は含まない) の最初の発生日を datetime64[D] の配列で返す。
+    - repeat: REPEAT_CODES の値 (不正な設定は -1 -> NaT)
+    - weekday_mask: 曜日のビットマスク (bit0=月曜)。0 は未指定
+    - day_of_month: 1-31。0 は未指定
+    - anchor: 基準日 (NaT は未指定)
+    """
+    after = after.astype("datetime64[D]")
+    start = after + 1
+    anchor = np.where(np.isnat(anchor), start, anchor).astype("datetime64[D]")
+    result = np.full(start.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+
+    daily = repeat == REPEAT_CODES["daily"]
+    result[daily] = start[daily]
+
+    weekly = repeat == REPEAT_CODES["weekly"]
+    if weekly.any():
+        w_start = start[weekly]
+        mask = weekday_mask[weekly].astype("int64")
+        mask = np.where(mask == 0, 1 << _weekday(anchor[weekly]), mask)
+        # start から7日分の候補のうち、曜日が一致する最初の日
+        candidates = w_start[:, None] + np.arange(7)
+        hits = (mask[:, None] >> _weekday(candidates)) & 1
+        result[weekly] = w_start + np.argmax(hits, axis=1)
+
+    monthly = repeat == REPEAT_CODES["monthly"]
+    if monthly.any():
+        m_start = start[monthly]
+        day = day_of_month[monthly].astype("int64")
+        day = np.where(day == 0, _day_of_month(anchor[monthly]), day)
+        month = m_start.astype("datetime64[M]")
+        this_month = _clamped_day_in_month(month, day)
+        result[monthly] = np.where(
+            this_month >= m_start, this_month, _clamped_day_in_month(month + 1, day)
+        )
+
+    yearly = repeat == REPEAT_CODES["yearly"]
+    if yearly.any():
+        y_start = start[yearly]
+        y_anchor = anchor[yearly]
+        month_of_year = (
+            y_anchor.astype("datetime64[M]")
+            - y_anchor.astype("datetime64[Y]").astype("datetime64[M]")
+        ).astype("int64")
+        day = _day_of_month(y_anchor)
+        year_month = y_start.astype("datetime64[Y]").astype("datetime64[M]")
+        this_year = _clamped_day_in_month(year_month + month_of_year, day)
+        next_year = _clamped_day_in_month(year_month + 12 + month_of_year, day)
+        result[yearly] = np.where(this_year >= y_start, this_year, next_year)
+
+    return result
+
+
+def _encode_settings(settings: Optional[Mapping[str, Any]]) -> tuple[int, int, int]:
+    """routine_settings の辞書を (repeat, weekday_mask, day_of_month) に変換する"""
+    if not settings:
+        return _INVALID, 0, 0
+    repeat = REPEAT_CODES.get(settings.get("repeat_every"), _INVALID)
+    mask = 0
+    for weekday in settings.get("weekdays") or []:
+        if isinstance(weekday, int) and 0 <= weekday <= 6:
+            mask |= 1 << weekday
+    day = settings.get("day_of_month") or 0
+    if not isinstance(day, int) or not 1 <= day <= 31:
+        day = 0
+    return repeat, mask, day
+
+
+def next_occurrences(
+    settings_list: Sequence[Optional[Mapping[str, Any]]],
+    *,
+    after: Union[DateLike, Sequence[DateLike]],
+    anchors: Optional[Sequence[Optional[datetime.date]]] = None,
+) -> List[Optional[datetime.date]]:
+    """
+    複数タスクの次回発生日 (after より後の最初の日) をまとめて計算する。
+    after は全タスク共通の日付、またはタスクごとの日付のリスト。
+    routine_settings が不正なタスクは None。
+    """
+    count = len(settings_list)
+    if count == 0:
+        return []
+    encoded = np.array(
+        [_encode_settings(settings) for settings in settings_list], dtype="int64"
+    ).reshape(count, 3)
+    anchor_array = np.array(
+        [
+            anchor if anchor is not None else "NaT"
+            for anchor in (anchors or [None] * count)
+        ],
+        dtype="datetime64[D]",
+    )
+    after_array = np.broadcast_to(np.array(after, dtype="datetime64[D]"), (count,))
+    result = next_occurrences_array(
+        encoded[:, 0], encoded[:, 1], encoded[:, 2], anchor_array, after_array
+    )
+    # object 型への変換で datetime.date (NaT は None) のリストになる
+    return result.astype(object).tolist()
+
+
+def next_occurrence(
+    settings: Optional[Mapping[str, Any]],
+    *,
+    after: datetime.date,
+    anchor: Optional[datetime.date] = None,
+) -> Optional[datetime.date]:
+    """1つのタスクの次回発生日 (after より後の最初の日) を返す。設定が不正なら None"""
+    return next_occurrences([settings], after=after, anchors=[anchor])[0]
+
+
+def occurrences_between(
+    settings: Optional[Mapping[str, Any]],
+    *,
+    start: datetime.date,
+    end: datetime.date,
+    anchor: Optional[datetime.date] = None,
+) -> List[datetime.date]:
+    """
+    start から end まで (両端を含む) の発生日をすべて返す (カレンダー表示用)。
+    anchor (期日) があれば、それより前の日は含めない。設定が不正なら空リスト。
+    """
+    repeat, mask, day = _encode_settings(settings)
+    if repeat == _INVALID or end < start:
+        return []
+    days = np.arange(
+        np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+    )
+    anchor_day = np.datetime64(anchor or start, "D")
+    months = days.astype("datetime64[M]")
+
+    if repeat == REPEAT_CODES["daily"]:
+        hits = np.ones(days.shape, dtype=bool)
+    elif repeat == REPEAT_CODES["weekly"]:
+        mask = mask or 1 << int(_weekday(anchor_day))
+        hits = ((mask >> _weekday(days)) & 1).astype(bool)
+    elif repeat == REPEAT_CODES["monthly"]:
+        day = day or int(_day_of_month(anchor_day))
+        hits = _clamped_day_in_month(months, day) == days
+    else:
+        anchor_month = anchor_day.astype("datetime64[M]")
+        month_of_year = int(
+            (
+                anchor_month
+                - anchor_day.astype("datetime64[Y]").astype("datetime64[M]")
+            ).astype("int64")
+        )
+        month_index = (
+            months - days.astype("datetime64[Y]").astype("datetime64[M]")
+        ).astype("int64")
+        hits = (month_index == month_of_year) & (
+            _clamped_day_in_month(months, int(_day_of_month(anchor_day))) == days
+        )
+
+    if anchor is not None:
+        hits &= days >= anchor_day
+    return days[hits].astype(object).tolist()
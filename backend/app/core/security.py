@@ -0,0 +1,54 @@
+import secrets
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+
+# Userモデルをインポート (ダミーユーザー作成と型ヒント用)
+from app.models.user import User
+
+# 内部メトリクス用の Bearer トークン (ヘッダーがなくても自動で 403 にはしない)
+internal_bearer = HTTPBearer(auto_error=False)
+
+
+# --- 仮の認証用 依存関係 ---
+# DBセッション (app/db/session.py) からも参照するため、app/api/deps.py ではなくここに置く
+async def get_current_active_user() -> User:
+    """
+    現在のログインユーザーを取得する仮の依存関係。
+    将来的には実際のOIDCトークン検証ロジックに置き換える。
+    現時点では、テスト用に固定のダミーユーザーを返すか、
+    あるいは未認証エラーを発生させる。
+    """
+    print("警告: 仮の認証関数 get_current_active_user が使用されています。")
+    # ここでは、開発・テストしやすいようにID=1のダミーユーザーを返すことにします
+    # 必要に応じて raise HTTPException(status_code=401) に変更してください
+    return User(
+        id=1,
+        oidc_subject="dummy_oidc|123",
+        name="ダミーユーザー",
+        email="dummy@example.com",
+    )
+
+
+# --- 運用向けエンドポイントの認可 依存関係 ---
+async def require_internal_metrics_access(
+    credentials: HTTPAuthorizationCredentials | None = Depends(internal_bearer),
+) -> None:
+    """
+    内部メトリクスへのアクセスを確認する依存関係。
+    無効 (INTERNAL_METRICS_ENABLED=false) またはトークン未設定の場合は 404 (存在を隠す)、
+    Bearer トークンが一致しない場合は 401 エラーを発生させる。
+    """
+    token = settings.INTERNAL_METRICS_TOKEN
+    if not settings.INTERNAL_METRICS_ENABLED or not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal metrics token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,355 @@
+import codecs
+import csv
+import io
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.task import RoutineSettings, TaskCreate
+
+# --- レスポンスの高速シリアライズ ---
+# 通常の経路では、ハンドラが APIResponse[...] を作る時点と、FastAPI が response_model で
+# 返り値を検証する時点の2回、TaskRead / UserSummary (HttpUrl) などが検証される。
+# 参照系の一覧では、DBから読んだ (書き込み時に検証済みの) ORMオブジェクトを信頼して
+# スキーマと同じ形の辞書を直接組み立て、orjson でJSONにしたバイト列を返す。
+# (返り値が Response なので FastAPI の response_model による再検証も行われない)
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """型ごとの TypeAdapter (スキーマの構築は重いため作成済みを使い回す)"""
+    return TypeAdapter(tp)
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """orjson でシリアライズするレスポンス。シリアライズ済みのバイト列はそのまま返す"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return super().render(content)
+
+
+def dump_envelope(
+    data: Any, *, message: Optional[str] = None, next_cursor: Any = _MISSING
+) -> bytes:
+    """
+    APIResponse (next_cursor を渡した場合は PaginatedAPIResponse) と同じ形のJSONを作る。
+    data は trusted_* で組み立てた辞書 (またはそのリスト) を渡す。
+    """
+    envelope: Dict[str, Any] = {"message": message, "data": data}
+    if next_cursor is not _MISSING:
+        envelope["next_cursor"] = next_cursor
+    return orjson.dumps(envelope)
+
+
+# --- ORMオブジェクトからレスポンス用の辞書を組み立てる (フィールド順はスキーマと同じ) ---
+# 値はDBから読んだものをそのまま使う。avatar_url も HttpUrl として正規化しない。
+
+
+def trusted_label_read(label: Any) -> Dict[str, Any]:
+    """LabelRead と同じ形の辞書"""
+    return {
+        "id": label.id,
+        "name": label.name,
+        "color": label.color,
+        "created_at": label.created_at,
+        "updated_at": label.updated_at,
+    }
+
+
+def trusted_label_summary(label: Any) -> Dict[str, Any]:
+    """LabelSummary と同じ形の辞書"""
+    return {"id": label.id, "name": label.name, "color": label.color}
+
+
+def trusted_user_summary(user: Any) -> Optional[Dict[str, Any]]:
+    """UserSummary と同じ形の辞書 (user が None なら None)"""
+    if user is None:
+        return None
+    return {"id": user.id, "name": user.name, "avatar_url": user.avatar_url}
+
+
+def trusted_routine_settings(raw: Optional[dict]) -> Optional[Dict[str, Any]]:
+    """
+    DBの routine_settings (JSON) を RoutineSettings と同じ形にする。
+    JSON列は形が保証されないため、ここだけは (キャッシュした TypeAdapter で) 検証し、
+    TaskRead と同じく不正な値は None にする。
+    """
+    if not raw:
+        return None
+    adapter = type_adapter(RoutineSettings)
+    try:
+        return adapter.dump_python(adapter.validate_python(raw), mode="json")
+    except ValidationError:
+        return None
+
+
+def trusted_task_read(task: Any) -> Dict[str, Any]:
+    """TaskRead と同じ形の辞書 (labels と assignee は読み込み済みであること)"""
+    labels = [trusted_label_summary(label) for label in task.labels]
+    return {
+        "id": task.id,
+        "title": task.title,
+        "notes": task.notes,
+        "is_done": task.is_done,
+        "task_type": task.task_type,
+        "due_date": task.due_date,
+        "priority": task.priority,
+        "routine_settings": trusted_routine_settings(task.routine_settings),
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "assignee": trusted_user_summary(task.assignee),
+        "labels": labels,
+        "label_ids": [label["id"] for label in labels],
+        "family_id": task.family_id,
+        "parent_task_id": task.parent_task_id,
+    }
+
+
+# --- エクスポート (NDJSON / CSV) ---
+# タスクのエクスポートはチャンク単位でバイト列にして StreamingResponse に渡す。
+
+# CSVの列 (TaskRead のフィールドを、担当者・ラベルは列に展開したもの)
+TASK_CSV_COLUMNS = (
+    "id",
+    "title",
+    "notes",
+    "is_done",
+    "task_type",
+    "due_date",
+    "priority",
+    "routine_settings",
+    "created_at",
+    "updated_at",
+    "family_id",
+    "parent_task_id",
+    "assignee_id",
+    "assignee_name",
+    "label_ids",
+    "label_names",
+)
+
+# label_ids / label_names 列で複数の値を区切る文字
+CSV_LIST_SEPARATOR = ";"
+
+
+def dump_ndjson(items: Iterable[Dict[str, Any]]) -> bytes:
+    """辞書を1行に1つずつ並べた NDJSON (改行区切りのJSON) を作る"""
+    return b"".join(
+        orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE) for item in items
+    )
+
+
+def dump_csv(rows: Iterable[Sequence[Any]]) -> bytes:
+    """行のリストを CSV (UTF-8, 改行は CRLF) にする。None は空欄になる"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def task_csv_row(task: Any) -> List[Any]:
+    """TASK_CSV_COLUMNS の順に並べたタスクの1行 (labels と assignee は読み込み済みであること)"""
+    routine_settings = trusted_routine_settings(task.routine_settings)
+    assignee = task.assignee
+    return [
+        task.id,
+        task.title,
+        task.notes,
+        "true" if task.is_done else "false",
+        getattr(task.task_type, "value", task.task_type),
+        task.due_date.isoformat() if task.due_date else None,
+        task.priority,
+        orjson.dumps(routine_settings).decode() if routine_settings else None,
+        task.created_at.isoformat(),
+        task.updated_at.isoformat(),
+        task.family_id,
+        task.parent_task_id,
+        assignee.id if assignee else None,
+        assignee.name if assignee else None,
+        CSV_LIST_SEPARATOR.join(str(label.id) for label in task.labels),
+        CSV_LIST_SEPARATOR.join(label.name for label in task.labels),
+    ]
+
+
+# --- インポート (NDJSON / CSV) ---
+# リクエスト本文をチャンクごとに受け取り、1レコードずつ (行番号, 辞書) にする。
+# リクエスト全体をメモリに載せないよう、保持するのは未完成の1行分だけ。
+
+# 1レコードの最大バイト数 (改行が来ないまま超えたらリクエスト全体をエラーにする)
+IMPORT_MAX_RECORD_BYTES = 1024 * 1024
+
+# CSVのインポートで読み取る列 (TaskCreate のフィールド。その他の列は無視する)
+TASK_IMPORT_CSV_FIELDS = frozenset(TaskCreate.model_fields)
+
+# エクスポートしたレコード (id を含む) の parent_task_id / label_ids は元の家族のIDのため
+# 取り込まない。ラベルは代わりにラベル名 (このキー) で取り込み先の家族のラベルを探す
+IMPORT_LABEL_NAMES_FIELD = "label_names"
+EXPORTED_ID_FIELDS = ("parent_task_id", "label_ids")
+
+
+class RecordParseError(ValueError):
+    """1レコードを解釈できない場合のエラー (そのレコードだけをエラーとして報告する)"""
+
+
+class ImportFormatError(ValueError):
+    """リクエスト全体を解釈できない場合のエラー (ヘッダー不正・文字コード不正など)"""
+
+
+ParsedRecord = Tuple[int, Union[Dict[str, Any], RecordParseError]]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """バイト列のチャンクを改行で区切った行にする (行末の改行は含まない)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        if b"\n" in chunk:
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                _check_line_size(line)
+                yield line
+        # 区切った後の残り (次のチャンクに続く行) も上限を超えたらエラーにする
+        _check_line_size(buffer)
+    if buffer:
+        yield buffer
+
+
+def _check_line_size(line: bytes) -> None:
+    if len(line) > IMPORT_MAX_RECORD_BYTES:
+        raise ImportFormatError(f"A line exceeds {IMPORT_MAX_RECORD_BYTES} bytes.")
+
+
+def _parse_ndjson_line(line: bytes) -> Dict[str, Any]:
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        raise RecordParseError(f"Invalid JSON: {e}") from e
+    if not isinstance(record, dict):
+        raise RecordParseError("Each line must be a JSON object.")
+    # エクスポートした NDJSON (TaskRead の形) もそのまま取り込めるようにする
+    assignee = record.get("assignee")
+    if "assignee_id" not in record and isinstance(assignee, dict):
+        record["assignee_id"] = assignee.get("id")
+    if "id" in record:
+        for name in EXPORTED_ID_FIELDS:
+            record.pop(name, None)
+        labels = record.get("labels")
+        if isinstance(labels, list):
+            record[IMPORT_LABEL_NAMES_FIELD] = [
+                label["name"]
+                for label in labels
+                if isinstance(label, dict) and isinstance(label.get("name"), str)
+            ]
+    return record
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[ParsedRecord]:
+    """
+    NDJSON の本文を (行番号, 辞書) にして順に返す。空行は読み飛ばす。
+    解釈できない行は辞書の代わりに RecordParseError を返す (処理は続ける)。
+    """
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, _parse_ndjson_line(line)
+        except RecordParseError as e:
+            yield line_number, e
+
+
+def _csv_row_to_record(header: List[str], row: List[str]) -> Dict[str, Any]:
+    if len(row) != len(header):
+        raise RecordParseError(f"Expected {len(header)} columns, got {len(row)}.")
+    record: Dict[str, Any] = {}
+    exported = "id" in header
+    for name, value in zip(header, row):
+        if exported and name == IMPORT_LABEL_NAMES_FIELD:
+            record[name] = [
+                label_name
+                for label_name in value.split(CSV_LIST_SEPARATOR)
+                if label_name
+            ]
+            continue
+        # 空欄は未指定として扱う (TaskCreate のデフォルト値を使う)
+        if name not in TASK_IMPORT_CSV_FIELDS or value == "":
+            continue
+        if exported and name in EXPORTED_ID_FIELDS:
+            continue
+        if name == "routine_settings":
+            try:
+                record[name] = orjson.loads(value)
+            except orjson.JSONDecodeError as e:
+                raise RecordParseError(f"routine_settings: invalid JSON: {e}") from e
+        elif name == "label_ids":
+            record[name] = [
+                label_id.strip()
+                for label_id in value.split(CSV_LIST_SEPARATOR)
+                if label_id.strip()
+            ]
+        else:
+            record[name] = value
+    return record
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRecord]:
+    """
+    CSV (UTF-8, BOM可) の本文を (行番号, 辞書) にして順に返す。1行目はヘッダー。
+    引用符で囲まれた値の中の改行にも対応する (行番号はレコードの先頭行)。
+    ヘッダーに title 列がない場合や UTF-8 でない場合は ImportFormatError を送出する。
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header: Optional[List[str]] = None
+    record_lines: List[str] = []
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        try:
+            record_lines.append(decoder.decode(line + b"\n"))
+        except UnicodeDecodeError as e:
+            raise ImportFormatError(f"Line {line_number} is not valid UTF-8.") from e
+        record_text = "".join(record_lines)
+        # 引用符の数が奇数なら、値の途中で改行されているので次の行とつなげる
+        if record_text.count('"') % 2:
+            if len(record_text) > IMPORT_MAX_RECORD_BYTES:
+                raise ImportFormatError(f"Line {line_number} has an unclosed quote.")
+            continue
+        first_line = line_number - len(record_lines) + 1
+        record_lines = []
+        if not record_text.strip():
+            continue
+        try:
+            row = next(csv.reader([record_text]))
+        except csv.Error as e:
+            yield first_line, RecordParseError(f"Invalid CSV: {e}")
+            continue
+        if header is None:
+            header = [name.strip() for name in row]
+            if "title" not in header:
+                raise ImportFormatError("CSV header must include a 'title' column.")
+            continue
+        try:
+            yield first_line, _csv_row_to_record(header, row)
+        except RecordParseError as e:
+            yield first_line, e
+    if record_lines:
+        raise ImportFormatError(f"Line {line_number} has an unclosed quote.")
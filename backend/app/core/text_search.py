@@ -0,0 +1,45 @@
+import unicodedata
+from typing import List, Optional
+
+# --- 全文検索用の文字バイグラム分割 ---
+# 日本語は空白で単語が区切られないため、文字の2-gram (バイグラム) をトークンとして索引する。
+# 例: "牛乳を買う" -> ["牛乳", "乳を", "を買", "買う"]
+# 索引側 (Task.search_tokens) と検索側で同じ正規化・分割を使う。
+
+
+def normalize_text(text: str) -> str:
+    """全角/半角・大文字/小文字の違いを吸収する (NFKC + casefold)"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _is_token_char(char: str) -> bool:
+    # 文字・数字のみをトークンに含める (記号・空白は区切りとして扱う)
+    return unicodedata.category(char)[0] in ("L", "N")
+
+
+def bigram_tokens(text: Optional[str]) -> List[str]:
+    """
+    テキストを正規化し、記号・空白で区切られた各区間を文字バイグラムに分割する。
+    1文字だけの区間はそのまま1文字のトークンにする。重複は除き、出現順を保つ。
+    """
+    if not text:
+        return []
+    tokens: List[str] = []
+    run: List[str] = []
+    for char in normalize_text(text) + " ":
+        if _is_token_char(char):
+            run.append(char)
+            continue
+        if len(run) == 1:
+            tokens.append(run[0])
+        tokens.extend(run[i] + run[i + 1] for i in range(len(run) - 1))
+        run = []
+    return list(dict.fromkeys(tokens))
+
+
+def build_search_tokens(*texts: Optional[str]) -> str:
+    """索引用に、複数のテキストのバイグラムを空白区切りの1つの文字列にまとめる"""
+    tokens: List[str] = []
+    for text in texts:
+        tokens.extend(bigram_tokens(text))
+    return " ".join(dict.fromkeys(tokens))
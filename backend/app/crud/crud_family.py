@@ -1,6 +1,14 @@
+import datetime
+from typing import Iterable, Set
+
+from app.core.cache import membership_cache, response_cache
 from app.models.family import Family
+from app.models.family_membership import FamilyMembership, MembershipRole
+from app.models.task import Task
 from app.schemas.family import FamilyCreate
-from sqlmodel import select
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
@@ -16,6 +24,151 @@ async def get_family(db: AsyncSession, family_id: int) -> Family | None:
     return family
 
 
+async def get_family_updated_at(
+    db: AsyncSession, *, family_id: int
+) -> datetime.datetime | None:
+    """家族の updated_at のみを取得する (ETag計算用)。存在しなければ None"""
+    statement = select(Family.updated_at).where(Family.id == family_id)
+    result = await db.exec(statement)
+    return result.first()
+
+
+async def get_family_cache_version(db: AsyncSession, *, family_id: int) -> int | None:
+    """家族の cache_version のみを取得する (レスポンスキャッシュのキー用)。存在しなければ None"""
+    statement = select(Family.cache_version).where(Family.id == family_id)
+    result = await db.exec(statement)
+    return result.first()
+
+
+# セッションの info に「現在のトランザクションでバージョンを上げた家族」を記録するキー
+_BUMPED_FAMILIES_INFO_KEY = "bumped_family_cache_versions"
+
+
+def _bumped_family_ids(db: AsyncSession) -> Set[int]:
+    """現在のトランザクションで cache_version を上げ済みの家族IDの集合を返す"""
+    transaction = db.sync_session.get_transaction()
+    bumped = db.info.get(_BUMPED_FAMILIES_INFO_KEY)
+    if bumped is None or bumped[0] is not transaction:
+        # コミット・ロールバックで別のトランザクションになったら記録をやり直す
+        bumped = (transaction, set())
+        db.info[_BUMPED_FAMILIES_INFO_KEY] = bumped
+    return bumped[1]
+
+
+# セッションの info に「コミット後に無効化する認可キャッシュ」を記録するキー
+_MEMBERSHIP_INVALIDATIONS_INFO_KEY = "membership_cache_invalidations"
+
+
+def _drop_pending_membership_cache(session: Session) -> None:
+    """(after_commit) 記録しておいた認可キャッシュのエントリを削除する"""
+    pending = session.info.get(_MEMBERSHIP_INVALIDATIONS_INFO_KEY)
+    if not pending:
+        return
+    targets = set(pending)
+    pending.clear()
+    membership_cache.delete_where(
+        lambda key: key in targets or (None, key[1]) in targets
+    )
+    for user_id, family_id in targets:
+        if user_id is None:
+            response_cache.invalidate_family(family_id)
+
+
+def _forget_pending_membership_cache(session: Session) -> None:
+    """(after_rollback) 取り消された書き込みの無効化予定を破棄する"""
+    pending = session.info.get(_MEMBERSHIP_INVALIDATIONS_INFO_KEY)
+    if pending:
+        pending.clear()
+
+
+def invalidate_membership_cache_on_commit(
+    db: AsyncSession, *, family_id: int, user_id: int | None = None
+) -> None:
+    """
+    認可キャッシュ (user_id, family_id) を今すぐ削除し、コミット後にもう一度削除する。
+    user_id を省略すると家族の全エントリ (とレスポンスキャッシュ) が対象になる。
+    コミット前に並行するリクエストが古いロールを読んでキャッシュし直しても、
+    コミット後の削除で消える。キャッシュはプロセス内のみのため、他のワーカーには
+    MEMBERSHIP_CACHE_TTL_SECONDS が経過するまで古いロールが残りうる。
+    """
+    if user_id is None:
+        membership_cache.delete_where(lambda key: key[1] == family_id)
+        response_cache.invalidate_family(family_id)
+    else:
+        membership_cache.delete((user_id, family_id))
+    pending = db.info.get(_MEMBERSHIP_INVALIDATIONS_INFO_KEY)
+    if pending is None:
+        # セッションごとに1回だけフックを登録する
+        pending = set()
+        db.info[_MEMBERSHIP_INVALIDATIONS_INFO_KEY] = pending
+        event.listen(db.sync_session, "after_commit", _drop_pending_membership_cache)
+        event.listen(
+            db.sync_session, "after_rollback", _forget_pending_membership_cache
+        )
+    pending.add((user_id, family_id))
+
+
+async def bump_family_cache_version(db: AsyncSession, *, family_id: int) -> None:
+    """
+    家族の cache_version を1つ上げる (呼び出し元の書き込みと同じトランザクションで実行する)。
+    1トランザクションで同じ家族を上げるのは1回だけ (2回目以降はクエリを発行しない)。
+    updated_at は変えない (家族情報の ETag は家族自体の更新時のみ変わる)。
+    """
+    if family_id in _bumped_family_ids(db):
+        return
+    statement = (
+        update(Family)
+        .where(Family.id == family_id)
+        .values(cache_version=Family.cache_version + 1, updated_at=Family.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(statement)
+    _bumped_family_ids(db).add(family_id)
+
+
+async def bump_family_cache_versions_for_tasks(
+    db: AsyncSession, *, task_ids: Iterable[int]
+) -> None:
+    """
+    指定したタスクが属する家族の cache_version をまとめて上げる (1文)。
+    家族IDがわからない一括更新 (定常タスクの次回発生日の更新など) 用。
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    statement = (
+        update(Family)
+        .where(Family.id.in_(select(Task.family_id).where(Task.id.in_(task_ids))))
+        .values(cache_version=Family.cache_version + 1, updated_at=Family.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(statement)
+
+
+async def get_family_with_member_role(
+    db: AsyncSession, *, family_id: int, user_id: int
+) -> tuple[Family | None, MembershipRole | None]:
+    """
+    家族と、指定ユーザーのその家族での役割を1回のJOINクエリで取得する。
+    家族が存在しなければ (None, None)、メンバーでなければ (Family, None) を返す。
+    """
+    statement = (
+        select(Family, FamilyMembership.role)
+        .outerjoin(
+            FamilyMembership,
+            (FamilyMembership.family_id == Family.id)
+            & (FamilyMembership.user_id == user_id),
+        )
+        .where(Family.id == family_id)
+    )
+    result = await db.exec(statement)
+    row = result.first()
+    if row is None:
+        return None, None
+    family, role = row
+    return family, role
+
+
 async def get_family_by_name(db: AsyncSession, name: str) -> Family | None:
     """家族名を指定して家族情報を取得する (重複チェック用)"""
     statement = select(Family).where(Family.family_name == name)
@@ -46,3 +199,16 @@ async def get_families(
     result = await db.exec(statement)
     families = result.all()
     return list(families)  # 結果をリストとして返す
+
+
+async def delete_family(db: AsyncSession, *, family_id: int) -> int:
+    """
+    家族を削除し、削除件数を返す。
+    ラベル・タスク・メンバーシップなどの関連データは呼び出し元で先に削除しておくこと。
+    """
+    statement = delete(Family).where(Family.id == family_id)
+    result = await db.execute(statement)
+    await db.flush()
+    # この家族に関する認可キャッシュをまとめて無効化する (コミット後にも再度削除される)
+    invalidate_membership_cache_on_commit(db, family_id=family_id)
+    return result.rowcount
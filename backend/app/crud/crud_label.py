@@ -1,8 +1,13 @@
-from typing import List, Sequence
+import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from sqlalchemy import func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.pagination import keyset_after
+from app.crud import crud_family
+from app.crud.rows import LabelRow
 from app.models.label import Label
 from app.schemas.label import LabelCreate, LabelUpdate
 
@@ -14,6 +19,32 @@ async def get_label(db: AsyncSession, *, label_id: int, family_id: int) -> Label
     return result.first()
 
 
+async def get_label_updated_at(
+    db: AsyncSession, *, label_id: int, family_id: int
+) -> datetime.datetime | None:
+    """ラベルの updated_at のみを取得する (ETag計算用)。存在しなければ None"""
+    statement = select(Label.updated_at).where(
+        Label.id == label_id, Label.family_id == family_id
+    )
+    result = await db.exec(statement)
+    return result.first()
+
+
+async def get_labels_version(
+    db: AsyncSession, *, family_id: int
+) -> Tuple[int, datetime.datetime | None]:
+    """
+    家族のラベルの (件数, 最新の updated_at) を1回の集計クエリで取得する (一覧のETag計算用)。
+    追加・更新は max(updated_at)、削除は件数の変化で検知できる。
+    """
+    statement = select(func.count(Label.id), func.max(Label.updated_at)).where(
+        Label.family_id == family_id
+    )
+    result = await db.exec(statement)
+    count, last_updated_at = result.one()
+    return count, last_updated_at
+
+
 async def get_label_by_name_and_family(
     db: AsyncSession, *, name: str, family_id: int
 ) -> Label | None:
@@ -24,17 +55,67 @@ async def get_label_by_name_and_family(
 
 
 async def get_labels_by_family(
-    db: AsyncSession, *, family_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    *,
+    family_id: int,
+    after: Optional[Tuple[str, int]] = None,
+    limit: int = 100,
 ) -> Sequence[Label]:
-    """指定された家族IDのラベルリストを取得する (ページネーション対応準備)"""
-    statement = (
-        select(Label).where(Label.family_id == family_id).offset(skip).limit(limit)
+    """
+    指定された家族IDのラベルリストを (name, id) 順のキーセットページネーションで取得する。
+    after には前ページ最後のラベルの (name, id) を渡す (ix_label_family_id_name_id を使用)。
+    """
+    statement = _paginate_labels_by_family(
+        select(Label), family_id=family_id, after=after, limit=limit
     )
     result = await db.exec(statement)
     labels = result.all()
     return labels
 
 
+# LabelRow の属性に対応する列
+LABEL_ROW_COLUMNS = tuple(getattr(Label, name) for name in LabelRow.__slots__)
+
+
+async def get_label_rows_by_family(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    after: Optional[Tuple[str, int]] = None,
+    limit: int = 100,
+) -> List[LabelRow]:
+    """
+    get_labels_by_family の一覧API用。LabelRead に必要な列だけを SELECT し、
+    ORMインスタンスを作らずに LabelRow (__slots__) に詰めて返す。
+    """
+    statement = _paginate_labels_by_family(
+        select(*LABEL_ROW_COLUMNS), family_id=family_id, after=after, limit=limit
+    )
+    result = await db.execute(statement)
+    return [LabelRow(*row) for row in result]
+
+
+def _paginate_labels_by_family(
+    statement: Any,
+    *,
+    family_id: int,
+    after: Optional[Tuple[str, int]],
+    limit: int,
+) -> Any:
+    """ラベル一覧のSELECT文に、家族での絞り込みと (name, id) 順のキーセット条件を付ける"""
+    statement = (
+        statement.where(Label.family_id == family_id)
+        .order_by(Label.name, Label.id)
+        .limit(limit)
+    )
+    if after is not None:
+        last_name, last_id = after
+        statement = statement.where(
+            keyset_after(Label.name, Label.id, last_name, last_id)
+        )
+    return statement
+
+
 async def get_labels_by_ids_and_family(
     db: AsyncSession, *, label_ids: List[int], family_id: int
 ) -> Sequence[Label]:
@@ -53,6 +134,27 @@ async def get_labels_by_ids_and_family(
     return labels
 
 
+async def get_label_ids_by_names(
+    db: AsyncSession, *, names: Sequence[str], family_id: int
+) -> Dict[str, int]:
+    """
+    家族のラベルを名前で探し、名前 -> ラベルID を返す (インポート用)。
+    同じ名前のラベルが複数ある場合はIDの小さい方を返す。見つからない名前は含まれない。
+    """
+    if not names:
+        return {}
+    statement = (
+        select(Label.name, Label.id)
+        .where(Label.name.in_(names), Label.family_id == family_id)
+        .order_by(Label.id)
+    )
+    result = await db.exec(statement)
+    label_ids: Dict[str, int] = {}
+    for name, label_id in result.all():
+        label_ids.setdefault(name, label_id)
+    return label_ids
+
+
 async def create_label(
     db: AsyncSession, *, label_in: LabelCreate, family_id: int, creator_id: int
 ) -> Label:
@@ -66,6 +168,7 @@ async def create_label(
     )
     db.add(db_label)
     await db.flush()
+    await crud_family.bump_family_cache_version(db, family_id=family_id)
     await db.refresh(db_label)
     return db_label
 
@@ -87,6 +190,7 @@ async def update_label(
 
     db.add(db_label)  # セッションに変更を認識させる
     await db.flush()
+    await crud_family.bump_family_cache_version(db, family_id=db_label.family_id)
     await db.refresh(db_label)
     return db_label
 
@@ -95,4 +199,5 @@ async def delete_label(db: AsyncSession, *, db_label: Label) -> None:
     """ラベルを削除する (セッションから削除)"""
     await db.delete(db_label)
     await db.flush()
+    await crud_family.bump_family_cache_version(db, family_id=db_label.family_id)
     # コミットは呼び出し元 (Service層 or リクエストスコープ) で行う
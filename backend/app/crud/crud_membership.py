@@ -1,6 +1,7 @@
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud import crud_family
 from app.models.family_membership import FamilyMembership, MembershipRole
 
 
@@ -17,6 +18,11 @@ async def create_membership(
     db_membership = FamilyMembership(user_id=user_id, family_id=family_id, role=role)
     db.add(db_membership)
     await db.flush()  # DBに反映させてIDなどを取得 (コミットはしない)
+    # 認可キャッシュを無効化 (ロールが変わる可能性があるため書き込み時に必ず消す)
+    crud_family.invalidate_membership_cache_on_commit(
+        db, user_id=user_id, family_id=family_id
+    )
+    await crud_family.bump_family_cache_version(db, family_id=family_id)
     await db.refresh(db_membership)
     print(f"DEBUG: Membership created in session: ID {db_membership.id}")
     return db_membership
@@ -30,3 +36,28 @@ async def is_user_member(db: AsyncSession, *, user_id: int, family_id: int) -> b
     result = await db.exec(statement)
     membership = result.first()
     return membership is not None
+
+
+async def get_membership_role(
+    db: AsyncSession, *, user_id: int, family_id: int
+) -> MembershipRole | None:
+    """ユーザーの家族内での役割を取得する。メンバーでなければ None を返す"""
+    statement = select(FamilyMembership.role).where(
+        FamilyMembership.user_id == user_id, FamilyMembership.family_id == family_id
+    )
+    result = await db.exec(statement)
+    return result.first()
+
+
+async def delete_membership(
+    db: AsyncSession, *, db_membership: FamilyMembership
+) -> None:
+    """メンバーシップを削除する (セッションから削除)"""
+    await db.delete(db_membership)
+    await db.flush()
+    # 削除 (権限の剥奪) はコミット後にも認可キャッシュを消す。他のワーカーのキャッシュは
+    # MEMBERSHIP_CACHE_TTL_SECONDS が経過するまで残る
+    crud_family.invalidate_membership_cache_on_commit(
+        db, user_id=db_membership.user_id, family_id=db_membership.family_id
+    )
+    await crud_family.bump_family_cache_version(db, family_id=db_membership.family_id)
@@ -1,13 +1,77 @@
+import datetime
 import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
 
+import orjson
+from sqlalchemy import (
+    Row,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.models.task import Task
-from app.schemas.task import TaskCreate
+from app.core.pagination import keyset_after
+from app.core.recurrence import next_occurrences
+from app.core.text_search import bigram_tokens, build_search_tokens
+from app.crud import crud_family, crud_task_label
+from app.crud.rows import LabelSummaryRow, TaskRow, UserSummaryRow
+from app.models.family_membership import FamilyMembership
+from app.models.label import Label
+from app.models.task import TASK_SEARCH_TSVECTOR, Task, TaskType
+from app.models.task_label import TaskLabel
+from app.models.user import User
+from app.schemas.label import LabelSummary
+from app.schemas.task import TaskCreate, TaskSortKey
+from app.schemas.user import UserSummary
 
 logger = logging.getLogger(__name__)
 
 
+def _task_create_to_dict(task_in: TaskCreate) -> Dict[str, Any]:
+    """TaskCreateをTaskモデル用の辞書に変換する (label_idsは除き、routine_settingsは辞書化)"""
+    task_data_dict = task_in.model_dump(exclude={"label_ids"})
+    if task_data_dict.get("routine_settings") is not None:
+        # Pydantic v2 では .model_dump() を使う
+        task_data_dict["routine_settings"] = task_in.routine_settings.model_dump()
+    return task_data_dict
+
+
+def _initial_next_occurrences(
+    tasks_in: Sequence[TaskCreate],
+) -> List[Optional[datetime.date]]:
+    """定常タスクの最初の発生日 (期日、なければ今日以降) をまとめて計算する。単発タスクは None"""
+    today = datetime.date.today()
+    routine_indexes = [
+        i
+        for i, task_in in enumerate(tasks_in)
+        if task_in.task_type == TaskType.ROUTINE and task_in.routine_settings
+    ]
+    results: List[Optional[datetime.date]] = [None] * len(tasks_in)
+    if not routine_indexes:
+        return results
+    routines = [tasks_in[i] for i in routine_indexes]
+    computed = next_occurrences(
+        [task_in.routine_settings.model_dump() for task_in in routines],
+        after=[
+            (task_in.due_date or today) - datetime.timedelta(days=1)
+            for task_in in routines
+        ],
+        anchors=[task_in.due_date for task_in in routines],
+    )
+    for i, next_date in zip(routine_indexes, computed):
+        results[i] = next_date
+    return results
+
+
 async def create_task(
     db: AsyncSession, *, task_in: TaskCreate, family_id: int, creator_id: int
 ) -> Task:
@@ -21,10 +85,7 @@ async def create_task(
     # routine_settingsはスキーマ(RoutineSettings)からDictに変換が必要か？
     # -> DBモデル側はJSON(Dict)を期待しているので、スキーマからDictに変換する
     # routine_settings が None でない場合、 Pydanticモデルから辞書に変換
-    task_data_dict = task_in.model_dump(exclude={"label_ids"})
-    if task_data_dict.get("routine_settings") is not None:
-        # Pydantic v2 では .model_dump() を使う
-        task_data_dict["routine_settings"] = task_in.routine_settings.model_dump()
+    task_data_dict = _task_create_to_dict(task_in)
 
     # Taskモデルインスタンスを作成
     db_task = Task(
@@ -32,6 +93,7 @@ async def create_task(
         family_id=family_id,
         created_by_id=creator_id,
         updated_by_id=creator_id,  # 作成時は更新者も作成者と同じ
+        next_occurrence_date=_initial_next_occurrences([task_in])[0],
     )
 
     # セッションに追加
@@ -40,6 +102,7 @@ async def create_task(
     try:
         # DBにINSERT文を送信し、IDなどを確定させる
         await db.flush()
+        await crud_family.bump_family_cache_version(db, family_id=family_id)
         # DBから最新の状態（自動採番ID、デフォルト値など）をオブジェクトに反映させる
         await db.refresh(db_task)
         logger.info(f"Task '{db_task.title}' (ID: {db_task.id}) flushed to session.")
@@ -52,4 +115,654 @@ async def create_task(
     return db_task
 
 
+def _task_insert_rows(
+    tasks_in: Sequence[TaskCreate], *, family_id: int, creator_id: int
+) -> List[Dict[str, Any]]:
+    """
+    TaskCreate を INSERT 用の辞書 (TASK_IMPORT_COLUMNS の列) にする。
+    一括 INSERT では ORM のイベントが動かないため、search_tokens・作成日時もここで設定する。
+    """
+    now = datetime.datetime.now()
+    rows = []
+    for task_in, next_date in zip(tasks_in, _initial_next_occurrences(tasks_in)):
+        row = _task_create_to_dict(task_in)
+        row.update(
+            family_id=family_id,
+            next_occurrence_date=next_date,
+            created_by_id=creator_id,
+            updated_by_id=creator_id,
+            search_tokens=build_search_tokens(task_in.title, task_in.notes) or None,
+            created_at=now,
+            updated_at=now,
+        )
+        rows.append(row)
+    return rows
+
+
+async def _insert_task_rows(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    rows を複数行の INSERT ... RETURNING でまとめて書き込み、作成したIDを rows の順に返す。
+    sort_by_parameter_order=True は SQLite では1行ずつの INSERT になるため使わない。
+    1文の中で採番されるIDは VALUES の順に増えるので、ID順に並べれば rows の順になる。
+    """
+    result = await db.execute(
+        insert(Task.__table__).returning(Task.__table__.c.id), rows
+    )
+    return sorted(result.scalars())
+
+
+async def create_tasks(
+    db: AsyncSession,
+    *,
+    tasks_in: Sequence[TaskCreate],
+    family_id: int,
+    creator_id: int,
+) -> List[Task]:
+    """
+    複数のTaskをまとめて作成し、tasks_in の順に返す (返すTaskはセッションに登録済み)。
+    件数によらず1回の複数行 INSERT ... RETURNING で作成する。ORM のフラッシュは
+    SQLite では RETURNING の順序を保証できず1行ずつの INSERT になるため使わない。
+    並び順は _insert_task_rows と同じく、1文の中で採番されるIDの順で決める。
+    """
+    logger.info(
+        f"Creating {len(tasks_in)} tasks for family {family_id} by user {creator_id}"
+    )
+    rows = _task_insert_rows(tasks_in, family_id=family_id, creator_id=creator_id)
+    try:
+        # render_nulls: None の列も省かない (行ごとに列がそろわないと1行ずつの INSERT になる)
+        statement = insert(Task).returning(Task).execution_options(render_nulls=True)
+        result = await db.execute(statement, rows)
+        db_tasks = sorted(result.scalars(), key=lambda task: task.id)
+        await crud_family.bump_family_cache_version(db, family_id=family_id)
+    except Exception as e:
+        logger.error(
+            f"Error during bulk insert of {len(rows)} tasks for family {family_id}: {e}",
+            exc_info=True,
+        )
+        raise
+    return db_tasks
+
+
+# インポートで書き込む Task の列 (id は PostgreSQL ではシーケンスから先に払い出す)
+TASK_IMPORT_COLUMNS = (
+    "family_id",
+    "title",
+    "notes",
+    "is_done",
+    "task_type",
+    "due_date",
+    "next_occurrence_date",
+    "priority",
+    "routine_settings",
+    "assignee_id",
+    "parent_task_id",
+    "created_by_id",
+    "updated_by_id",
+    "search_tokens",
+    "created_at",
+    "updated_at",
+)
+
+
+async def _copy_records(
+    db: AsyncSession,
+    *,
+    table_name: str,
+    columns: Sequence[str],
+    records: List[Tuple[Any, ...]],
+) -> None:
+    """asyncpg の COPY (copy_records_to_table) で、セッションのトランザクション内に書き込む"""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table_name, records=records, columns=list(columns)
+    )
+
+
+async def _copy_tasks(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    PostgreSQL: id をシーケンスからまとめて払い出してから、COPY でタスクを書き込む。
+    COPY は型変換をしないため、Enum は名前、JSON は文字列にして渡す。
+    """
+    result = await db.execute(
+        text(
+            "SELECT nextval(pg_get_serial_sequence(:table_name, 'id')) "
+            "FROM generate_series(1, :count)"
+        ),
+        {"table_name": Task.__table__.name, "count": len(rows)},
+    )
+    task_ids = list(result.scalars())
+    records = []
+    for task_id, row in zip(task_ids, rows):
+        values = dict(row, task_type=TaskType(row["task_type"]).name)
+        if values["routine_settings"] is not None:
+            values["routine_settings"] = orjson.dumps(
+                values["routine_settings"]
+            ).decode()
+        records.append((task_id, *(values[name] for name in TASK_IMPORT_COLUMNS)))
+    await _copy_records(
+        db,
+        table_name=Task.__table__.name,
+        columns=("id", *TASK_IMPORT_COLUMNS),
+        records=records,
+    )
+    return task_ids
+
+
+async def import_tasks(
+    db: AsyncSession,
+    *,
+    tasks_in: Sequence[TaskCreate],
+    family_id: int,
+    creator_id: int,
+) -> List[int]:
+    """
+    インポート用に、検証済みのタスクとラベルの紐付けを ORM を経由せずにまとめて書き込み、
+    作成したタスクのIDを tasks_in の順に返す。
+    PostgreSQL では COPY、それ以外 (SQLite) では複数行の INSERT ... RETURNING
+    (_insert_task_rows。件数によらず1文) を使う。
+    担当者・ラベルが家族のものであることは呼び出し元で確認しておくこと。
+    """
+    if not tasks_in:
+        return []
+    rows = _task_insert_rows(tasks_in, family_id=family_id, creator_id=creator_id)
+    links_by_task = [
+        list(dict.fromkeys(task_in.label_ids or [])) for task_in in tasks_in
+    ]
+    if db.get_bind().dialect.name == "postgresql":
+        task_ids = await _copy_tasks(db, rows)
+        # 作成したばかりのタスクなので、紐付けが既存の行と衝突することはない
+        await _copy_records(
+            db,
+            table_name=TaskLabel.__table__.name,
+            columns=("task_id", "label_id"),
+            records=[
+                (task_id, label_id)
+                for task_id, label_ids in zip(task_ids, links_by_task)
+                for label_id in label_ids
+            ],
+        )
+    else:
+        task_ids = await _insert_task_rows(db, rows)
+        await crud_task_label.add_labels_to_tasks(
+            db,
+            links=(
+                (task_id, label_id)
+                for task_id, label_ids in zip(task_ids, links_by_task)
+                for label_id in label_ids
+            ),
+            family_id=family_id,
+        )
+    await crud_family.bump_family_cache_version(db, family_id=family_id)
+    logger.info(f"Imported {len(task_ids)} tasks into family {family_id}")
+    return task_ids
+
+
+async def get_existing_task_ids(
+    db: AsyncSession, *, family_id: int, task_ids: Sequence[int]
+) -> Set[int]:
+    """task_ids のうち、家族に存在するタスクのIDを返す (親タスクの検証用)"""
+    if not task_ids:
+        return set()
+    result = await db.execute(
+        select(Task.id).where(Task.family_id == family_id, Task.id.in_(task_ids))
+    )
+    return set(result.scalars())
+
+
+async def get_task_references(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    assignee_ids: Sequence[int],
+    label_ids: Sequence[int],
+) -> Tuple[Dict[int, UserSummary], Dict[int, LabelSummary]]:
+    """
+    タスクが参照する担当者 (家族のメンバー) とラベル (家族のラベル) を
+    1回の UNION ALL クエリで取得する。見つからなかったIDは結果に含まれない。
+    """
+    queries = []
+    if assignee_ids:
+        queries.append(
+            select(
+                literal("assignee").label("kind"),
+                User.id.label("id"),
+                User.name.label("name"),
+                User.avatar_url.label("extra"),
+            )
+            .join(FamilyMembership, FamilyMembership.user_id == User.id)
+            .where(
+                User.id.in_(assignee_ids),
+                FamilyMembership.family_id == family_id,
+            )
+        )
+    if label_ids:
+        queries.append(
+            select(
+                literal("label").label("kind"),
+                Label.id.label("id"),
+                Label.name.label("name"),
+                Label.color.label("extra"),
+            ).where(Label.id.in_(label_ids), Label.family_id == family_id)
+        )
+    assignees: Dict[int, UserSummary] = {}
+    labels: Dict[int, LabelSummary] = {}
+    if not queries:
+        return assignees, labels
+
+    statement = queries[0] if len(queries) == 1 else union_all(*queries)
+    result = await db.execute(statement)
+    for kind, ref_id, name, extra in result.all():
+        if kind == "assignee":
+            assignees[ref_id] = UserSummary(id=ref_id, name=name, avatar_url=extra)
+        else:
+            labels[ref_id] = LabelSummary(id=ref_id, name=name, color=extra)
+    return assignees, labels
+
+
+# 並び順ごとの (並び替え列, 降順か, NULLを含むか, カーソル値の型変換)
+TASK_SORT_COLUMNS = {
+    TaskSortKey.DUE_DATE: (Task.due_date, False, True, datetime.date.fromisoformat),
+    TaskSortKey.CREATED_AT: (
+        Task.created_at,
+        True,
+        False,
+        datetime.datetime.fromisoformat,
+    ),
+}
+
+
+def build_tasks_by_family_statement(
+    *,
+    family_id: int,
+    sort: TaskSortKey = TaskSortKey.DUE_DATE,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50,
+    is_done: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+) -> SelectOfScalar[Task]:
+    """get_tasks_by_family が発行するSELECT文を組み立てる (EXPLAINでの確認にも使う)"""
+    statement = select(Task).options(
+        selectinload(Task.labels),
+        selectinload(Task.assignee),
+        raiseload("*"),
+    )
+    return _filter_tasks_by_family(
+        statement,
+        family_id=family_id,
+        sort=sort,
+        after=after,
+        limit=limit,
+        is_done=is_done,
+        assignee_id=assignee_id,
+    )
+
+
+# TaskRow / UserSummaryRow / LabelSummaryRow の属性に対応する列
+TASK_ROW_COLUMNS = tuple(getattr(Task, name) for name in TaskRow.COLUMN_NAMES)
+USER_SUMMARY_ROW_COLUMNS = tuple(
+    getattr(User, name) for name in UserSummaryRow.__slots__
+)
+LABEL_SUMMARY_ROW_COLUMNS = tuple(
+    getattr(Label, name) for name in LabelSummaryRow.__slots__
+)
+
+
+def build_task_rows_by_family_statement(
+    *,
+    family_id: int,
+    sort: TaskSortKey = TaskSortKey.DUE_DATE,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50,
+    is_done: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+) -> Any:
+    """
+    get_task_rows_by_family が発行するSELECT文を組み立てる (EXPLAINでの確認にも使う)。
+    TaskRead に必要なタスクの列と、担当者の列 (LEFT OUTER JOIN) だけを選択する。
+    """
+    statement = select(*TASK_ROW_COLUMNS, *USER_SUMMARY_ROW_COLUMNS).outerjoin(
+        User, User.id == Task.assignee_id
+    )
+    return _filter_tasks_by_family(
+        statement,
+        family_id=family_id,
+        sort=sort,
+        after=after,
+        limit=limit,
+        is_done=is_done,
+        assignee_id=assignee_id,
+    )
+
+
+def _filter_tasks_by_family(
+    statement: Any,
+    *,
+    family_id: int,
+    sort: TaskSortKey,
+    after: Optional[Tuple[Any, int]],
+    limit: int,
+    is_done: Optional[bool],
+    assignee_id: Optional[int],
+) -> Any:
+    """タスク一覧のSELECT文に、絞り込み・キーセット条件・並び順・件数を付ける"""
+    sort_column, descending, nullable, _ = TASK_SORT_COLUMNS[sort]
+    statement = statement.where(Task.family_id == family_id).limit(limit)
+    if is_done is not None:
+        statement = statement.where(Task.is_done == is_done)
+    if assignee_id is not None:
+        statement = statement.where(Task.assignee_id == assignee_id)
+    if after is not None:
+        value, last_id = after
+        statement = statement.where(
+            keyset_after(
+                sort_column,
+                Task.id,
+                value,
+                last_id,
+                descending=descending,
+                nullable=nullable,
+            )
+        )
+    if descending:
+        return statement.order_by(sort_column.desc(), Task.id.desc())
+    return statement.order_by(sort_column.asc().nulls_last(), Task.id.asc())
+
+
+def _null_range_after(
+    sort: TaskSortKey, after: Optional[Tuple[Any, int]], fetched: int, limit: int
+) -> Optional[Tuple[None, None]]:
+    """
+    NULLを含む並び順 (期限日) で、カーソルが非NULLの区間にあり、その区間を読み終えても
+    limit 件に満たなかった場合に、NULLの区間の先頭から続けて読むための after を返す。
+    (keyset_after は非NULLの区間とNULLの区間をそれぞれインデックスの範囲として読む)
+    """
+    _, _, nullable, _ = TASK_SORT_COLUMNS[sort]
+    if nullable and after is not None and after[0] is not None and fetched < limit:
+        return None, None
+    return None
+
+
+async def get_tasks_by_family(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    sort: TaskSortKey = TaskSortKey.DUE_DATE,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50,
+    is_done: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+) -> Sequence[Task]:
+    """
+    家族のタスクを (並び替えキー, id) のキーセットページネーションで取得する。
+    after には前ページ最後の行の (並び替えキーの値, id) を渡す。
+    ラベルと担当者は selectin で一括読み込みし (行数によらずクエリ2回)、
+    それ以外のリレーションへの遅延読み込みは raiseload で禁止する。
+    期限日順でページが期限日ありの行から期限日なしの行にまたがる場合のみ、
+    期限日なしの行を2回目のクエリで取得する。
+    """
+    filters = dict(
+        family_id=family_id, sort=sort, is_done=is_done, assignee_id=assignee_id
+    )
+    statement = build_tasks_by_family_statement(after=after, limit=limit, **filters)
+    tasks = list((await db.exec(statement)).all())
+    null_after = _null_range_after(sort, after, len(tasks), limit)
+    if null_after is not None:
+        statement = build_tasks_by_family_statement(
+            after=null_after, limit=limit - len(tasks), **filters
+        )
+        tasks.extend((await db.exec(statement)).all())
+    return tasks
+
+
+async def get_task_rows_by_family(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    sort: TaskSortKey = TaskSortKey.DUE_DATE,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50,
+    is_done: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+) -> List[TaskRow]:
+    """
+    get_tasks_by_family の一覧API用。ORMインスタンスを作らず、TaskRead に必要な列だけを
+    TaskRow (__slots__) に詰めて返す。担当者はタスクと同じクエリで JOIN し、
+    ラベルはページ内のタスクの分をまとめて1回のクエリで取得する (クエリは合計2回)。
+    期限日順でページが期限日ありの行から期限日なしの行にまたがる場合のみ、
+    期限日なしの行を追加のクエリで取得する (get_tasks_by_family と同じ)。
+    """
+    filters = dict(
+        family_id=family_id, sort=sort, is_done=is_done, assignee_id=assignee_id
+    )
+    statement = build_task_rows_by_family_statement(after=after, limit=limit, **filters)
+    tasks = _build_task_rows(await db.execute(statement))
+    null_after = _null_range_after(sort, after, len(tasks), limit)
+    if null_after is not None:
+        statement = build_task_rows_by_family_statement(
+            after=null_after, limit=limit - len(tasks), **filters
+        )
+        tasks.extend(_build_task_rows(await db.execute(statement)))
+    await _fill_label_rows(db, tasks)
+    return tasks
+
+
+def build_task_export_statement(*, family_id: int) -> Any:
+    """
+    stream_task_rows_by_family が発行するSELECT文を組み立てる (EXPLAINでの確認にも使う)。
+    家族の全タスクを作成日時・id 順に返す (ix_task_family_id_created_at の順序で読める)。
+    """
+    return (
+        select(*TASK_ROW_COLUMNS, *USER_SUMMARY_ROW_COLUMNS)
+        .outerjoin(User, User.id == Task.assignee_id)
+        .where(Task.family_id == family_id)
+        .order_by(Task.created_at.asc(), Task.id.asc())
+    )
+
+
+async def stream_task_rows_by_family(
+    db: AsyncSession, *, family_id: int, chunk_size: int = 1000
+) -> AsyncIterator[List[TaskRow]]:
+    """
+    家族の全タスクを、chunk_size 件ずつの TaskRow のリストとして順に返す (エクスポート用)。
+    サーバーサイドカーソル (stream + yield_per) で読むため、件数によらずメモリに載るのは
+    1チャンク分だけ。ラベルはチャンクごとに1回のクエリでまとめて取得する。
+    """
+    statement = build_task_export_statement(family_id=family_id).execution_options(
+        yield_per=chunk_size
+    )
+    result = await db.stream(statement)
+    try:
+        async for partition in result.partitions():
+            tasks = _build_task_rows(partition)
+            await _fill_label_rows(db, tasks)
+            yield tasks
+    finally:
+        # 途中で打ち切られた場合 (クライアントの切断など) もカーソルを閉じる
+        await result.close()
+
+
+def _build_task_rows(rows: Any) -> List[TaskRow]:
+    """タスクの列 + 担当者の列の行から TaskRow (担当者付き) のリストを作る"""
+    column_count = len(TASK_ROW_COLUMNS)
+    tasks: List[TaskRow] = []
+    for row in rows:
+        task = TaskRow(*row[:column_count])
+        if row[column_count] is not None:
+            task.assignee = UserSummaryRow(*row[column_count:])
+        tasks.append(task)
+    return tasks
+
+
+async def _fill_label_rows(db: AsyncSession, tasks: Sequence[TaskRow]) -> None:
+    """タスクの labels を、タスクID・ラベルID順に1回のクエリでまとめて埋める"""
+    if not tasks:
+        return
+    tasks_by_id = {task.id: task for task in tasks}
+    statement = (
+        select(TaskLabel.task_id, *LABEL_SUMMARY_ROW_COLUMNS)
+        .join(Label, Label.id == TaskLabel.label_id)
+        .where(TaskLabel.task_id.in_(list(tasks_by_id)))
+        .order_by(TaskLabel.task_id, TaskLabel.label_id)
+    )
+    result = await db.execute(statement)
+    for task_id, *label_values in result:
+        tasks_by_id[task_id].labels.append(LabelSummaryRow(*label_values))
+
+
+def _search_condition(dialect_name: str, query: str) -> Any:
+    """
+    検索文字列の全バイグラムを含むタスクの条件を返す (索引を使える場合)。
+    1文字だけの語を含む場合や、対応していないDBでは None を返す。
+    """
+    tokens = bigram_tokens(query)
+    if not tokens or any(len(token) < 2 for token in tokens):
+        return None
+    if dialect_name == "postgresql":
+        # ix_task_search_tokens_gin と同じ式にしないとインデックスが使われない
+        return literal_column(TASK_SEARCH_TSVECTOR).op("@@")(
+            func.plainto_tsquery(
+                literal_column("'simple'::regconfig"), " ".join(tokens)
+            )
+        )
+    if dialect_name == "sqlite":
+        match = " AND ".join(f'"{token}"' for token in tokens)
+        return Task.id.in_(
+            text("SELECT rowid FROM task_fts WHERE task_fts MATCH :match").bindparams(
+                match=match
+            )
+        )
+    return None
+
+
+async def search_tasks(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    query: str,
+    limit: int = 20,
+    is_done: Optional[bool] = None,
+) -> Sequence[Task]:
+    """
+    家族のタスクを title / notes で全文検索する (新しく更新された順)。
+    検索文字列の文字バイグラムをすべて含むタスクを、全文検索インデックスで探す
+    (PostgreSQL: tsvector + GIN / SQLite: FTS5)。
+    1文字の検索語などインデックスを使えない場合は、家族内の LIKE 検索にフォールバックする。
+    """
+    condition = _search_condition(db.get_bind().dialect.name, query)
+    if condition is None:
+        keyword = query.strip()
+        condition = or_(
+            Task.title.icontains(keyword, autoescape=True),
+            Task.notes.icontains(keyword, autoescape=True),
+        )
+    statement = (
+        select(Task)
+        .where(Task.family_id == family_id, condition)
+        .options(
+            selectinload(Task.labels),
+            selectinload(Task.assignee),
+            raiseload("*"),
+        )
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(limit)
+    )
+    if is_done is not None:
+        statement = statement.where(Task.is_done == is_done)
+    result = await db.exec(statement)
+    return result.all()
+
+
+async def get_routine_tasks_to_roll_forward(
+    db: AsyncSession, *, today: datetime.date, after_id: int = 0, limit: int = 10_000
+) -> Sequence[Row]:
+    """
+    次回発生日が未設定、または過ぎている定常タスクの (id, routine_settings, due_date) を
+    id 順に limit 件取得する (after_id より大きい id のみ)。ORMオブジェクトは作らない。
+    """
+    statement = (
+        select(Task.id, Task.routine_settings, Task.due_date)
+        .where(
+            Task.task_type == TaskType.ROUTINE,
+            or_(
+                Task.next_occurrence_date.is_(None),
+                Task.next_occurrence_date < today,
+            ),
+            Task.id > after_id,
+        )
+        .order_by(Task.id)
+        .limit(limit)
+    )
+    result = await db.exec(statement)
+    return result.all()
+
+
+async def update_next_occurrence_dates(
+    db: AsyncSession, *, updates: Sequence[Tuple[int, Optional[datetime.date]]]
+) -> int:
+    """
+    (task_id, next_occurrence_date) の組で次回発生日をまとめて更新する。
+    主キー指定の一括 UPDATE (executemany) になり、ORMオブジェクトは読み込まない。
+    対象タスクが属する家族の cache_version も1文でまとめて上げる。
+    """
+    if not updates:
+        return 0
+    await db.execute(
+        update(Task),
+        [
+            {"id": task_id, "next_occurrence_date": next_date}
+            for task_id, next_date in updates
+        ],
+    )
+    await crud_family.bump_family_cache_versions_for_tasks(
+        db, task_ids=[task_id for task_id, _ in updates]
+    )
+    logger.debug(f"Updated next_occurrence_date of {len(updates)} tasks")
+    return len(updates)
+
+
+def build_agenda_candidates_statement(
+    *, family_id: int, start: datetime.date, end: datetime.date
+) -> SelectOfScalar[Task]:
+    """
+    アジェンダの候補タスクを取得するSELECT文を組み立てる (EXPLAINでの確認にも使う)。
+    - 単発タスク: 期日が期間内 (ix_task_family_id_due_date)
+    - 定常タスク: 次回発生日が期間の終わり以前 (ix_task_family_id_next_occurrence_date)
+    """
+    return (
+        select(Task)
+        .where(
+            Task.family_id == family_id,
+            or_(
+                (Task.task_type == TaskType.SINGLE) & Task.due_date.between(start, end),
+                (Task.task_type == TaskType.ROUTINE)
+                & (Task.next_occurrence_date <= end),
+            ),
+        )
+        .options(
+            selectinload(Task.labels),
+            selectinload(Task.assignee),
+            raiseload("*"),
+        )
+    )
+
+
+async def get_agenda_candidates(
+    db: AsyncSession,
+    *,
+    family_id: int,
+    start: datetime.date,
+    end: datetime.date,
+) -> Sequence[Task]:
+    """
+    アジェンダの候補タスク (ラベル・担当者を読み込み済み) を id 順に取得する。
+    ORDER BY を付けると2つのインデックスの OR 検索が使われなくなるため、並び替えはメモリ上で行う。
+    """
+    statement = build_agenda_candidates_statement(
+        family_id=family_id, start=start, end=end
+    )
+    result = await db.exec(statement)
+    return sorted(result.all(), key=lambda task: task.id)
+
+
 # --- 他のCRUD関数 (get_task, get_tasks_by_family, update_task, delete_task) の骨組みも後で追加 ---
@@ -1,12 +1,20 @@
 import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
 from sqlmodel import delete
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud import crud_family
 from app.models.task_label import TaskLabel
 
 logger = logging.getLogger(__name__)
 
+# 1文あたりの最大行数 (SQLiteのバインドパラメータ上限 32766 を超えないようにする)
+LINK_INSERT_CHUNK_SIZE = 10_000
+
 
 async def add_label_to_task(
     db: AsyncSession, *, task_id: int, label_id: int
@@ -19,6 +27,7 @@ async def add_label_to_task(
 
     try:
         await db.flush()
+        await crud_family.bump_family_cache_versions_for_tasks(db, task_ids=[task_id])
         # refreshは必須ではないことが多い (複合主キーのみのため)
         # await db.refresh(db_link)
     except Exception as e:
@@ -32,7 +41,89 @@ async def add_label_to_task(
     return db_link
 
 
-async def delete_labels_for_task(db: AsyncSession, *, task_id: int) -> int:
+def _insert_links_ignoring_duplicates(
+    db: AsyncSession, rows: List[Dict[str, Any]]
+) -> Insert:
+    """
+    既存の関連を無視する複数行 INSERT 文を作る。
+    PostgreSQL: ON CONFLICT DO NOTHING / SQLite: INSERT OR IGNORE
+    """
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(TaskLabel).values(rows).on_conflict_do_nothing()
+    if dialect_name == "sqlite":
+        return sqlite.insert(TaskLabel).values(rows).prefix_with("OR IGNORE")
+    # その他のDBでは重複を無視できないため通常の INSERT (重複時は主キー制約違反)
+    return insert(TaskLabel).values(rows)
+
+
+async def _bump_family_cache_versions(
+    db: AsyncSession, *, family_id: Optional[int], task_ids: Iterable[int]
+) -> None:
+    """関連を書き込んだ家族の cache_version を上げる (family_id が不明ならタスクから求める)"""
+    if family_id is not None:
+        await crud_family.bump_family_cache_version(db, family_id=family_id)
+    else:
+        await crud_family.bump_family_cache_versions_for_tasks(
+            db, task_ids=dict.fromkeys(task_ids)
+        )
+
+
+async def add_labels_to_tasks(
+    db: AsyncSession,
+    *,
+    links: Iterable[Tuple[int, int]],
+    family_id: Optional[int] = None,
+) -> int:
+    """
+    (task_id, label_id) の組をまとめて1回の複数行 INSERT で作成する。
+    すでに存在する関連は無視し、新たに作成した件数を返す。
+    LINK_INSERT_CHUNK_SIZE 件を超える場合のみ複数の文に分割する。
+    タスクの家族がわかっている場合は family_id を渡すと、家族のバージョン更新が安く済む。
+    """
+    # 同じ組が重複して渡されても1行にまとめる (順序は維持)
+    rows = [
+        {"task_id": task_id, "label_id": label_id}
+        for task_id, label_id in dict.fromkeys(links)
+    ]
+    if not rows:
+        return 0
+    logger.debug(f"Adding {len(rows)} task-label links in one statement")
+    inserted_count = 0
+    try:
+        for start in range(0, len(rows), LINK_INSERT_CHUNK_SIZE):
+            chunk = rows[start : start + LINK_INSERT_CHUNK_SIZE]
+            result = await db.execute(_insert_links_ignoring_duplicates(db, chunk))
+            inserted_count += result.rowcount
+    except Exception as e:
+        logger.error(f"Error inserting {len(rows)} TaskLabel links: {e}", exc_info=True)
+        raise
+    logger.debug(f"Inserted {inserted_count} of {len(rows)} task-label links")
+    if inserted_count:
+        await _bump_family_cache_versions(
+            db, family_id=family_id, task_ids=(row["task_id"] for row in rows)
+        )
+    return inserted_count
+
+
+async def add_labels_to_task(
+    db: AsyncSession,
+    *,
+    task_id: int,
+    label_ids: Iterable[int],
+    family_id: Optional[int] = None,
+) -> int:
+    """1つのTaskに複数のLabelをまとめて紐付ける (1文)。新たに作成した件数を返す。"""
+    return await add_labels_to_tasks(
+        db,
+        links=((task_id, label_id) for label_id in label_ids),
+        family_id=family_id,
+    )
+
+
+async def delete_labels_for_task(
+    db: AsyncSession, *, task_id: int, family_id: Optional[int] = None
+) -> int:
     """特定のTaskに関連する全てのLabel関連を削除し、フラッシュする。削除件数を返す。"""
     logger.debug(f"Deleting all label links for task {task_id}")
     statement = delete(TaskLabel).where(TaskLabel.task_id == task_id)
@@ -40,6 +131,10 @@ async def delete_labels_for_task(db: AsyncSession, *, task_id: int) -> int:
         result = await db.execute(statement)
         await db.flush()  # 削除をDBに反映させる
         deleted_count = result.rowcount
+        if deleted_count:
+            await _bump_family_cache_versions(
+                db, family_id=family_id, task_ids=[task_id]
+            )
         logger.debug(f"Deleted {deleted_count} label links for task {task_id}")
         return deleted_count
     except Exception as e:
@@ -0,0 +1,72 @@
+from typing import Any, List, Optional
+
+# --- 一覧用の軽量な行オブジェクト ---
+# 一覧APIでは SQLModel のインスタンス (セッションのアイデンティティマップで追跡され、
+# 全列と属性の変更履歴を持つ) を作らず、レスポンスに必要な列だけを SELECT して
+# __slots__ を持つオブジェクトに詰める。属性名はレスポンススキーマのフィールド名と同じなので、
+# app.core.serialization の trusted_* や Schema.model_validate にそのまま渡せる。
+
+
+class ProjectionRow:
+    """__slots__ の順に値を受け取る行オブジェクトの基底クラス"""
+
+    __slots__ = ()
+
+    def __init__(self, *values: Any) -> None:
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class LabelRow(ProjectionRow):
+    """LabelRead に必要な列だけを持つラベル"""
+
+    __slots__ = ("id", "name", "color", "created_at", "updated_at")
+
+
+class LabelSummaryRow(ProjectionRow):
+    """LabelSummary に必要な列だけを持つラベル"""
+
+    __slots__ = ("id", "name", "color")
+
+
+class UserSummaryRow(ProjectionRow):
+    """UserSummary に必要な列だけを持つユーザー"""
+
+    __slots__ = ("id", "name", "avatar_url")
+
+
+class TaskRow(ProjectionRow):
+    """
+    TaskRead に必要な列だけを持つタスク (search_tokens などの内部用の列は持たない)。
+    COLUMN_NAMES の順に列の値を受け取り、assignee (UserSummaryRow) と
+    labels (LabelSummaryRow のリスト) は取得後に埋める。
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "notes",
+        "is_done",
+        "task_type",
+        "due_date",
+        "priority",
+        "routine_settings",
+        "created_at",
+        "updated_at",
+        "family_id",
+        "parent_task_id",
+        "assignee",
+        "labels",
+    )
+
+    # DBの列に対応する属性 (assignee / labels 以外)
+    COLUMN_NAMES = __slots__[:-2]
+
+    def __init__(self, *values: Any) -> None:
+        super().__init__(*values)
+        self.assignee: Optional[UserSummaryRow] = None
+        self.labels: List[LabelSummaryRow] = []
@@ -0,0 +1,163 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestQueryStats:
+    """1リクエスト内で発行されたクエリの件数・合計時間 (ミドルウェアが生成する)"""
+
+    route: str  # 例: "GET /api/v1/families/1"
+    count: int = 0
+    total_ms: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def record(self, statement_fingerprint: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.fingerprints[statement_fingerprint] += 1
+
+    def repeated_queries(self, threshold: int) -> List[tuple[str, int]]:
+        """同じ形のクエリが threshold 回以上発行されたもの (N+1 の疑い) を返す"""
+        return [
+            (statement, count)
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+
+# 現在処理中のリクエストのクエリ統計。ミドルウェアが設定する (リクエスト外では None)
+current_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+# --- SQLのフィンガープリント化 (リテラル・パラメータを ? に置き換えて同じ形のSQLをまとめる) ---
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# トランザクション制御文 (SAVEPOINT など)。クエリとしては数えない
+# (asyncpg の BEGIN / COMMIT はカーソルを通らず、元から計測対象外のため挙動をそろえる)
+_TRANSACTION_CONTROL = re.compile(
+    r"^\s*(?:BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """SQL文を正規化したフィンガープリントを返す (同じ形のクエリは同じ文字列になる)"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    # IN (?, ?, ...) や 複数行 VALUES は件数によらず同じ形にまとめる
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_LIST.sub("), (...)", normalized)
+    return normalized
+
+
+class QueryStats:
+    """クエリのフィンガープリントごとに実行回数・所要時間・行数を集計する"""
+
+    def __init__(self, *, max_fingerprints: int = 1000) -> None:
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, statement_fingerprint: str, duration_ms: float, rows: int) -> None:
+        with self._lock:
+            entry = self._stats.get(statement_fingerprint)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # 集計対象が多すぎる場合は新しいフィンガープリントを記録しない
+                    return
+                entry = self._stats[statement_fingerprint] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["rows"] += max(rows, 0)
+
+    def top(self, n: int = 20, *, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """遅いクエリ上位N件を返す (デフォルトは合計所要時間の降順)"""
+        with self._lock:
+            items = [
+                {"fingerprint": key, **value} for key, value in self._stats.items()
+            ]
+        for item in items:
+            item["avg_ms"] = item["total_ms"] / item["count"]
+        items.sort(key=lambda item: item[order_by], reverse=True)
+        return items[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# アプリ全体で共有するクエリ統計
+query_stats = QueryStats()
+
+
+def instrument_engine(
+    engine: AsyncEngine,
+    *,
+    slow_query_threshold_ms: float,
+    stats: QueryStats = query_stats,
+) -> None:
+    """
+    エンジンにSQLAlchemyのイベントリスナーを登録し、クエリごとの所要時間を計測する。
+    しきい値を超えたクエリは、発行元のルートとともに WARNING ログに出力する。
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        started_at = conn.info["query_started_at"].pop()
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        if _TRANSACTION_CONTROL.match(statement):
+            return
+        rows = cursor.rowcount if cursor.rowcount is not None else -1
+        statement_fingerprint = fingerprint(statement)
+        stats.record(statement_fingerprint, duration_ms, rows)
+        request_stats = current_request_stats.get()
+        if request_stats is not None:
+            request_stats.record(statement_fingerprint, duration_ms)
+        if duration_ms >= slow_query_threshold_ms:
+            route = request_stats.route if request_stats is not None else None
+            logger.warning(
+                f"Slow query ({duration_ms:.1f} ms, rows={rows}, "
+                f"route={route}): {statement_fingerprint}"
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # エラーになったクエリの開始時刻を捨てる (after_cursor_execute は呼ばれない)
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
@@ -0,0 +1,188 @@
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_ENGINE_NAME = "primary"
+
+# クライアントが最後に書き込んだ時刻 (UNIX 時刻) を持ち回る Cookie の名前
+READ_YOUR_WRITES_COOKIE = "last_write_at"
+
+
+@dataclass
+class ReadYourWritesState:
+    """
+    1リクエストの read-your-writes の状態 (ミドルウェアが生成する)。
+    書き込み直後の読み取りが別のワーカーに届いても、Cookie の時刻でプライマリに固定できる。
+    """
+
+    # リクエストの Cookie にあった、このクライアントの最後の書き込み時刻
+    client_last_write_at: Optional[float] = None
+    # このリクエストでコミットした時刻 (ミドルウェアが Cookie として返す)
+    committed_at: Optional[float] = None
+
+
+# 現在処理中のリクエストの read-your-writes の状態 (リクエスト外では None)
+current_read_your_writes: ContextVar[Optional[ReadYourWritesState]] = ContextVar(
+    "current_read_your_writes", default=None
+)
+
+
+# 書き込みを行うSQL文 (SQLite の読み取り専用エンジンで拒否する)
+_WRITE_STATEMENT = re.compile(
+    r"^\s*(?:INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE
+)
+
+
+def _reject_sqlite_writes(conn, cursor, statement, parameters, context, executemany):
+    # AUTOCOMMIT では書き込みがそのまま確定してしまうため、実行前に拒否する
+    # (PostgreSQL の READ ONLY トランザクションと同様にDBのエラーとして扱われる)
+    if _WRITE_STATEMENT.match(statement):
+        raise OperationalError(
+            statement,
+            parameters,
+            conn.dialect.dbapi.OperationalError(
+                "attempt to write through a read-only session"
+            ),
+        )
+
+
+def _read_only(engine: AsyncEngine) -> AsyncEngine:
+    """
+    接続プールを共有したまま、読み取り専用トランザクションで動くエンジンを返す。
+    PostgreSQL: BEGIN READ ONLY / SQLite: AUTOCOMMIT (BEGIN/COMMIT を発行しない) で、
+    書き込みのSQL文は実行前にエラーにする
+    """
+    if engine.dialect.name == "sqlite":
+        read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+        # execution_options で作ったエンジンのイベントは元のエンジンには影響しない
+        event.listen(
+            read_engine.sync_engine, "before_cursor_execute", _reject_sqlite_writes
+        )
+        return read_engine
+    return engine.execution_options(postgresql_readonly=True)
+
+
+class ReplicaRouter:
+    """
+    プライマリとリードレプリカへの振り分けを行うルーター。
+    - 書き込みは常にプライマリ
+    - 読み取りはレプリカへラウンドロビンで振り分ける
+    - 直近に書き込んだユーザーの読み取りは一定時間プライマリに固定する (read-your-writes)
+
+    書き込みの記録はプロセス内 (_recent_writers) と、クライアントに返す Cookie の
+    両方に残す。プロセス内の記録は同じワーカーにしか効かないため、複数ワーカーでは
+    Cookie の時刻 (ReadYourWritesMiddleware が current_read_your_writes に設定する) で判定する。
+    """
+
+    def __init__(
+        self,
+        *,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        read_your_writes_window: float = 5.0,
+        max_tracked_writers: int = 100_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.read_your_writes_window = read_your_writes_window
+        # Cookie の時刻と比べるため、ワーカー間で共通の UNIX 時刻を使う
+        self._clock = clock
+        # エンジン名 -> 読み取り専用エンジン (プールは元のエンジンと共有)
+        self._read_engines: Dict[str, AsyncEngine] = {
+            PRIMARY_ENGINE_NAME: _read_only(primary)
+        }
+        for index, replica in enumerate(self.replicas):
+            self._read_engines[f"replica-{index}"] = _read_only(replica)
+        self._replica_names = itertools.cycle(
+            [f"replica-{index}" for index in range(len(self.replicas))]
+        )
+        # user_id -> True (期限 = read_your_writes_window 秒)
+        self._recent_writers: TTLCache[bool] = TTLCache(
+            maxsize=max_tracked_writers, ttl=read_your_writes_window
+        )
+        self._lock = threading.Lock()
+        # エンジンごとの利用回数 (セッション単位)
+        self.usage: Counter = Counter()
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        """ユーザーが書き込みを行ったことを記録する (以後しばらく読み取りもプライマリへ)"""
+        with self._lock:
+            self.usage[f"{PRIMARY_ENGINE_NAME}:write"] += 1
+        if not self.replicas:
+            return
+        if user_id is not None:
+            self._recent_writers.set(user_id, True)
+        state = current_read_your_writes.get()
+        if state is not None:
+            state.committed_at = self._clock()
+
+    def has_recent_write(self, user_id: Optional[int]) -> bool:
+        """ユーザー (またはリクエスト元のクライアント) が期間内に書き込みを行ったかどうか"""
+        state = current_read_your_writes.get()
+        if state is not None and state.client_last_write_at is not None:
+            # 未来の時刻 (改ざん・時計のずれ) は期間を延ばさないよう無視する
+            elapsed = self._clock() - state.client_last_write_at
+            if 0 <= elapsed < self.read_your_writes_window:
+                return True
+        if user_id is None:
+            return False
+        return bool(self._recent_writers.get(user_id, False))
+
+    def read_engine_name_for(self, user_id: Optional[int]) -> str:
+        """読み取りに使うエンジン名を決定する"""
+        if not self.replicas or self.has_recent_write(user_id):
+            return PRIMARY_ENGINE_NAME
+        with self._lock:
+            return next(self._replica_names)
+
+    def read_engine_for(self, user_id: Optional[int]) -> AsyncEngine:
+        """読み取りに使う (読み取り専用設定済みの) エンジンを返し、利用回数を記録する"""
+        name = self.read_engine_name_for(user_id)
+        with self._lock:
+            self.usage[f"{name}:read"] += 1
+        logger.debug(f"Routing read for user {user_id} to {name}")
+        return self._read_engines[name]
+
+    @property
+    def primary_read_engine(self) -> AsyncEngine:
+        """プライマリの読み取り専用エンジン (利用回数は記録しない)"""
+        return self._read_engines[PRIMARY_ENGINE_NAME]
+
+    @property
+    def engines(self) -> Dict[str, AsyncEngine]:
+        """エンジン名 -> 元のエンジン (メトリクス取得・破棄用)"""
+        named = {PRIMARY_ENGINE_NAME: self.primary}
+        for index, replica in enumerate(self.replicas):
+            named[f"replica-{index}"] = replica
+        return named
+
+    def stats(self) -> Dict[str, Any]:
+        """エンジンごとの利用回数などを返す"""
+        with self._lock:
+            usage = dict(self.usage)
+        return {
+            "replicas": len(self.replicas),
+            "read_your_writes_window_seconds": self.read_your_writes_window,
+            "recent_writers": len(self._recent_writers),
+            "usage": usage,
+        }
+
+    async def dispose(self) -> None:
+        """全エンジンの接続プールを破棄する"""
+        for engine in self.engines.values():
+            await engine.dispose()
@@ -1,8 +1,17 @@
 import logging
-from typing import AsyncGenerator
+from functools import partial
+from typing import AsyncGenerator, Callable, Optional, Sequence
 
 from app.core.config import settings
+from app.core.security import get_current_active_user
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.query_stats import instrument_engine
+from app.db.routing import ReplicaRouter
+from app.models.user import User
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     create_async_engine,  # SQLAlchemy を直接使う場合も同様
 )
 from sqlalchemy.orm import sessionmaker
@@ -12,30 +21,124 @@ from sqlmodel.ext.asyncio.session import (
 
 logger = logging.getLogger(__name__)
 
-# 非同期データベースエンジンを作成
-# echo=True にすると実行されるSQLがログに出力される (開発時に便利)
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
 
-# 非同期セッションを作成するためのファクトリ
-# expire_on_commit=False にしないと、コミット後にオブジェクトにアクセスできなくなる場合がある
-AsyncSessionFactory = sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
-)
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """Settings の接続プール設定を反映した非同期エンジンを作成する"""
+    engine_kwargs = {"echo": settings.DB_ECHO, "future": True}
+    # SQLite (主にローカル検証用) はプールの種類が異なるため、プール設定は適用しない
+    if make_url(url).get_backend_name() != "sqlite":
+        engine_kwargs.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    new_engine = create_async_engine(url, **engine_kwargs)
+    # クエリごとの所要時間を計測し、スロークエリをログに出力する
+    instrument_engine(
+        new_engine, slow_query_threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS
+    )
+    return new_engine
+
+
+class Database:
+    """
+    エンジン・セッションファクトリ・読み取りの振り分けルーターをまとめたもの。
+    モジュールのインポート時には作らず、起動時 (lifespan) か最初の利用時に作成する。
+    (インポートしただけではエンジンの作成・DBドライバーの読み込みを行わない)
+    """
+
+    def __init__(self, url: str, *, replica_urls: Sequence[str] = ()) -> None:
+        # 非同期データベースエンジンを作成 (SQLのログ出力は settings.DB_ECHO で切り替える)
+        self.engine = create_engine_from_settings(url)
+        # リードレプリカ (任意)。未設定なら読み取りもプライマリ (engine) で行う
+        self.replica_engines = [
+            create_engine_from_settings(replica_url) for replica_url in replica_urls
+        ]
+        # 読み取りの振り分け先を決めるルーター (書き込み直後のユーザーはプライマリに固定)
+        self.engine_router = ReplicaRouter(
+            primary=self.engine,
+            replicas=self.replica_engines,
+            read_your_writes_window=settings.READ_YOUR_WRITES_WINDOW_SECONDS,
+        )
+        # 非同期セッションを作成するためのファクトリ
+        # expire_on_commit=False にしないと、コミット後にオブジェクトにアクセスできなくなる場合がある
+        self.session_factory = sessionmaker(
+            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        # 読み取り専用セッションのファクトリ。autoflush=False で不要なフラッシュを防ぐ
+        # bind はリクエストごとに engine_router が選んだ読み取り専用エンジンで上書きする
+        self.read_session_factory = sessionmaker(
+            bind=self.engine_router.primary_read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    async def dispose(self) -> None:
+        """全エンジンの接続プールを破棄する"""
+        await self.engine_router.dispose()
+
+
+# プロセスで共有する Database (init_database / get_database で作成する)
+_database: Optional[Database] = None
+
+
+def init_database(url: Optional[str] = None) -> Database:
+    """
+    Database を作成して返す (作成済みならそれを返す)。
+    url を省略すると settings の接続先 (とリードレプリカ) を使う。
+    """
+    global _database
+    if _database is None:
+        if url is None:
+            _database = Database(
+                settings.DATABASE_URL, replica_urls=settings.DATABASE_REPLICA_URLS
+            )
+        else:
+            _database = Database(url)
+        logger.info("Database engines created.")
+    return _database
+
+
+def get_database() -> Database:
+    """
+    作成済みの Database を返す。lifespan を通らない場合 (スクリプトなど) は、
+    最初の呼び出し時に settings の接続先で作成する。
+    """
+    if _database is None:
+        return init_database()
+    return _database
+
+
+async def dispose_database() -> None:
+    """Database の接続プールを破棄する (次の get_database で作り直される)"""
+    global _database
+    if _database is not None:
+        database, _database = _database, None
+        await database.dispose()
 
 
 # FastAPIの依存性注入(Depends)で使うための非同期セッション取得関数
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(
+    current_user: User = Depends(get_current_active_user),
+) -> AsyncGenerator[AsyncSession, None]:
     """
     DBセッションを依存関係として提供する非同期ジェネレータ。
     リクエスト処理完了時に自動でコミットまたはロールバックする。
+    コミット後は read-your-writes のため、ユーザーの読み取りを一定時間プライマリに固定する。
     """
-    print("DEBUG [Session]: Getting DB session")  # デバッグ用
-    async with AsyncSessionFactory() as session:
+    logger.debug("Getting DB session")
+    database = get_database()
+    async with database.session_factory() as session:
         try:
             yield session  # ここでルーターやサービスにセッションが渡される
             # yieldから戻ってきた後、例外が発生していなければコミット
             await session.commit()
-            print("DEBUG [Session]: Transaction committed.")  # デバッグ用
+            logger.debug("Transaction committed.")
+            database.engine_router.mark_write(current_user.id)
         except Exception as e:
             # yieldの後、またはyield中に例外が発生した場合
             logger.error(
@@ -44,6 +147,41 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()  # ロールバック実行
             raise e  # エラーを再送出してFastAPIに処理させる
         # finally:
-        # 'async with AsyncSessionFactory() as session:' を使っているので、
+        # 'async with database.session_factory() as session:' を使っているので、
         # finally ブロックでの明示的な session.close() は通常不要
         # print("DEBUG [Session]: Session closed.")
+
+
+# ストリーミングレスポンス用の読み取り専用セッションファクトリ取得関数
+def get_read_session_factory(
+    current_user: User = Depends(get_current_active_user),
+) -> Callable[[], AsyncSession]:
+    """
+    読み取り専用セッションを作るファクトリを依存関係として提供する。
+    依存関係 (yield) のセッションはレスポンスの送信前に閉じられるため、
+    StreamingResponse の本文を生成する間はこのファクトリで自分でセッションを開く。
+    振り分け先のエンジンは get_read_db と同じくリクエスト時点で決める。
+    """
+    database = get_database()
+    read_engine = database.engine_router.read_engine_for(current_user.id)
+    return partial(database.read_session_factory, bind=read_engine)
+
+
+# GETエンドポイント用の読み取り専用セッション取得関数
+async def get_read_db(
+    current_user: User = Depends(get_current_active_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    読み取り専用のDBセッションを依存関係として提供する非同期ジェネレータ。
+    フラッシュ・コミットは行わず、ハンドラ終了時にすぐ接続をプールへ返す。
+    (コミットの往復が不要になるため、参照系エンドポイントではこちらを使う)
+    レプリカが設定されていればレプリカへ振り分ける (直近に書き込んだユーザーを除く)。
+    """
+    database = get_database()
+    read_engine = database.engine_router.read_engine_for(current_user.id)
+    async with database.read_session_factory(bind=read_engine) as session:
+        try:
+            yield session
+        finally:
+            # コミットはせず、トランザクションを破棄して接続を返却する
+            await session.close()
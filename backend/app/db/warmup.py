@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.crud import crud_family, crud_label, crud_task
+from app.db.session import Database
+
+logger = logging.getLogger(__name__)
+
+# --- 起動時のウォームアップ ---
+# 最初のリクエストが接続の確立・SQLのコンパイル・プリペアドステートメントの作成を
+# 待たないよう、ワーカーの起動時 (lifespan) にプールの接続を開いてよく使うクエリを実行する。
+# SQLのコンパイル結果はエンジンごと、プリペアドステートメント (asyncpg) は接続ごとに
+# キャッシュされるため、開いた接続それぞれで実行する。
+
+# 存在しないID。ウォームアップのクエリは結果が空になる
+WARMUP_ID = 0
+
+# 参照の多いエンドポイントが発行するクエリ (リクエストと同じ crud 関数で同じ形のSQLにする)
+WARMUP_QUERIES: List[Callable[[AsyncSession], Awaitable[Any]]] = [
+    lambda db: crud_family.get_family_with_member_role(
+        db, family_id=WARMUP_ID, user_id=WARMUP_ID
+    ),
+    lambda db: crud_family.get_family_cache_version(db, family_id=WARMUP_ID),
+    lambda db: crud_label.get_label_rows_by_family(db, family_id=WARMUP_ID),
+    lambda db: crud_task.get_task_rows_by_family(db, family_id=WARMUP_ID),
+]
+
+
+async def _warm_up_connection(connection: AsyncConnection) -> None:
+    async with AsyncSession(bind=connection) as session:
+        for query in WARMUP_QUERIES:
+            await query(session)
+
+
+async def _warm_up_engine(engine: AsyncEngine, connections: int) -> int:
+    # SQLite (主にローカル検証用) はプール設定を適用していないため1本だけ温める
+    if engine.dialect.name == "sqlite":
+        connections = 1
+    # 同時に開いておかないと、プールは同じ1本の接続を使い回してしまう
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if isinstance(conn, AsyncConnection)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(*(_warm_up_connection(conn) for conn in opened))
+        return len(opened)
+    finally:
+        # close() で接続はプールに戻る (pool_size の範囲で開いたまま保持される)
+        for conn in opened:
+            await conn.close()
+
+
+async def warm_up_database(database: Database, *, connections: int) -> int:
+    """
+    プライマリとリードレプリカのそれぞれで connections 本 (DB_POOL_SIZE が上限) の接続を開き、
+    各接続で WARMUP_QUERIES を実行してからプールに戻す。温めた接続数の合計を返す。
+    失敗した場合は WARNING ログを出して 0 を返す (起動は続け、接続は最初の利用時に作られる)。
+    """
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return 0
+    started = time.perf_counter()
+    warmed = 0
+    try:
+        for engine in database.engine_router.engines.values():
+            warmed += await _warm_up_engine(engine, connections)
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {e}", exc_info=True)
+        return 0
+    logger.info(
+        f"Warmed up {warmed} database connection(s) in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms"
+    )
+    return warmed
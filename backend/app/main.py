@@ -1,9 +1,40 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
+from app.core.config import settings
+from app.core.middleware import QueryContextMiddleware, ReadYourWritesMiddleware
+from app.core.openapi import load_prebuilt_openapi
+from app.db.session import dispose_database, init_database
+from app.db.warmup import warm_up_database
 from app.routers.api_v1.api import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    ワーカーの起動時にDBのエンジンを作成して接続プールを温め、
+    (設定があれば) 事前生成した OpenAPI スキーマを読み込む。終了時に接続を破棄する。
+    """
+    database = init_database()
+    await warm_up_database(database, connections=settings.DB_WARMUP_CONNECTIONS)
+    if settings.OPENAPI_SCHEMA_PATH:
+        load_prebuilt_openapi(app, settings.OPENAPI_SCHEMA_PATH)
+    yield
+    await dispose_database()
+
+
 # FastAPIアプリケーションインスタンスを作成
-app = FastAPI(title="FamilyHubApp API", version="0.1.0")
+app = FastAPI(title="FamilyHubApp API", version="0.1.0", lifespan=lifespan)
+# リクエストごとのクエリ件数・DB時間を Server-Timing ヘッダーに出力する
+app.add_middleware(
+    QueryContextMiddleware, n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD
+)
+# 書き込み後の読み取りを、どのワーカーでもプライマリに固定するための Cookie を扱う
+app.add_middleware(
+    ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_WINDOW_SECONDS
+)
 app.include_router(api_router, prefix="/api/v1")
 
 
@@ -27,6 +27,11 @@ class Family(SQLModel, table=True):
         nullable=False,
         sa_column_kwargs={"onupdate": datetime.datetime.now},
     )
+    # 家族のデータ (ラベル・タスク・メンバーシップ) を書き込むたびに増えるバージョン番号
+    # (レスポンスキャッシュのキーに使う。crud 層が書き込みと同じトランザクションで上げる)
+    cache_version: int = Field(
+        default=0, nullable=False, sa_column_kwargs={"server_default": "0"}
+    )
 
     # --- リレーションシップ定義 (この家族に属する他のモデル) ---
     # "memberships" という名前で FamilyMembership モデルのリストにアクセスできるようにする
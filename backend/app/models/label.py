@@ -1,7 +1,7 @@
 import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Index, Relationship, SQLModel
 
 from .task_label import TaskLabel
 
@@ -49,4 +49,8 @@ class Label(SQLModel, table=True):
     tasks: List["Task"] = Relationship(back_populates="labels", link_model=TaskLabel)
 
     # __tablename__ = "labels" # SQLModelが自動推測
+    __table_args__ = (
+        # ラベル一覧のキーセットページネーション (family_id で絞り込み、(name, id) 順) 用
+        Index("ix_label_family_id_name_id", "family_id", "name", "id"),
+    )
     # __table_args__ = (UniqueConstraint("family_id", "name", name="uq_family_label_name"),) # 一意制約 (Alembicが自動生成するはず)
@@ -2,9 +2,12 @@ import datetime
 import enum
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlmodel import JSON, TEXT, Column, Field, Relationship, SQLModel
+from sqlalchemy import DDL, event
+from sqlmodel import JSON, TEXT, Column, Field, Index, Relationship, SQLModel, text
 from sqlmodel import Enum as SQLModelEnum
 
+from app.core.text_search import build_search_tokens
+
 from .task_label import TaskLabel
 
 # --- Type Hinting ---
@@ -51,6 +54,8 @@ class Task(SQLModel, table=True):
     updated_by_id: Optional[int] = Field(
         default=None, foreign_key="user.id", nullable=True
     )
+    # 全文検索用: title と notes の文字バイグラムを空白区切りで保持 (保存時に自動更新)
+    search_tokens: Optional[str] = Field(default=None, sa_column=Column(TEXT))
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.now, nullable=False
     )
@@ -88,3 +93,85 @@ class Task(SQLModel, table=True):
     labels: List["Label"] = Relationship(back_populates="tasks", link_model=TaskLabel)
 
     # __tablename__ = "tasks" # SQLModelが自動推測
+    __table_args__ = (
+        # 家族のタスク一覧 (期日順) 用
+        Index("ix_task_family_id_due_date", "family_id", "due_date", "id"),
+        # 家族のタスク一覧 (完了状態で絞り込み、期日順) 用
+        Index(
+            "ix_task_family_id_is_done_due_date",
+            "family_id",
+            "is_done",
+            "due_date",
+            "id",
+        ),
+        # 担当者ごとのタスク一覧 (完了状態で絞り込み、期日順) 用
+        Index(
+            "ix_task_assignee_id_is_done_due_date", "assignee_id", "is_done", "due_date"
+        ),
+        # アジェンダ (次回発生日が期間内の定常タスク) 用
+        Index(
+            "ix_task_family_id_next_occurrence_date",
+            "family_id",
+            "next_occurrence_date",
+        ),
+        # 家族のタスク一覧 (作成日時順) 用
+        Index("ix_task_family_id_created_at", "family_id", "created_at", "id"),
+        # 未完了タスクを優先度順に並べる一覧用の部分インデックス (完了済みタスクは含めない)
+        # (Task.is_done == False はバインド変数でなくリテラルで出力されるので、部分インデックスが使える)
+        Index(
+            "ix_task_open_family_id_priority",
+            "family_id",
+            "priority",
+            "due_date",
+            postgresql_where=text("is_done = false"),
+            sqlite_where=text("is_done = 0"),
+        ),
+    )
+
+
+# --- 全文検索 ---
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _update_search_tokens(mapper, connection, target: Task) -> None:
+    # title / notes から検索用トークンを作り直す (ORM経由の INSERT / UPDATE すべてで実行される)
+    target.search_tokens = build_search_tokens(target.title, target.notes) or None
+
+
+# 検索インデックスはDBごとに方式が異なるため、metadata.create_all 時に DDL で作成する
+# (本番のスキーマは Alembic のマイグレーションで同じものを作成する)
+# PostgreSQL: search_tokens の tsvector に対する GIN インデックス
+TASK_SEARCH_TSVECTOR = "to_tsvector('simple'::regconfig, COALESCE(search_tokens, ''))"
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX IF NOT EXISTS ix_task_search_tokens_gin "
+        f"ON task USING gin ({TASK_SEARCH_TSVECTOR})"
+    ).execute_if(dialect="postgresql"),
+)
+# SQLite: search_tokens を外部コンテンツとする FTS5 仮想テーブルと、同期用トリガー
+TASK_FTS_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts "
+    "USING fts5(search_tokens, content='task', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, search_tokens) VALUES (new.id, new.search_tokens); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, search_tokens) "
+    "VALUES ('delete', old.id, old.search_tokens); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF search_tokens ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, search_tokens) "
+    "VALUES ('delete', old.id, old.search_tokens); "
+    "INSERT INTO task_fts(rowid, search_tokens) VALUES (new.id, new.search_tokens); "
+    "END",
+]
+for _statement in TASK_FTS_SQLITE_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS task_fts").execute_if(dialect="sqlite"),
+)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from .endpoints import families, labels, tasks
+from app.core.security import require_internal_metrics_access
+
+from .endpoints import agenda, families, labels, metrics, tasks
 
 # API v1 のためのメインルーター
 api_router = APIRouter()
@@ -14,6 +16,17 @@ api_router.include_router(
     prefix="/families/{family_id}/tasks",
     tags=["Tasks"],
 )
+api_router.include_router(
+    agenda.router, prefix="/families/{family_id}/agenda", tags=["Agenda"]
+)
+
+# 運用向けの内部メトリクス (設定で有効にし、トークンで認証した場合のみ応答する)
+api_router.include_router(
+    metrics.router,
+    prefix="/internal/metrics",
+    tags=["Internal"],
+    dependencies=[Depends(require_internal_metrics_access)],
+)
 
 # --- 今後、他のリソースのルーターもここに追加していく ---
 # from .endpoints import users
@@ -0,0 +1,52 @@
+import datetime
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import CurrentFamilyReadOnly
+from app.db.session import get_read_db
+from app.schemas.agenda import AgendaDay
+from app.schemas.response import APIResponse
+from app.schemas.task import TaskRead
+from app.services import agenda_service
+
+# アジェンダ用のルーターを作成
+router = APIRouter()
+
+
+@router.get(
+    "/",  # /families/{family_id}/agenda/ への GET
+    response_model=APIResponse[List[AgendaDay]],
+    summary="Get the agenda of a family",
+    response_description="Task occurrences per day within the window",
+)
+async def read_agenda(
+    *,
+    db: AsyncSession = Depends(get_read_db),
+    family_ctx: CurrentFamilyReadOnly,
+    from_date: datetime.date = Query(
+        ..., alias="from", description="開始日 (この日を含む)"
+    ),
+    to_date: datetime.date = Query(
+        ..., alias="to", description="終了日 (この日を含む)"
+    ),
+) -> APIResponse[List[AgendaDay]]:
+    """
+    指定期間の日ごとのタスクを返します (タスクのない日は含みません)。
+    単発タスクは期日の日に、定常タスクは繰り返し設定から展開した各発生日に含まれます。
+    """
+    days = await agenda_service.get_agenda_for_family(
+        db=db, family_ctx=family_ctx, start=from_date, end=to_date
+    )
+    # 同じタスクが複数の日に現れるので、TaskRead への変換はタスクごとに1回だけ行う
+    task_reads: Dict[int, TaskRead] = {}
+    agenda = []
+    for day, tasks in days:
+        for task in tasks:
+            if task.id not in task_reads:
+                task_reads[task.id] = TaskRead.model_validate(task)
+        agenda.append(
+            AgendaDay(date=day, tasks=[task_reads[task.id] for task in tasks])
+        )
+    return APIResponse[List[AgendaDay]](data=agenda)
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser  # ★ 型ヒント付きの認証依存関係を使用
-from app.db.session import get_db
+from app.api.deps import (  # ★ 型ヒント付きの認証依存関係を使用
+    CurrentFamilyReadOnly,
+    CurrentUser,
+)
+from app.core.etag import etag_matches, not_modified
+from app.db.session import get_db, get_read_db
 from app.schemas.family import FamilyCreate, FamilyRead
 from app.schemas.response import APIResponse
 from app.services import family_service
@@ -40,18 +46,25 @@ async def create_new_family(
     response_model=APIResponse[FamilyRead],
     summary="Get family by ID",
     response_description="Details of the family",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
 )
 async def read_family(
     *,
-    db: AsyncSession = Depends(get_db),
-    family_id: int,
-    current_user: CurrentUser,  # ★ 認証されたユーザーを取得
-) -> APIResponse[FamilyRead]:
+    db: AsyncSession = Depends(get_read_db),  # ★ 参照のみなので読み取り専用セッション
+    family_ctx: CurrentFamilyReadOnly,  # ★ 認可済みの家族コンテキスト (パスから解決)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+) -> APIResponse[FamilyRead] | Response:
     """
     指定されたIDの家族情報を取得します (ユーザーがメンバーの場合のみ)。
+    If-None-Match が ETag と一致すれば 304 (本文なし) を返します。
     """
+    etag = await family_service.get_family_etag(db=db, family_ctx=family_ctx)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     db_family = await family_service.get_family_for_user_or_404(
-        db=db, family_id=family_id, user=current_user
+        db=db, family_ctx=family_ctx
     )
     return APIResponse[FamilyRead](data=db_family)
 
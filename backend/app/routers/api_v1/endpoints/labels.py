@@ -1,14 +1,20 @@
-from typing import List, Sequence
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Path, Query, status
+from fastapi import APIRouter, Depends, Header, Path, Query, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser
-from app.db.session import get_db
-from app.models.label import Label
+from app.api.deps import CurrentFamily, CurrentFamilyReadOnly
+from app.core.etag import etag_matches, not_modified
+from app.core.serialization import (
+    TrustedJSONResponse,
+    dump_envelope,
+    trusted_label_read,
+)
+from app.db.session import get_db, get_read_db
 from app.schemas.label import LabelCreate, LabelRead, LabelUpdate
-from app.schemas.response import APIResponse
+from app.schemas.response import APIResponse, PaginatedAPIResponse
 from app.services import label_service
+from app.services.common import get_cached_family_response
 
 # Label用のルーターを作成
 router = APIRouter()
@@ -25,19 +31,17 @@ router = APIRouter()
 )
 async def create_new_label(
     *,
-    # パスパラメータから family_id を受け取る
-    family_id: int = Path(..., title="The ID of the family to add the label to"),
     label_in: LabelCreate,  # リクエストボディ
     db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,  # 認証済みユーザー
+    family_ctx: CurrentFamily,  # パスの family_id から解決した認可済みコンテキスト
 ) -> APIResponse[LabelRead]:
     """
     指定された家族に新しいラベルを作成します。
     ユーザーはその家族のメンバーである必要があります。
     """
-    # Service層を呼び出し (認可チェック・重複チェックはService内で行われる)
+    # Service層を呼び出し (認可は依存関係で解決済み、重複チェックはService内で行われる)
     new_label = await label_service.create_label_for_family(
-        db=db, label_in=label_in, family_id=family_id, user=current_user
+        db=db, label_in=label_in, family_ctx=family_ctx
     )
     return APIResponse[LabelRead](
         data=new_label, message=f"Label '{new_label.name}' created successfully."
@@ -46,32 +50,55 @@ async def create_new_label(
 
 @router.get(
     "/",  # /families/{family_id}/labels/ への GET
-    response_model=APIResponse[List[LabelRead]],  # ラベルのリストを返す
+    # ラベルのリストと次ページのカーソルを返す
+    response_model=PaginatedAPIResponse[LabelRead],
     summary="List labels for a family",
-    response_description="List of labels belonging to the family",
+    response_description="A page of labels belonging to the family, ordered by name",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
 )
 async def read_labels(
     *,
-    family_id: int = Path(..., title="The ID of the family to list labels for"),
-    db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,
-    skip: int = Query(0, ge=0, title="Skip", description="スキップするアイテム数"),
+    db: AsyncSession = Depends(get_read_db),
+    family_ctx: CurrentFamilyReadOnly,
+    cursor: Optional[str] = Query(
+        None, description="前のレスポンスの next_cursor (先頭ページでは省略)"
+    ),
     limit: int = Query(
         100, ge=1, le=500, title="Limit", description="取得する最大アイテム数 (最大500)"
     ),  # 例: 1件以上、500件以下に制限
-) -> APIResponse[List[LabelRead]]:
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
-    指定された家族に属するラベルのリストを取得します。
+    指定された家族に属するラベルのリストを名前順に取得します。
+    ページングはカーソル方式です (next_cursor が None なら最後のページ)。
+    If-None-Match が ETag と一致すれば 304 (本文なし) を返します。
+    レスポンスは家族のバージョンごとにキャッシュします (X-Cache ヘッダーにヒット状況を出力)。
     ユーザーはその家族のメンバーである必要があります。
     """
-    # Service層を呼び出し (認可チェックはService内)
-    labels: Sequence[Label] = await label_service.get_labels_for_family(
-        db=db, family_id=family_id, user=current_user, skip=skip, limit=limit
+    etag = await label_service.get_labels_etag(
+        db=db, family_ctx=family_ctx, cursor=cursor, limit=limit
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    async def load_page(session: AsyncSession) -> bytes:
+        # Service層を呼び出し (認可は依存関係で解決済み)
+        labels, next_cursor = await label_service.get_labels_for_family(
+            db=session, family_ctx=family_ctx, cursor=cursor, limit=limit
+        )
+        # DBから読んだラベルは検証せずにJSON化する (キャッシュにはバイト列を保存する)
+        return dump_envelope(
+            [trusted_label_read(label) for label in labels], next_cursor=next_cursor
+        )
+
+    body, cache_state = await get_cached_family_response(
+        db,
+        family_ctx=family_ctx,
+        route="labels:list",
+        query=(cursor, limit),
+        loader=load_page,
     )
-    # Sequence[Label] を List[LabelRead] に変換する必要があるか？
-    # SQLModelを継承している場合、そのまま返せる場合が多い
-    # Pydantic V2 + SQLModelでは data=list(labels) のようにリスト化が必要な場合も
-    return APIResponse[List[LabelRead]](data=list(labels))  # 安全のため list() で変換
+    return TrustedJSONResponse(body, headers={"ETag": etag, "X-Cache": cache_state})
 
 
 @router.get(
@@ -79,23 +106,32 @@ async def read_labels(
     response_model=APIResponse[LabelRead],
     summary="Get a specific label",
     response_description="Details of the specific label",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}},
 )
 async def read_label(
     *,
-    family_id: int = Path(..., title="The ID of the family"),
     label_id: int = Path(..., title="The ID of the label to retrieve"),
-    db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,
-) -> APIResponse[LabelRead]:
+    db: AsyncSession = Depends(get_read_db),
+    family_ctx: CurrentFamilyReadOnly,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
     指定された家族内の特定のラベルを取得します。
+    If-None-Match が ETag と一致すれば 304 (本文なし) を返します。
     ユーザーはその家族のメンバーである必要があります。
     """
-    # Service層を呼び出し (認可・存在チェックはService内)
+    etag = await label_service.get_label_etag(
+        db=db, label_id=label_id, family_ctx=family_ctx
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    # Service層を呼び出し (認可は依存関係で解決済み、存在チェックはService内)
     db_label = await label_service.get_label_for_family_user_or_404(
-        db=db, label_id=label_id, family_id=family_id, user=current_user
+        db=db, label_id=label_id, family_ctx=family_ctx
+    )
+    return TrustedJSONResponse(
+        dump_envelope(trusted_label_read(db_label)), headers={"ETag": etag}
     )
-    return APIResponse[LabelRead](data=db_label)
 
 
 @router.put(
@@ -106,23 +142,21 @@ async def read_label(
 )
 async def update_existing_label(
     *,
-    family_id: int = Path(..., title="The ID of the family"),
     label_id: int = Path(..., title="The ID of the label to update"),
     label_in: LabelUpdate,  # リクエストボディ
     db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,
+    family_ctx: CurrentFamily,
 ) -> APIResponse[LabelRead]:
     """
     指定されたラベルを更新します。
     ユーザーはその家族のメンバーである必要があります。
     """
-    # Service層を呼び出し (認可・存在・重複チェックはService内)
+    # Service層を呼び出し (認可は依存関係で解決済み、存在・重複チェックはService内)
     updated_label = await label_service.update_label_for_family_user(
         db=db,
         label_id=label_id,
         label_in=label_in,
-        family_id=family_id,
-        user=current_user,
+        family_ctx=family_ctx,
     )
     return APIResponse[LabelRead](
         data=updated_label, message="Label updated successfully."
@@ -138,18 +172,17 @@ async def update_existing_label(
 )
 async def delete_existing_label(
     *,
-    family_id: int = Path(..., title="The ID of the family"),
     label_id: int = Path(..., title="The ID of the label to delete"),
     db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,
+    family_ctx: CurrentFamily,
 ) -> APIResponse[None]:
     """
     指定されたラベルを削除します。
     ユーザーはその家族のメンバーである必要があります。
     """
-    # Service層を呼び出し (認可・存在チェックはService内)
+    # Service層を呼び出し (認可は依存関係で解決済み、存在チェックはService内)
     await label_service.delete_label_for_family_user(
-        db=db, label_id=label_id, family_id=family_id, user=current_user
+        db=db, label_id=label_id, family_ctx=family_ctx
     )
     # 成功時はデータなし、メッセージ付きのレスポンスを返す
     return APIResponse[None](success=True, message="Label deleted successfully.")
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Literal
+
+from fastapi import APIRouter, Query
+
+from app.core.cache import membership_cache, occurrence_cache, response_cache
+from app.db.pool import pool_stats
+from app.db.query_stats import query_stats
+from app.db.session import get_database
+
+# 運用向けの内部メトリクス用ルーター (OpenAPIスキーマには含めない)
+# アクセス制御は api.py で include する際の require_internal_metrics_access で行う
+router = APIRouter(include_in_schema=False)
+
+
+@router.get(
+    "/db",
+    summary="Database pool and routing metrics",
+)
+async def read_db_metrics() -> Dict[str, Any]:
+    """
+    接続プールの使用状況 (使用中の接続数・オーバーフロー・チェックアウト待ち時間・
+    タイムアウト回数)、レプリカ振り分け状況、認可キャッシュの統計を返します。
+    uvicorn のワーカー数に対して pool_size を調整する際の判断材料に使います。
+    """
+    engine_router = get_database().engine_router
+    return {
+        "pools": {
+            name: pool_stats(engine) for name, engine in engine_router.engines.items()
+        },
+        "routing": engine_router.stats(),
+        "membership_cache": membership_cache.stats(),
+        "occurrence_cache": occurrence_cache.stats(),
+        "response_cache": response_cache.stats(),
+    }
+
+
+@router.get(
+    "/queries",
+    summary="Slowest query fingerprints",
+)
+async def read_query_metrics(
+    limit: int = Query(20, ge=1, le=200, description="返す件数"),
+    order_by: Literal["total_ms", "max_ms", "avg_ms", "count"] = Query(
+        "total_ms", description="並び順の基準"
+    ),
+) -> List[Dict[str, Any]]:
+    """
+    クエリのフィンガープリント (リテラルを ? に置き換えたSQL) ごとの
+    実行回数・合計/平均/最大所要時間・行数を、遅い順に返します。
+    """
+    return query_stats.top(limit, order_by=order_by)
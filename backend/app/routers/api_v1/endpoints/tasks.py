@@ -1,61 +1,67 @@
 import logging
+from typing import Annotated, Any, Callable, List, Optional, Sequence
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser  # 認証済みユーザー取得用
-from app.db.session import get_db
+from app.api.deps import (  # 認可済みの家族コンテキスト取得用
+    CurrentFamily,
+    CurrentFamilyReadOnly,
+)
+from app.core.config import settings
+from app.core.serialization import (
+    TrustedJSONResponse,
+    dump_envelope,
+    iter_csv_records,
+    iter_ndjson_records,
+    trusted_task_read,
+)
+from app.db.session import get_db, get_read_db, get_read_session_factory
 from app.schemas.label import LabelSummary
-from app.schemas.response import APIResponse
+from app.schemas.response import APIResponse, PaginatedAPIResponse
 
 # --- 必要なスキーマ、依存関係などをインポート ---
-from app.schemas.task import RoutineSettings, TaskCreate, TaskRead
+from app.models.task import Task
+from app.schemas.task import (
+    RoutineSettings,
+    TaskCreate,
+    TaskExportFormat,
+    TaskImportResult,
+    TaskRead,
+    TaskSortKey,
+)
 from app.schemas.user import UserSummary
 from app.services import task_service
+from app.services.common import get_cached_family_response
 
 # --- Task用ルーターを作成 ---
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
-# --- エンドポイント定義 ---
 
+# 一括作成APIで1リクエストに含められるタスクの最大件数
+BULK_CREATE_MAX_TASKS = 1000
 
-@router.post(
-    "/",  # /api/v1/families/{family_id}/tasks/ へのPOST
-    response_model=APIResponse[TaskRead],
-    status_code=status.HTTP_201_CREATED,
-    summary="Create new task",
-    response_description="The created task",
-)
-async def create_new_task(
-    *,
-    family_id: int = Path(..., title="The ID of the family this task belongs to"),
-    task_in: TaskCreate,  # リクエストボディ
-    db: AsyncSession = Depends(get_db),
-    current_user: CurrentUser,
-):
-    """
-    指定された家族内に新しいタスクを作成します。
-    ユーザーはその家族のメンバーである必要があります。
-    """
-    logger.info(f"Router received request to create task in family {family_id}")
+# エクスポートの形式ごとの Content-Type
+EXPORT_MEDIA_TYPES = {
+    TaskExportFormat.NDJSON: "application/x-ndjson",
+    TaskExportFormat.CSV: "text/csv; charset=utf-8",
+}
 
-    # Service層を呼び出し、複数のオブジェクトを受け取る
-    db_task, assignee_obj, label_objs = await task_service.create_task_for_family(
-        db=db, task_in=task_in, family_id=family_id, user=current_user
-    )
-
-    # --- レスポンス用 TaskRead オブジェクトを手動で構築 ---
-    logger.info(f"Constructing TaskRead response for task ID {db_task.id}")
 
+def _build_task_read(
+    db_task: Task, assignee: Optional[Any], labels: Sequence[Any]
+) -> TaskRead:
+    """
+    Taskと担当者・ラベル (ORMオブジェクトまたはサマリー) からレスポンス用 TaskRead を構築する。
+    """
     # 担当者情報をサマリーに変換
-    assignee_summary = (
-        UserSummary.model_validate(assignee_obj) if assignee_obj else None
-    )
+    assignee_summary = UserSummary.model_validate(assignee) if assignee else None
 
     # ラベル情報をサマリーのリストに変換
-    label_summaries = [LabelSummary.model_validate(lbl) for lbl in label_objs]
-    label_ids = [lbl.id for lbl in label_objs if lbl.id is not None]  # IDのリストも作成
+    label_summaries = [LabelSummary.model_validate(lbl) for lbl in labels]
+    label_ids = [lbl.id for lbl in label_summaries]  # IDのリストも作成
 
     # routine_settings をスキーマオブジェクトに変換 (存在すれば)
     routine_settings_obj = None
@@ -73,7 +79,7 @@ async def create_new_task(
             routine_settings_obj = None
 
     # TaskReadオブジェクトを作成
-    task_read_data = TaskRead(
+    return TaskRead(
         id=db_task.id,
         title=db_task.title,
         notes=db_task.notes,
@@ -91,7 +97,239 @@ async def create_new_task(
         parent_task_id=db_task.parent_task_id,
     )
 
+
+# --- エンドポイント定義 ---
+
+
+@router.get(
+    "/",  # /api/v1/families/{family_id}/tasks/ へのGET
+    response_model=PaginatedAPIResponse[TaskRead],
+    summary="List tasks for a family",
+    response_description="A page of tasks and the cursor for the next page",
+)
+async def read_tasks(
+    *,
+    db: AsyncSession = Depends(get_read_db),
+    family_ctx: CurrentFamilyReadOnly,
+    sort: TaskSortKey = Query(
+        TaskSortKey.DUE_DATE,
+        description="並び順 (due_date: 期日の昇順 / created_at: 新しい順)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="前のレスポンスの next_cursor (先頭ページでは省略)"
+    ),
+    limit: int = Query(
+        50, ge=1, le=200, description="取得する最大アイテム数 (最大200)"
+    ),
+    is_done: Optional[bool] = Query(None, description="完了状態で絞り込む"),
+    assignee_id: Optional[int] = Query(None, description="担当者で絞り込む"),
+) -> Response:
+    """
+    指定された家族に属するタスクの一覧を、ラベル・担当者付きで取得します。
+    ページングはカーソル方式です (next_cursor が None なら最後のページ)。
+    レスポンスは家族のバージョンごとにキャッシュします (X-Cache ヘッダーにヒット状況を出力)。
+    """
+
+    async def load_page(session: AsyncSession) -> bytes:
+        tasks, next_cursor = await task_service.get_tasks_for_family(
+            db=session,
+            family_ctx=family_ctx,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            is_done=is_done,
+            assignee_id=assignee_id,
+        )
+        # ラベル・担当者は読み込み済みなので、ORMオブジェクトから検証せずにJSON化する
+        return dump_envelope(
+            [trusted_task_read(task) for task in tasks], next_cursor=next_cursor
+        )
+
+    body, cache_state = await get_cached_family_response(
+        db,
+        family_ctx=family_ctx,
+        route="tasks:list",
+        query=(sort, cursor, limit, is_done, assignee_id),
+        loader=load_page,
+    )
+    return TrustedJSONResponse(body, headers={"X-Cache": cache_state})
+
+
+@router.get(
+    "/search",  # /api/v1/families/{family_id}/tasks/search へのGET
+    response_model=APIResponse[List[TaskRead]],
+    summary="Search tasks in a family",
+    response_description="Tasks whose title or notes match the query",
+)
+async def search_tasks(
+    *,
+    db: AsyncSession = Depends(get_read_db),
+    family_ctx: CurrentFamilyReadOnly,
+    q: str = Query(..., min_length=1, max_length=100, description="検索文字列"),
+    limit: int = Query(20, ge=1, le=100, description="取得する最大アイテム数"),
+    is_done: Optional[bool] = Query(None, description="完了状態で絞り込む"),
+) -> Response:
+    """
+    指定された家族のタスクを、タイトルとメモから全文検索します (新しく更新された順)。
+    日本語にも対応するため、文字バイグラムで照合します。
+    """
+    tasks = await task_service.search_tasks_for_family(
+        db=db, family_ctx=family_ctx, query=q, limit=limit, is_done=is_done
+    )
+    return TrustedJSONResponse(
+        dump_envelope([trusted_task_read(task) for task in tasks])
+    )
+
+
+@router.get(
+    "/export",  # /api/v1/families/{family_id}/tasks/export へのGET
+    response_class=StreamingResponse,
+    summary="Export all tasks of a family",
+    response_description="All tasks as NDJSON (one TaskRead per line) or CSV",
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+async def export_tasks(
+    *,
+    session_factory: Callable[[], AsyncSession] = Depends(get_read_session_factory),
+    family_ctx: CurrentFamilyReadOnly,
+    export_format: TaskExportFormat = Query(
+        TaskExportFormat.NDJSON, alias="format", description="出力形式 (ndjson / csv)"
+    ),
+) -> StreamingResponse:
+    """
+    指定された家族の全タスクを、ラベル・担当者付きでストリーミングで返します (バックアップ用)。
+    サーバーサイドカーソルでチャンクごとに読み出すため、タスク数によらずメモリ使用量は一定です。
+    """
+    body = task_service.export_tasks_for_family(
+        session_factory,
+        family_ctx=family_ctx,
+        export_format=export_format,
+        chunk_size=settings.TASK_EXPORT_CHUNK_SIZE,
+    )
+    filename = f"family-{family_ctx.family_id}-tasks.{export_format.value}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/",  # /api/v1/families/{family_id}/tasks/ へのPOST
+    response_model=APIResponse[TaskRead],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create new task",
+    response_description="The created task",
+)
+async def create_new_task(
+    *,
+    task_in: TaskCreate,  # リクエストボディ
+    db: AsyncSession = Depends(get_db),
+    family_ctx: CurrentFamily,
+):
+    """
+    指定された家族内に新しいタスクを作成します。
+    ユーザーはその家族のメンバーである必要があります。
+    """
+    logger.info(
+        f"Router received request to create task in family {family_ctx.family_id}"
+    )
+
+    # Service層を呼び出し、複数のオブジェクトを受け取る
+    db_task, assignee_obj, label_objs = await task_service.create_task_for_family(
+        db=db, task_in=task_in, family_ctx=family_ctx
+    )
+
+    # --- レスポンス用 TaskRead オブジェクトを手動で構築 ---
+    logger.info(f"Constructing TaskRead response for task ID {db_task.id}")
+    task_read_data = _build_task_read(db_task, assignee_obj, label_objs)
+
     logger.info(f"Task {task_read_data.id} processed, returning response.")
     return APIResponse[TaskRead](
         data=task_read_data, message="Task created successfully."
     )
+
+
+@router.post(
+    "/bulk",  # /api/v1/families/{family_id}/tasks/bulk へのPOST
+    response_model=APIResponse[List[TaskRead]],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create multiple tasks",
+    response_description="The created tasks, in request order",
+)
+async def create_tasks_bulk(
+    *,
+    tasks_in: Annotated[
+        List[TaskCreate],
+        Body(min_length=1, max_length=BULK_CREATE_MAX_TASKS),
+    ],
+    db: AsyncSession = Depends(get_db),
+    family_ctx: CurrentFamily,
+):
+    """
+    指定された家族内に複数のタスクを1トランザクションでまとめて作成します。
+    1件でも不正な担当者・ラベルが含まれる場合は、何も作成されません。
+    """
+    logger.info(
+        f"Router received request to bulk create {len(tasks_in)} tasks "
+        f"in family {family_ctx.family_id}"
+    )
+    results = await task_service.create_tasks_bulk_for_family(
+        db=db, tasks_in=tasks_in, family_ctx=family_ctx
+    )
+    task_reads = [
+        _build_task_read(db_task, assignee, labels)
+        for db_task, assignee, labels in results
+    ]
+    return APIResponse[List[TaskRead]](
+        data=task_reads, message=f"{len(task_reads)} tasks created successfully."
+    )
+
+
+@router.post(
+    "/import",  # /api/v1/families/{family_id}/tasks/import へのPOST
+    response_model=APIResponse[TaskImportResult],
+    summary="Import tasks from NDJSON or CSV",
+    response_description="The number of imported tasks and the rows that failed",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_tasks(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    family_ctx: CurrentFamily,
+    import_format: TaskExportFormat = Query(
+        TaskExportFormat.NDJSON, alias="format", description="入力形式 (ndjson / csv)"
+    ),
+) -> APIResponse[TaskImportResult]:
+    """
+    NDJSON (1行に1つの TaskCreate) または CSV (1行目はヘッダー) のタスクを取り込みます。
+    本文は受信しながら少しずつ解釈し、一定件数ごとに検証・書き込みを行います。
+    不正な行は飛ばし、行番号と理由を結果に含めます。
+    エクスポートした形式も取り込めます。ただし親タスク (parent_task_id) は引き継がず、
+    ラベルはIDではなく名前で、取り込み先の家族の同じ名前のラベルを付けます。
+    """
+    if import_format == TaskExportFormat.CSV:
+        records = iter_csv_records(request.stream())
+    else:
+        records = iter_ndjson_records(request.stream())
+    result = await task_service.import_tasks_for_family(
+        db,
+        family_ctx=family_ctx,
+        records=records,
+        chunk_size=settings.TASK_IMPORT_CHUNK_SIZE,
+    )
+    return APIResponse[TaskImportResult](
+        data=result,
+        message=f"{result.imported} tasks imported, {result.failed} rows failed.",
+    )
@@ -0,0 +1,12 @@
+import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from .task import TaskRead
+
+
+# アジェンダAPI (GET /agenda) のレスポンス用スキーマ: 1日分のタスク
+class AgendaDay(BaseModel):
+    date: datetime.date
+    tasks: List[TaskRead] = []
@@ -1,4 +1,4 @@
-from typing import Generic, Optional, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel
 
@@ -14,5 +14,16 @@ class APIResponse(BaseModel, Generic[DataType]):
     )
 
 
+class PaginatedAPIResponse(BaseModel, Generic[DataType]):
+    """
+    キーセットページネーションを行う一覧APIのレスポンス形式。
+    next_cursor を次のリクエストの cursor に渡すと続きを取得できる (最後のページでは None)。
+    """
+
+    message: Optional[str] = None
+    data: List[DataType] = []
+    next_cursor: Optional[str] = None
+
+
 # エラー時 (4xx, 5xx) は、FastAPIのデフォルトである {"detail": "エラーメッセージ"} や、
 # カスタムの HTTPException を返すことを想定します。
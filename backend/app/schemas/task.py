@@ -1,7 +1,16 @@
 import datetime
-from typing import TYPE_CHECKING, List, Literal, Optional
-
-from pydantic import BaseModel, ConfigDict
+import enum
+import logging
+from typing import TYPE_CHECKING, Any, List, Literal, Optional
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    ValidationError,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+    model_validator,
+)
 from sqlmodel import Field
 from sqlmodel import SQLModel as SQLModelBase
 
@@ -11,6 +20,8 @@ from app.models.task import TaskType
 from .label import LabelSummary
 from .user import UserSummary
 
+logger = logging.getLogger(__name__)
+
 # --- Type Hinting ---
 # TaskReadスキーマ内でリレーション先のスキーマを使う場合に必要
 if TYPE_CHECKING:
@@ -99,6 +110,55 @@ class TaskRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # ★ ORMからの変換を許可
     # created_by_id や updated_by_id は必要に応じて追加
 
+    @field_validator("routine_settings", mode="wrap")
+    @classmethod
+    def _ignore_invalid_routine_settings(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler
+    ) -> Optional[RoutineSettings]:
+        # DBに不正な routine_settings が保存されていても、一覧全体をエラーにせず None で返す
+        try:
+            return handler(value)
+        except ValidationError as e:
+            logger.warning(f"Ignoring invalid routine_settings {value!r}: {e}")
+            return None
+
+    @model_validator(mode="after")
+    def _fill_label_ids(self) -> "TaskRead":
+        # ORMオブジェクトから変換した場合、label_ids は labels から埋める
+        if not self.label_ids and self.labels:
+            self.label_ids = [label.id for label in self.labels]
+        return self
+
+
+# タスク一覧API (GET /tasks) の並び順
+class TaskSortKey(str, enum.Enum):
+    DUE_DATE = "due_date"  # 期日の昇順 (期日なしは末尾)
+    CREATED_AT = "created_at"  # 作成日時の降順 (新しい順)
+
+
+# タスクのエクスポート・インポートAPI (/tasks/export, /tasks/import) のファイル形式
+class TaskExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"  # 1行に1タスク (TaskRead と同じ形のJSON)
+    CSV = "csv"  # 1行に1タスク (ラベル・担当者は列に展開)
+
+
+# タスクのインポートで取り込めなかった行
+class TaskImportRowError(BaseModel):
+    line: int = Field(description="行番号 (1始まり。CSVはヘッダー行を含む)")
+    errors: List[str] = Field(description="取り込めなかった理由")
+
+
+# タスクのインポートAPI (POST /tasks/import) の結果
+class TaskImportResult(BaseModel):
+    imported: int = Field(description="作成したタスクの件数")
+    failed: int = Field(description="取り込めなかった行の件数")
+    errors: List[TaskImportRowError] = Field(
+        default=[], description="取り込めなかった行 (先頭から一定件数まで)"
+    )
+    errors_truncated: bool = Field(
+        default=False, description="errors に含めきれなかった行があるか"
+    )
+
 
 # --- (オプション) リレーションを含む読み取り用スキーマの例 ---
 # 必要になったら、以下のように関連情報を含むスキーマを別途定義する
@@ -0,0 +1,79 @@
+import datetime
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import occurrence_cache
+from app.core.config import settings
+from app.core.recurrence import occurrences_between
+from app.crud import crud_task
+from app.models.task import Task, TaskType
+
+from .common import FamilyContext
+
+logger = logging.getLogger(__name__)
+
+
+def _routine_occurrences(
+    task: Task, start: datetime.date, end: datetime.date
+) -> Tuple[datetime.date, ...]:
+    """
+    定常タスクの期間内の発生日を返す。(task_id, updated_at, 期間) ごとにキャッシュする。
+    次回発生日より前の日は展開しない (過ぎた発生日は表示しない)。
+    """
+    cache_key = (task.id, task.updated_at, start, end)
+    occurrences = occurrence_cache.get(cache_key)
+    if occurrences is None:
+        effective_start = max(start, task.next_occurrence_date or start)
+        occurrences = tuple(
+            occurrences_between(
+                task.routine_settings,
+                start=effective_start,
+                end=end,
+                anchor=task.due_date,
+            )
+        )
+        occurrence_cache.set(cache_key, occurrences)
+    return occurrences
+
+
+async def get_agenda_for_family(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    start: datetime.date,
+    end: datetime.date,
+) -> List[Tuple[datetime.date, List[Task]]]:
+    """
+    期間内の日ごとのタスク (単発タスクは期日、定常タスクは展開した発生日) を日付順に返す。
+    期間が不正、または AGENDA_MAX_DAYS 日を超える場合は 422 エラー。
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'to' must be on or after 'from'.",
+        )
+    if (end - start).days + 1 > settings.AGENDA_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"The agenda window must be at most {settings.AGENDA_MAX_DAYS} days.",
+        )
+
+    tasks = await crud_task.get_agenda_candidates(
+        db, family_id=family_ctx.family_id, start=start, end=end
+    )
+    days: Dict[datetime.date, List[Task]] = defaultdict(list)
+    for task in tasks:
+        if task.task_type == TaskType.ROUTINE:
+            for day in _routine_occurrences(task, start, end):
+                days[day].append(task)
+        elif task.due_date is not None:
+            days[task.due_date].append(task)
+    logger.info(
+        f"Agenda {start}..{end} for family {family_ctx.family_id}: "
+        f"{len(tasks)} candidate tasks on {len(days)} days"
+    )
+    return sorted(days.items())
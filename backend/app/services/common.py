@@ -1,40 +1,159 @@
+import asyncio
 import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional, Set, Tuple, TypeVar
 
 from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.crud import crud_family, crud_membership
+from app.core.cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    membership_cache,
+    response_cache,
+)
+from app.crud import crud_family
+from app.db.session import get_database
+from app.models.family import Family
+from app.models.family_membership import MembershipRole
+from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+ResponseType = TypeVar("ResponseType")
 
-async def check_user_family_membership_or_raise(
-    db: AsyncSession, *, user_id: int, family_id: int
-):
+# 実行中のバックグラウンド再計算 (タスクがGCされないように参照を保持する)
+_revalidation_tasks: Set["asyncio.Task[None]"] = set()
+
+
+@dataclass
+class FamilyContext:
+    """
+    認可済みの家族スコープ情報。リクエストごとに1度だけ解決し、各Serviceで使い回す。
+    family は認可クエリで取得済みの場合のみ設定される (キャッシュヒット時は None)。
+    """
+
+    family_id: int
+    user: User
+    role: MembershipRole
+    family: Optional[Family] = None
+
+
+async def resolve_family_context(
+    db: AsyncSession, *, family_id: int, user: User
+) -> FamilyContext:
     """
-    家族が存在し、かつ指定されたユーザーがその家族のメンバーであるかを確認する。
-    存在しない、またはメンバーでない場合は HTTPException を発生させる。
+    家族が存在し、かつユーザーがその家族のメンバーであることを確認して FamilyContext を返す。
+    存在しない場合は404、メンバーでない場合は403の HTTPException を発生させる。
+    認可キャッシュにヒットすればDB問い合わせは行わず、ミス時も1回のJOINクエリで済ませる。
     """
-    # 1. 家族の存在確認
-    #    crud_family を直接使う (循環参照を避けるため FamilyService は使わない)
-    family = await crud_family.get_family(db, family_id=family_id)
-    if not family:
+    # 0. 認可キャッシュを確認 (ヒットすれば家族の存在・メンバーシップとも確認済み)
+    cache_key = (user.id, family_id)
+    cached_role = membership_cache.get(cache_key)
+    if cached_role is not None:
+        logger.debug(f"Auth check cache hit: user {user.id}, family {family_id}")
+        return FamilyContext(family_id=family_id, user=user, role=cached_role)
+
+    # 1. 家族の存在確認とメンバーシップ確認を1クエリで行う
+    family, role = await crud_family.get_family_with_member_role(
+        db, family_id=family_id, user_id=user.id
+    )
+    if family is None:
         logger.warning(f"Auth check failed: Family {family_id} not found.")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Family not found.",  # エラー詳細は少し曖昧に
         )
-    # 2. メンバーシップ確認
-    is_member = await crud_membership.is_user_member(
-        db, user_id=user_id, family_id=family_id
-    )
-    if not is_member:
+    if role is None:
         logger.warning(
-            f"Auth check failed: User {user_id} not member of family {family_id}."
+            f"Auth check failed: User {user.id} not member of family {family_id}."
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized for this family.",  # エラー詳細は少し曖昧に
         )
-    logger.debug(f"Auth check passed: User {user_id} is member of family {family_id}")
-    # この関数はチェックが目的なので、Familyオブジェクトは返さない
+    logger.debug(f"Auth check passed: User {user.id} is member of family {family_id}")
+    # 成功した結果のみキャッシュする (非メンバーはキャッシュしない)
+    membership_cache.set(cache_key, role)
+    return FamilyContext(family_id=family_id, user=user, role=role, family=family)
+
+
+async def get_family_cache_version(
+    db: AsyncSession, *, family_ctx: FamilyContext
+) -> int:
+    """
+    家族の cache_version を返す。
+    認可クエリで家族を取得済みなら追加のクエリなし、そうでなければ cache_version のみ取得する。
+    """
+    if family_ctx.family is not None:
+        return family_ctx.family.cache_version
+    version = await crud_family.get_family_cache_version(
+        db, family_id=family_ctx.family_id
+    )
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Family not found."
+        )
+    return version
+
+
+async def get_cached_family_response(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    route: str,
+    query: Hashable,
+    loader: Callable[[AsyncSession], Awaitable[ResponseType]],
+) -> Tuple[ResponseType, str]:
+    """
+    家族スコープのレスポンスをキャッシュから返す。ミスした場合は loader(db) で作成して登録する。
+    戻り値は (レスポンス, CACHE_HIT / CACHE_STALE / CACHE_MISS)。
+    バージョンは本体より先に読むため、並行した書き込みで本体が新しくなっても
+    古いバージョンのキーに新しい値が入るだけで、新しいバージョンのキーに古い値は入らない。
+    古い値を返した場合 (stale-while-revalidate) は、バックグラウンドで再計算する。
+    """
+    family_id = family_ctx.family_id
+    version = await get_family_cache_version(db, family_ctx=family_ctx)
+    value, state = response_cache.get(family_id, version, route, query)
+    if state == CACHE_HIT:
+        return value, state
+    if state == CACHE_STALE:
+        if response_cache.begin_revalidation(family_id, route, query):
+            task = asyncio.create_task(
+                _revalidate_family_response(family_id, route, query, loader)
+            )
+            _revalidation_tasks.add(task)
+            task.add_done_callback(_revalidation_tasks.discard)
+        return value, state
+
+    value = await loader(db)
+    response_cache.set(family_id, version, route, query, value)
+    return value, CACHE_MISS
+
+
+async def _revalidate_family_response(
+    family_id: int,
+    route: str,
+    query: Hashable,
+    loader: Callable[[AsyncSession], Awaitable[ResponseType]],
+) -> None:
+    """
+    古い値を返したレスポンスを、リクエストとは別の読み取り専用セッションで再計算して登録する。
+    (リクエストのセッションはレスポンス送信時に閉じられるため使えない)
+    """
+    try:
+        async with get_database().read_session_factory() as session:
+            version = await crud_family.get_family_cache_version(
+                session, family_id=family_id
+            )
+            if version is not None:
+                value = await loader(session)
+                response_cache.set(family_id, version, route, query, value)
+    except Exception as e:
+        logger.warning(
+            f"Failed to revalidate cached {route} for family {family_id}: {e}",
+            exc_info=True,
+        )
+    finally:
+        response_cache.end_revalidation(family_id, route, query)
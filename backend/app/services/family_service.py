@@ -3,13 +3,14 @@ import logging
 from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.etag import make_weak_etag
 from app.crud import crud_family, crud_membership
 from app.models.family import Family
 from app.models.family_membership import MembershipRole
 from app.models.user import User
 from app.schemas.family import FamilyCreate
 
-from .common import check_user_family_membership_or_raise
+from .common import FamilyContext
 
 logger = logging.getLogger(__name__)
 
@@ -53,19 +54,18 @@ async def create_family_with_owner(
 
 
 async def get_family_for_user_or_404(
-    db: AsyncSession, *, family_id: int, user: User
+    db: AsyncSession, *, family_ctx: FamilyContext
 ) -> Family:
     """
-    指定されたIDの家族を取得する。ユーザーがメンバーでない場合は403エラー。
-    家族が存在しない場合は404エラー。
+    認可済みの家族を取得する。
+    認可 (404/403) は FamilyContext の解決時に済んでいるため、ここでは再チェックしない。
     """
-    # 認可チェック
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
+    # 認可クエリで取得済みならそのまま返す (追加のクエリなし)
+    if family_ctx.family is not None:
+        return family_ctx.family
 
-    # 1. 家族を取得
-    db_family = await crud_family.get_family(db, family_id=family_id)
+    # 認可キャッシュにヒットした場合は家族本体のみ取得する
+    db_family = await crud_family.get_family(db, family_id=family_ctx.family_id)
     if db_family is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,3 +73,22 @@ async def get_family_for_user_or_404(
         )
 
     return db_family
+
+
+async def get_family_etag(db: AsyncSession, *, family_ctx: FamilyContext) -> str:
+    """
+    家族情報の弱いETag (updated_at から計算) を返す。
+    認可クエリで家族を取得済みなら追加のクエリなし、そうでなければ updated_at のみ取得する。
+    """
+    if family_ctx.family is not None:
+        updated_at = family_ctx.family.updated_at
+    else:
+        updated_at = await crud_family.get_family_updated_at(
+            db, family_id=family_ctx.family_id
+        )
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Family not found",
+            )
+    return make_weak_etag("family", family_ctx.family_id, updated_at)
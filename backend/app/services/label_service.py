@@ -1,38 +1,39 @@
 import logging
-from typing import Sequence
+from typing import Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.etag import make_weak_etag
+from app.core.pagination import InvalidCursorError, decode_cursor, next_cursor_for
 from app.crud import (
     crud_label,
 )
+from app.crud.rows import LabelRow
 
 # 必要なモデル、スキーマ、CRUD関数をインポート
 from app.models.label import Label
-from app.models.user import User
-
-# from app.models.family import Family # check_user_family_membership内で必要
 from app.schemas.label import LabelCreate, LabelUpdate
 
-from .common import check_user_family_membership_or_raise
+from .common import FamilyContext
 
 logger = logging.getLogger(__name__)
 
+# ラベル一覧のカーソルに埋め込む並び順の名前 ((name, id) 順)
+LABEL_SORT_KEY = "name"
+
 
 # --- Label Service 関数 ---
 
 
 async def create_label_for_family(
-    db: AsyncSession, *, label_in: LabelCreate, family_id: int, user: User
+    db: AsyncSession, *, label_in: LabelCreate, family_ctx: FamilyContext
 ) -> Label:
-    """指定された家族に新しいラベルを作成する (認可・重複チェック込み)"""
-    # 1. 認可チェック (ユーザーが家族メンバーか？ 家族が存在するか？)
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
+    """指定された家族に新しいラベルを作成する (重複チェック込み、認可は解決済み)"""
+    family_id = family_ctx.family_id
+    user = family_ctx.user
 
-    # 2. 同じ名前のラベルが家族内に存在しないかチェック
+    # 1. 同じ名前のラベルが家族内に存在しないかチェック
     existing_label = await crud_label.get_label_by_name_and_family(
         db, name=label_in.name, family_id=family_id
     )
@@ -42,7 +43,7 @@ async def create_label_for_family(
             detail=f"Label name '{label_in.name}' already exists in this family.",
         )
 
-    # 3. CRUD関数を呼び出してラベルを作成 (コミットは get_db に任せる)
+    # 2. CRUD関数を呼び出してラベルを作成 (コミットは get_db に任せる)
     db_label = await crud_label.create_label(
         db, label_in=label_in, family_id=family_id, creator_id=user.id
     )
@@ -53,31 +54,85 @@ async def create_label_for_family(
 
 
 async def get_labels_for_family(
-    db: AsyncSession, *, family_id: int, user: User, skip: int = 0, limit: int = 100
-) -> Sequence[Label]:
-    """指定された家族のラベルリストを取得する (認可チェック込み)"""
-    # 1. 認可チェック
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> Tuple[Sequence[LabelRow], Optional[str]]:
+    """
+    指定された家族のラベルリスト ((name, id) 順) と次ページのカーソルを返す (認可は解決済み)。
+    不正なカーソルの場合は 400 エラー。
+    """
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, sort_key=LABEL_SORT_KEY)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+        if not isinstance(after[0], str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+            )
+
+    # 1件多く取得して、次のページがあるかどうかを判定する (必要な列だけを取得する)
+    labels = await crud_label.get_label_rows_by_family(
+        db, family_id=family_ctx.family_id, after=after, limit=limit + 1
+    )
+    has_more = len(labels) > limit
+    labels = labels[:limit]
+    last_label = labels[-1] if labels else None
+    next_cursor = next_cursor_for(
+        LABEL_SORT_KEY,
+        last_label.name if last_label else None,
+        last_label.id if last_label else None,
+        has_more=has_more,
+    )
+    return labels, next_cursor
+
+
+async def get_labels_etag(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+) -> str:
+    """
+    ラベル一覧の弱いETagを返す (ラベルの件数・最新の updated_at とページ指定から計算)。
+    ラベル本体は読み込まない。
+    """
+    count, last_updated_at = await crud_label.get_labels_version(
+        db, family_id=family_ctx.family_id
     )
+    return make_weak_etag(
+        "labels", family_ctx.family_id, count, last_updated_at, cursor, limit
+    )
+
 
-    # 2. CRUD関数を呼び出してラベルリストを取得
-    labels = await crud_label.get_labels_by_family(
-        db, family_id=family_id, skip=skip, limit=limit
+async def get_label_etag(
+    db: AsyncSession, *, label_id: int, family_ctx: FamilyContext
+) -> str:
+    """ラベルの弱いETag (updated_at から計算) を返す。存在しなければ 404 エラー"""
+    updated_at = await crud_label.get_label_updated_at(
+        db, label_id=label_id, family_id=family_ctx.family_id
     )
-    return labels
+    if updated_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Label with ID {label_id} not found in family {family_ctx.family_id}",
+        )
+    return make_weak_etag("label", label_id, updated_at)
 
 
 async def get_label_for_family_user_or_404(
-    db: AsyncSession, *, label_id: int, family_id: int, user: User
+    db: AsyncSession, *, label_id: int, family_ctx: FamilyContext
 ) -> Label:
-    """指定されたIDのラベルを取得する (認可・存在チェック込み)"""
-    # 1. 認可チェック (家族の存在とメンバーシップを確認)
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
-
-    # 2. CRUD関数を呼び出してラベルを取得
+    """指定されたIDのラベルを取得する (存在チェック込み、認可は解決済み)"""
+    family_id = family_ctx.family_id
+    # CRUD関数を呼び出してラベルを取得
     db_label = await crud_label.get_label(db, label_id=label_id, family_id=family_id)
     if db_label is None:
         # CRUDで family_id も条件にしているので、ここで None になるのは
@@ -96,16 +151,13 @@ async def update_label_for_family_user(
     *,
     label_id: int,
     label_in: LabelUpdate,
-    family_id: int,
-    user: User,
+    family_ctx: FamilyContext,
 ) -> Label:
-    """指定されたラベルを更新する (認可・存在・重複チェック込み)"""
-    # 1. 認可チェック
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
+    """指定されたラベルを更新する (存在・重複チェック込み、認可は解決済み)"""
+    family_id = family_ctx.family_id
+    user = family_ctx.user
 
-    # 2. ラベル取得
+    # 1. ラベル取得
     db_label = await crud_label.get_label(db, label_id=label_id, family_id=family_id)
     if db_label is None:
         raise HTTPException(
@@ -133,14 +185,13 @@ async def update_label_for_family_user(
 
 
 async def delete_label_for_family_user(
-    db: AsyncSession, *, label_id: int, family_id: int, user: User
+    db: AsyncSession, *, label_id: int, family_ctx: FamilyContext
 ) -> None:  # 削除成功時は何も返さない
-    """指定されたラベルを削除する (認可・存在チェック込み)"""
-    # 1. 認可チェックと削除対象ラベルの取得 (存在しなければ404)
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
+    """指定されたラベルを削除する (存在チェック込み、認可は解決済み)"""
+    family_id = family_ctx.family_id
+    user = family_ctx.user
 
+    # 1. 削除対象ラベルの取得 (存在しなければ404)
     db_label = await crud_label.get_label(db, label_id=label_id, family_id=family_id)
     if db_label is None:
         raise HTTPException(
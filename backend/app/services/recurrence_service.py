@@ -0,0 +1,51 @@
+import datetime
+import logging
+from typing import Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.recurrence import next_occurrences
+from app.crud import crud_task
+
+logger = logging.getLogger(__name__)
+
+
+async def roll_forward_next_occurrences(
+    db: AsyncSession,
+    *,
+    today: Optional[datetime.date] = None,
+    chunk_size: int = 10_000,
+) -> int:
+    """
+    次回発生日が未設定、または過ぎている定常タスクの next_occurrence_date を、
+    今日以降の最初の発生日に進める (夜間バッチ用)。更新した件数を返す。
+    chunk_size 件ずつ読み込み、発生日の計算はチャンク単位で配列演算、更新は一括 UPDATE で行う。
+    コミットは呼び出し元が行う。
+    """
+    today = today or datetime.date.today()
+    yesterday = today - datetime.timedelta(days=1)
+    updated = 0
+    last_id = 0
+    while True:
+        rows = await crud_task.get_routine_tasks_to_roll_forward(
+            db, today=today, after_id=last_id, limit=chunk_size
+        )
+        if not rows:
+            break
+        next_dates = next_occurrences(
+            [row.routine_settings for row in rows],
+            after=yesterday,
+            anchors=[row.due_date for row in rows],
+        )
+        # routine_settings が不正なタスク (計算結果 None) は更新しない
+        updated += await crud_task.update_next_occurrence_dates(
+            db,
+            updates=[
+                (row.id, next_date)
+                for row, next_date in zip(rows, next_dates)
+                if next_date is not None
+            ],
+        )
+        last_id = rows[-1].id
+    logger.info(f"Rolled forward next_occurrence_date of {updated} routine tasks")
+    return updated
@@ -1,34 +1,57 @@
 import logging
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter, ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.pagination import InvalidCursorError, decode_cursor, next_cursor_for
+from app.core.serialization import (
+    IMPORT_LABEL_NAMES_FIELD,
+    TASK_CSV_COLUMNS,
+    ImportFormatError,
+    ParsedRecord,
+    RecordParseError,
+    dump_csv,
+    dump_ndjson,
+    task_csv_row,
+    trusted_task_read,
+)
 from app.crud import crud_label, crud_membership, crud_task, crud_task_label, crud_user
+from app.crud.rows import TaskRow
 from app.models.label import Label
 from app.models.task import Task
 from app.models.user import User
-from app.schemas.task import TaskCreate
+from app.schemas.label import LabelSummary
+from app.schemas.task import (
+    TaskCreate,
+    TaskExportFormat,
+    TaskImportResult,
+    TaskImportRowError,
+    TaskSortKey,
+)
+from app.schemas.user import UserSummary
 
-from .common import check_user_family_membership_or_raise
+from .common import FamilyContext
 
 logger = logging.getLogger(__name__)
 
+# インポート結果に含める、取り込めなかった行の最大件数 (件数自体は全て数える)
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
 
 async def create_task_for_family(
-    db: AsyncSession, *, task_in: TaskCreate, family_id: int, user: User
+    db: AsyncSession, *, task_in: TaskCreate, family_ctx: FamilyContext
 ) -> Tuple[Task, Optional[User], List[Label]]:
     """
     タスクを作成し、担当者やラベルを（指定があれば）紐付け、関連オブジェクトを返す。
-    トランザクション管理は get_db に任せる。
+    認可は FamilyContext の解決時に済んでいる。トランザクション管理は get_db に任せる。
     """
-    # 1. 認可チェック
-    await check_user_family_membership_or_raise(
-        db, user_id=user.id, family_id=family_id
-    )
-    logger.info(f"User {user.id} authorized for family {family_id} to create task.")
+    family_id = family_ctx.family_id
+    user = family_ctx.user
 
-    # 2. 基本的なタスクオブジェクトを作成 (add + flush)
+    # 1. 基本的なタスクオブジェクトを作成 (add + flush)
     db_task = await crud_task.create_task(
         db=db, task_in=task_in, family_id=family_id, creator_id=user.id
     )
@@ -37,7 +60,7 @@ async def create_task_for_family(
     assignee_obj: Optional[User] = None
     label_objs: List[Label] = []
 
-    # 3. 担当者の処理 (もし指定されていれば)
+    # 2. 担当者の処理 (もし指定されていれば)
     if task_in.assignee_id is not None:
         logger.info(
             f"Processing assignee ID: {task_in.assignee_id} for task {db_task.id}"
@@ -67,7 +90,7 @@ async def create_task_for_family(
         # assignee_id が None の場合、Task モデルの assignee_id も None であることを確認 (create_task内で処理されるはず)
         logger.info(f"No assignee specified for task {db_task.id}")
 
-    # 4. ラベルの処理 (もし指定されていれば)
+    # 3. ラベルの処理 (もし指定されていれば)
     if task_in.label_ids:
         label_ids = list(set(task_in.label_ids))  # 重複を除去
         logger.info(f"Processing label IDs: {label_ids} for task {db_task.id}")
@@ -85,11 +108,13 @@ async def create_task_for_family(
                     detail=f"Labels not found or do not belong to family {family_id}: {missing_ids}",
                 )
 
-            # TaskとLabelを紐付ける (add + flush in CRUD)
-            for label in fetched_labels:
-                await crud_task_label.add_label_to_task(
-                    db=db, task_id=db_task.id, label_id=label.id
-                )
+            # TaskとLabelを1回の INSERT でまとめて紐付ける
+            await crud_task_label.add_labels_to_task(
+                db,
+                task_id=db_task.id,
+                label_ids=[label.id for label in fetched_labels],
+                family_id=family_id,
+            )
 
             label_objs = list(fetched_labels)  # 返却用にリストを保持
             logger.info(
@@ -100,10 +125,338 @@ async def create_task_for_family(
     else:
         logger.info(f"No labels specified for task {db_task.id}")
 
-    # 5. 関連オブジェクトも含めてタプルで返す
+    # 4. 関連オブジェクトも含めてタプルで返す
     #    コミットは get_db が担当する
     logger.info(f"Returning created task {db_task.id} with assignee and labels.")
     return db_task, assignee_obj, label_objs
 
 
+async def create_tasks_bulk_for_family(
+    db: AsyncSession, *, tasks_in: List[TaskCreate], family_ctx: FamilyContext
+) -> List[Tuple[Task, Optional[UserSummary], List[LabelSummary]]]:
+    """
+    複数のタスクを1トランザクションでまとめて作成する。
+    担当者とラベルの検証は1回のクエリ、タスクとラベル紐付けの作成はそれぞれ1回の
+    複数行 INSERT で行う。1件でも不正な参照があれば何も作成せずにエラーを返す。
+    """
+    family_id = family_ctx.family_id
+    user = family_ctx.user
+
+    # 1. 参照されている担当者・ラベルを1回のクエリでまとめて検証
+    assignee_ids = {t.assignee_id for t in tasks_in if t.assignee_id is not None}
+    label_ids = {label_id for t in tasks_in for label_id in (t.label_ids or [])}
+    assignees, labels = await crud_task.get_task_references(
+        db,
+        family_id=family_id,
+        assignee_ids=sorted(assignee_ids),
+        label_ids=sorted(label_ids),
+    )
+    invalid_assignee_ids = assignee_ids - assignees.keys()
+    if invalid_assignee_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Assignee users are not members of family {family_id}: {sorted(invalid_assignee_ids)}",
+        )
+    missing_label_ids = label_ids - labels.keys()
+    if missing_label_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Labels not found or do not belong to family {family_id}: {sorted(missing_label_ids)}",
+        )
+
+    # 2. タスクをまとめて作成 (1回のフラッシュ)
+    db_tasks = await crud_task.create_tasks(
+        db, tasks_in=tasks_in, family_id=family_id, creator_id=user.id
+    )
+
+    # 3. ラベルの紐付けをまとめて作成 (タスクごとに重複は除去)
+    results: List[Tuple[Task, Optional[UserSummary], List[LabelSummary]]] = []
+    links: List[Tuple[int, int]] = []
+    for task_in, db_task in zip(tasks_in, db_tasks):
+        task_label_ids = list(dict.fromkeys(task_in.label_ids or []))
+        links.extend((db_task.id, label_id) for label_id in task_label_ids)
+        assignee = (
+            assignees[task_in.assignee_id] if task_in.assignee_id is not None else None
+        )
+        results.append(
+            (db_task, assignee, [labels[label_id] for label_id in task_label_ids])
+        )
+    linked_count = await crud_task_label.add_labels_to_tasks(
+        db, links=links, family_id=family_id
+    )
+
+    logger.info(
+        f"Bulk created {len(db_tasks)} tasks with {linked_count} label links "
+        f"in family {family_id}"
+    )
+    return results
+
+
+async def get_tasks_for_family(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    sort: TaskSortKey = TaskSortKey.DUE_DATE,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    is_done: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+) -> Tuple[Sequence[TaskRow], Optional[str]]:
+    """
+    家族のタスク一覧 (ラベル・担当者付きの TaskRow) と、次ページのカーソルを返す。
+    不正なカーソルの場合は 400 エラー。
+    """
+    _, _, _, parse_value = crud_task.TASK_SORT_COLUMNS[sort]
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, sort_key=sort.value, parse_value=parse_value)
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+
+    # 1件多く取得して、次のページがあるかどうかを判定する (必要な列だけを取得する)
+    tasks = await crud_task.get_task_rows_by_family(
+        db,
+        family_id=family_ctx.family_id,
+        sort=sort,
+        after=after,
+        limit=limit + 1,
+        is_done=is_done,
+        assignee_id=assignee_id,
+    )
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    last_task = tasks[-1] if tasks else None
+    next_cursor = next_cursor_for(
+        sort.value,
+        getattr(last_task, sort.value, None),
+        last_task.id if last_task else None,
+        has_more=has_more,
+    )
+    return tasks, next_cursor
+
+
+async def search_tasks_for_family(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    query: str,
+    limit: int = 20,
+    is_done: Optional[bool] = None,
+) -> Sequence[Task]:
+    """家族のタスクを全文検索する (ラベル・担当者を読み込み済み、認可は解決済み)"""
+    tasks = await crud_task.search_tasks(
+        db, family_id=family_ctx.family_id, query=query, limit=limit, is_done=is_done
+    )
+    logger.info(
+        f"Search '{query}' in family {family_ctx.family_id} returned {len(tasks)} tasks"
+    )
+    return tasks
+
+
+async def export_tasks_for_family(
+    session_factory: Callable[[], AsyncSession],
+    *,
+    family_ctx: FamilyContext,
+    export_format: TaskExportFormat,
+    chunk_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    家族の全タスクを NDJSON または CSV のバイト列としてチャンクごとに返す (認可は解決済み)。
+    StreamingResponse の本文として使うため、セッションは session_factory で自分で開く。
+    """
+    exported = 0
+    async with session_factory() as db:
+        if export_format == TaskExportFormat.CSV:
+            yield dump_csv([TASK_CSV_COLUMNS])
+        async for tasks in crud_task.stream_task_rows_by_family(
+            db, family_id=family_ctx.family_id, chunk_size=chunk_size
+        ):
+            if export_format == TaskExportFormat.CSV:
+                yield dump_csv(task_csv_row(task) for task in tasks)
+            else:
+                yield dump_ndjson(trusted_task_read(task) for task in tasks)
+            exported += len(tasks)
+    logger.info(
+        f"Exported {exported} tasks of family {family_ctx.family_id} "
+        f"as {export_format.value}"
+    )
+
+
+@dataclass
+class _ImportReport:
+    """インポート結果の集計 (取り込めなかった行は IMPORT_MAX_REPORTED_ERRORS 件まで保持)"""
+
+    imported: int = 0
+    failed: int = 0
+    errors: List[TaskImportRowError] = field(default_factory=list)
+
+    def add_error(self, line: int, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(TaskImportRowError(line=line, errors=errors))
+
+    def to_result(self) -> TaskImportResult:
+        return TaskImportResult(
+            imported=self.imported,
+            failed=self.failed,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors),
+        )
+
+
+def _validation_messages(
+    error: ValidationError, *, field_name: Optional[str] = None
+) -> List[str]:
+    """
+    ValidationError を「フィールド: 理由」のメッセージのリストにする。
+    field_name を指定すると、そのフィールド単体を検証したエラーとして先頭に付ける。
+    """
+    messages = []
+    for detail in error.errors(include_url=False):
+        loc = (field_name, *detail["loc"]) if field_name else detail["loc"]
+        messages.append(
+            f"{'.'.join(str(part) for part in loc) or 'record'}: {detail['msg']}"
+        )
+    return messages
+
+
+# インポートの1行: (行番号, 検証済みのタスク, ラベル名 (エクスポートしたレコードのみ))
+_ImportRow = Tuple[int, TaskCreate, Optional[List[str]]]
+
+# ラベル名 (TaskCreate のフィールドではないため別に検証する)
+_LABEL_NAMES_ADAPTER: TypeAdapter[Optional[List[str]]] = TypeAdapter(
+    Optional[List[str]]
+)
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    chunk: List[_ImportRow],
+    report: _ImportReport,
+) -> None:
+    """
+    検証済みの1チャンク分のタスクについて、担当者・ラベル・親タスクを1回ずつのクエリで
+    まとめて確認し、問題のない行だけを書き込む。
+    ラベル名のある行は、取り込み先の家族の同じ名前のラベルを付ける (1回のクエリ)。
+    """
+    family_id = family_ctx.family_id
+    label_names = {name for _, _, names in chunk for name in (names or [])}
+    label_ids_by_name = await crud_label.get_label_ids_by_names(
+        db, names=sorted(label_names), family_id=family_id
+    )
+    assignee_ids = {t.assignee_id for _, t, _ in chunk if t.assignee_id is not None}
+    label_ids = {label_id for _, t, _ in chunk for label_id in (t.label_ids or [])}
+    parent_ids = {t.parent_task_id for _, t, _ in chunk if t.parent_task_id is not None}
+    assignees, labels = await crud_task.get_task_references(
+        db,
+        family_id=family_id,
+        assignee_ids=sorted(assignee_ids),
+        label_ids=sorted(label_ids),
+    )
+    parents = await crud_task.get_existing_task_ids(
+        db, family_id=family_id, task_ids=sorted(parent_ids)
+    )
+
+    valid: List[TaskCreate] = []
+    for line, task_in, names in chunk:
+        errors = []
+        if task_in.assignee_id is not None and task_in.assignee_id not in assignees:
+            errors.append(
+                f"assignee_id: user {task_in.assignee_id} is not a member of "
+                f"family {family_id}"
+            )
+        missing_label_ids = sorted(set(task_in.label_ids or []) - labels.keys())
+        if missing_label_ids:
+            errors.append(
+                f"label_ids: labels not found in family {family_id}: "
+                f"{missing_label_ids}"
+            )
+        # ラベル名で指定された行 (エクスポートしたレコード) は名前で探したラベルを付ける
+        if names:
+            missing_names = sorted(set(names) - label_ids_by_name.keys())
+            if missing_names:
+                errors.append(
+                    f"label_names: labels not found in family {family_id}: "
+                    f"{missing_names}"
+                )
+            task_in.label_ids = [
+                label_ids_by_name[name] for name in names if name in label_ids_by_name
+            ]
+        if task_in.parent_task_id is not None and task_in.parent_task_id not in parents:
+            errors.append(
+                f"parent_task_id: task {task_in.parent_task_id} not found in "
+                f"family {family_id}"
+            )
+        if errors:
+            report.add_error(line, errors)
+        else:
+            valid.append(task_in)
+
+    task_ids = await crud_task.import_tasks(
+        db, tasks_in=valid, family_id=family_id, creator_id=family_ctx.user.id
+    )
+    report.imported += len(task_ids)
+
+
+async def import_tasks_for_family(
+    db: AsyncSession,
+    *,
+    family_ctx: FamilyContext,
+    records: AsyncIterator[ParsedRecord],
+    chunk_size: int = 1000,
+) -> TaskImportResult:
+    """
+    (行番号, 辞書) のレコードを順に TaskCreate として検証し、chunk_size 件ごとに書き込む。
+    不正な行は飛ばして結果に行番号と理由を含める (正しい行は作成する)。
+    エクスポートしたレコードは親タスクを引き継がず、ラベルは名前で取り込み先の家族から探す。
+    リクエスト全体が不正な場合は 400 エラー (それまでに書き込んだ行も get_db がロールバックする)。
+    """
+    report = _ImportReport()
+    chunk: List[_ImportRow] = []
+    try:
+        async for line, record in records:
+            if isinstance(record, RecordParseError):
+                report.add_error(line, [str(record)])
+                continue
+            errors: List[str] = []
+            try:
+                names = _LABEL_NAMES_ADAPTER.validate_python(
+                    record.pop(IMPORT_LABEL_NAMES_FIELD, None)
+                )
+            except ValidationError as e:
+                errors.extend(
+                    _validation_messages(e, field_name=IMPORT_LABEL_NAMES_FIELD)
+                )
+            try:
+                task_in = TaskCreate.model_validate(record)
+            except ValidationError as e:
+                errors.extend(_validation_messages(e))
+            if errors:
+                report.add_error(line, errors)
+                continue
+            chunk.append((line, task_in, names))
+            if len(chunk) >= chunk_size:
+                await _import_chunk(
+                    db, family_ctx=family_ctx, chunk=chunk, report=report
+                )
+                chunk = []
+    except ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if chunk:
+        await _import_chunk(db, family_ctx=family_ctx, chunk=chunk, report=report)
+
+    logger.info(
+        f"Imported {report.imported} tasks into family {family_ctx.family_id} "
+        f"({report.failed} rows failed)"
+    )
+    return report.to_result()
+
+
 # --- 他のサービス関数 (get_tasks_for_family など) の骨組みも後で追加 ---
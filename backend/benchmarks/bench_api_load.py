@@ -0,0 +1,410 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+# --- Path設定 (scripts/ と同様) ---
+script_path = os.path.abspath(__file__)
+benchmarks_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(benchmarks_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import httpx  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.db.session import (  # noqa: E402
+    create_engine_from_settings,
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+)
+from app.main import app  # noqa: E402
+
+# seed_data はインポート時に標準出力へデバッグ表示するため、結果のJSONと混ざらないようにする
+with contextlib.redirect_stdout(sys.stderr):
+    from scripts.seed_data import SyntheticConfig, seed_synthetic_data  # noqa: E402
+
+# --- APIの負荷ベンチマーク ---
+# ルートごとに一定件数のリクエストを並列に送り、スループットとレイテンシ (p50/p95/p99) を
+# JSONで出力する。--baseline に前回の結果を渡すと、ルートごとの変化率も出力する。
+#
+# asgi (既定): app.main:app をプロセス内で httpx の ASGI トランスポート経由で呼ぶ
+#              (tests/conftest.py と同様に DB の依存関係を差し替え、合成データを投入する)
+# http:        起動済みの uvicorn (--base-url) か、--serve で起動した uvicorn に送る
+#              (サーバーの DB は scripts/seed_data.py --reset --families N で準備する)
+#
+# 認証は仮実装 (常に ID=1 のユーザー) のため、ID=1 のユーザーが所属する家族を対象にする。
+# seed_data.py で作成したDBでは、最初の家族 (ID=1) の管理者が ID=1 のユーザーになる。
+
+
+@dataclass
+class RouteSpec:
+    """計測するルート。path は {family_id} / {label_id} を含むテンプレート"""
+
+    name: str
+    method: str
+    path: str
+    # リクエスト番号を受け取ってリクエストボディを返す (POST 用)
+    body: Optional[Callable[[int, Dict[str, Any]], Any]] = None
+    needs_label: bool = False
+
+
+def _task_body(index: int, context: Dict[str, Any]) -> Dict[str, Any]:
+    label_ids = [context["label_id"]] if context.get("label_id") else []
+    return {"title": f"ベンチマーク用タスク {index}", "label_ids": label_ids}
+
+
+ROUTES = [
+    RouteSpec("get_family", "GET", "/api/v1/families/{family_id}"),
+    RouteSpec("list_labels", "GET", "/api/v1/families/{family_id}/labels/"),
+    RouteSpec(
+        "get_label",
+        "GET",
+        "/api/v1/families/{family_id}/labels/{label_id}",
+        needs_label=True,
+    ),
+    RouteSpec("list_tasks", "GET", "/api/v1/families/{family_id}/tasks/?limit=50"),
+    RouteSpec(
+        "list_open_tasks",
+        "GET",
+        "/api/v1/families/{family_id}/tasks/?limit=50&is_done=false",
+    ),
+    RouteSpec(
+        "search_tasks", "GET", "/api/v1/families/{family_id}/tasks/search?q=掃除"
+    ),
+    RouteSpec(
+        "agenda_week",
+        "GET",
+        "/api/v1/families/{family_id}/agenda/?from={today}&to={week_later}",
+    ),
+    # 書き込みは家族のバージョンを上げて一覧のキャッシュを無効にするため、最後に計測する
+    RouteSpec(
+        "create_task", "POST", "/api/v1/families/{family_id}/tasks/", body=_task_body
+    ),
+]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """レイテンシ (秒) のリストから、スループットと各パーセンタイル (ミリ秒) を求める"""
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": p50 * 1000,
+            "p95": p95 * 1000,
+            "p99": p99 * 1000,
+            "max": max(latencies, default=0.0) * 1000,
+        },
+    }
+
+
+async def run_route(
+    client: httpx.AsyncClient,
+    route: RouteSpec,
+    context: Dict[str, Any],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    """route に requests 件のリクエストを concurrency 並列で送り、集計結果を返す"""
+    url = route.path.format(**context)
+    counter = iter(range(warmup + requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def send(index: int) -> None:
+        nonlocal errors
+        body = route.body(index, context) if route.body else None
+        start = time.perf_counter()
+        response = await client.request(route.method, url, json=body)
+        latency = time.perf_counter() - start
+        if index < warmup:
+            return
+        latencies.append(latency)
+        if response.status_code >= 400:
+            errors += 1
+
+    async def worker() -> None:
+        for index in counter:
+            await send(index)
+
+    # ウォームアップ (接続の確立やキャッシュの作成) は計測に含めない
+    for index in range(warmup):
+        next(counter)
+        await send(index)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "method": route.method,
+        "path": route.path,
+        **summarize(latencies, errors, elapsed),
+    }
+
+
+async def discover_context(client: httpx.AsyncClient, family_id: int) -> Dict[str, Any]:
+    """パスに埋め込む値を用意する (ラベルは家族の最初のラベルを使う)"""
+    today = datetime.date.today()
+    context: Dict[str, Any] = {
+        "family_id": family_id,
+        "today": today.isoformat(),
+        "week_later": (today + datetime.timedelta(days=6)).isoformat(),
+        "label_id": None,
+    }
+    response = await client.get(f"/api/v1/families/{family_id}/labels/?limit=1")
+    response.raise_for_status()
+    labels = response.json()["data"]
+    if labels:
+        context["label_id"] = labels[0]["id"]
+    return context
+
+
+async def run_routes(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> Dict[str, Any]:
+    context = await discover_context(client, args.family_id)
+    selected = set(args.routes.split(",")) if args.routes else None
+    results = {}
+    for route in ROUTES:
+        if selected is not None and route.name not in selected:
+            continue
+        if route.needs_label and context["label_id"] is None:
+            continue
+        results[route.name] = await run_route(
+            client,
+            route,
+            context,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+        )
+        print(
+            f"{route.name}: {results[route.name]['throughput_rps']:.0f} req/s, "
+            f"p95 {results[route.name]['latency_ms']['p95']:.1f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+async def run_asgi(args: argparse.Namespace) -> Dict[str, Any]:
+    """app をプロセス内で呼ぶ。--database-url のDB (省略時は一時ファイルの SQLite) を使う"""
+    database_url = args.database_url
+    temp_dir = None
+    if database_url is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite+aiosqlite:///{temp_dir.name}/bench.db"
+    engine = create_engine_from_settings(database_url)
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    if temp_dir is not None or args.reset:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        if args.families:
+            async with session_factory() as session:
+                counts = await seed_synthetic_data(
+                    session,
+                    SyntheticConfig(
+                        families=args.families,
+                        tasks_per_family=args.tasks_per_family,
+                        labels_per_family=args.labels,
+                        seed=args.seed,
+                    ),
+                )
+            print(f"Seeded: {counts}", file=sys.stderr)
+
+    # get_db / get_read_db と同じ振る舞いで、ベンチマーク用のDBのセッションを渡す
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def override_get_read_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            return await run_routes(client, args)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+
+def start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    """uvicorn を起動し、応答するまで待つ (DB は settings の接続先を使う)"""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=project_root,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError as e:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup") from e
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready within 30 seconds")
+
+
+async def run_http(args: argparse.Namespace) -> Dict[str, Any]:
+    """起動済み (または --serve で起動した) uvicorn にHTTPで送る"""
+    process = None
+    base_url = args.base_url
+    if args.serve:
+        process = start_uvicorn(args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            return await run_routes(client, args)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """ルートごとに、前回の結果に対する変化率 (今回 / 前回) を求める"""
+    changes = {}
+    for name, result in results.items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        changes[name] = {
+            "throughput": result["throughput_rps"] / before["throughput_rps"],
+            **{
+                key: result["latency_ms"][key] / before["latency_ms"][key]
+                for key in ("p50", "p95", "p99")
+                if before["latency_ms"][key]
+            },
+        }
+    return changes
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    target = "http" if args.base_url or args.serve else "asgi"
+    started_at = datetime.datetime.now().isoformat(timespec="seconds")
+    if target == "asgi":
+        routes = await run_asgi(args)
+    else:
+        routes = await run_http(args)
+    report: Dict[str, Any] = {
+        "target": target,
+        "started_at": started_at,
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "family_id": args.family_id,
+        "routes": routes,
+    }
+    if target == "asgi":
+        report["dataset"] = {
+            "database_url": args.database_url,
+            "families": args.families,
+            "tasks_per_family": args.tasks_per_family,
+            "labels_per_family": args.labels,
+            "seed": args.seed,
+        }
+    else:
+        report["base_url"] = args.base_url or f"http://127.0.0.1:{args.port}"
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["change_vs_baseline"] = compare(routes, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and latency percentiles of API routes."
+    )
+    parser.add_argument(
+        "--base-url", help="起動済みサーバーのURL (省略時はプロセス内で実行)"
+    )
+    parser.add_argument(
+        "--serve", action="store_true", help="uvicorn を起動してHTTPで計測する"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="--serve のポート")
+    parser.add_argument("--workers", type=int, default=1, help="--serve のワーカー数")
+    parser.add_argument(
+        "--database-url",
+        help="プロセス内実行で使うDB (省略時は一時ファイルの SQLite を作成)",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="--database-url のテーブルを作り直して合成データを投入する",
+    )
+    parser.add_argument("--families", type=int, default=20, help="合成データの家族数")
+    parser.add_argument(
+        "--tasks-per-family", type=int, default=500, help="家族あたりの平均タスク数"
+    )
+    parser.add_argument("--labels", type=int, default=8, help="家族あたりのラベル数")
+    parser.add_argument("--seed", type=int, default=42, help="合成データの乱数シード")
+    parser.add_argument("--family-id", type=int, default=1, help="対象の家族ID")
+    parser.add_argument(
+        "--routes", help="計測するルート名 (カンマ区切り、省略時はすべて)"
+    )
+    parser.add_argument("--requests", type=int, default=500, help="ルートごとの件数")
+    parser.add_argument("--concurrency", type=int, default=10, help="同時リクエスト数")
+    parser.add_argument("--warmup", type=int, default=20, help="計測しない事前の件数")
+    parser.add_argument("--baseline", help="比較する前回の結果 (JSON)")
+    parser.add_argument("--output", help="結果の出力先 (省略時は標準出力)")
+    args = parser.parse_args()
+
+    # 仮の認証関数がリクエストごとに標準出力へ警告を表示するため、計測中は標準エラーに回す
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
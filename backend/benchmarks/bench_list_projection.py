@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# --- Path設定 (scripts/ と同様) ---
+script_path = os.path.abspath(__file__)
+benchmarks_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(benchmarks_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.crud.crud_label import (  # noqa: E402
+    get_label_rows_by_family,
+    get_labels_by_family,
+)
+from app.crud.crud_task import (  # noqa: E402
+    get_task_rows_by_family,
+    get_tasks_by_family,
+)
+from app.models import Family, Label, Task, TaskLabel, User  # noqa: E402
+
+# --- 一覧クエリの比較 ---
+# orm:        SQLModel のインスタンスを読み込む (全列 + selectin でのラベル・担当者)
+# projection: 必要な列だけを SELECT して __slots__ の行オブジェクトに詰める (app.crud.rows)
+# 1回の一覧取得あたりの時間と、tracemalloc で計測したピークメモリを比較する。
+
+
+async def seed(session_factory: async_sessionmaker, items: int) -> None:
+    """1家族に items 件のラベルとタスク (各タスクに2ラベル) を作る"""
+    now = datetime.datetime(2024, 4, 1, 9, 30)
+    async with session_factory() as db:
+        await db.execute(insert(Family).values(id=1, family_name="ベンチマーク家"))
+        await db.execute(
+            insert(User).values(id=1, oidc_subject="bench-user", name="ベンチ")
+        )
+        await db.execute(
+            insert(Label),
+            [
+                {
+                    "id": i + 1,
+                    "family_id": 1,
+                    "name": f"ラベル{i:05d}",
+                    "color": "#FFB3BA",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(items)
+            ],
+        )
+        await db.execute(
+            insert(Task),
+            [
+                {
+                    "id": i + 1,
+                    "family_id": 1,
+                    "title": f"タスク{i:05d}",
+                    "notes": "メモ" * 20,
+                    "search_tokens": "たすく めも " * 20,
+                    "due_date": datetime.date(2024, 4, 1)
+                    + datetime.timedelta(days=i % 365),
+                    "assignee_id": 1 if i % 2 else None,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(items)
+            ],
+        )
+        await db.execute(
+            insert(TaskLabel),
+            [
+                {"task_id": i + 1, "label_id": (i + offset) % items + 1}
+                for i in range(items)
+                for offset in (0, 1)
+            ],
+        )
+        await db.commit()
+
+
+async def measure(session_factory: async_sessionmaker, loader, repeat: int) -> dict:
+    """loader(db) を repeat 回実行し、最短時間 (ms) とピークメモリ (KiB) を返す"""
+    timings = []
+    for _ in range(repeat):
+        # セッションごとに新しく読み込む (アイデンティティマップを使い回さない)
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await loader(db)
+            timings.append(time.perf_counter() - start)
+
+    async with session_factory() as db:
+        tracemalloc.start()
+        await loader(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"ms": min(timings) * 1000, "peak_kib": peak / 1024}
+
+
+async def run(items: int, repeat: int) -> dict:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    await seed(session_factory, items)
+
+    cases = {
+        "labels": {
+            "orm": lambda db: get_labels_by_family(db, family_id=1, limit=items),
+            "projection": lambda db: get_label_rows_by_family(
+                db, family_id=1, limit=items
+            ),
+        },
+        "tasks": {
+            "orm": lambda db: get_tasks_by_family(db, family_id=1, limit=items),
+            "projection": lambda db: get_task_rows_by_family(
+                db, family_id=1, limit=items
+            ),
+        },
+    }
+    results = {}
+    for name, loaders in cases.items():
+        results[name] = {
+            path: await measure(session_factory, loader, repeat)
+            for path, loader in loaders.items()
+        }
+        results[name]["speedup"] = (
+            results[name]["orm"]["ms"] / results[name]["projection"]["ms"]
+        )
+        results[name]["memory_ratio"] = (
+            results[name]["orm"]["peak_kib"] / results[name]["projection"]["peak_kib"]
+        )
+    await engine.dispose()
+    return {"items": items, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare ORM loading with column projection for list queries."
+    )
+    parser.add_argument("--items", type=int, default=500, help="1ページの件数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    args = parser.parse_args()
+    report = asyncio.run(run(items=args.items, repeat=args.repeat))
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,84 @@
+import argparse
+import datetime
+import functools
+import json
+import os
+import sys
+import timeit
+
+# --- Path設定 (scripts/ と同様) ---
+script_path = os.path.abspath(__file__)
+benchmarks_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(benchmarks_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.core.serialization import dump_envelope, trusted_label_read  # noqa: E402
+from app.models.label import Label  # noqa: E402
+from app.schemas.label import LabelRead  # noqa: E402
+from app.schemas.response import PaginatedAPIResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+# --- ラベル一覧レスポンスのシリアライズ速度の比較 ---
+# current: ハンドラで PaginatedAPIResponse[LabelRead] を作り、FastAPI が response_model で
+#          再検証して json.dumps する (FastAPI 0.110 の serialize_response と同じ手順)
+# trusted: ORMオブジェクトから辞書を直接組み立てて orjson でJSON化する (app.core.serialization)
+
+# FastAPI はルートの登録時に response_model の TypeAdapter を1度だけ作る
+RESPONSE_MODEL_ADAPTER = TypeAdapter(PaginatedAPIResponse[LabelRead])
+
+
+def build_labels(count: int) -> list[Label]:
+    """DBから読み込んだ状態を模したラベルを count 件作る"""
+    now = datetime.datetime(2024, 4, 1, 9, 30, 15, 123456)
+    return [
+        Label(
+            id=i + 1,
+            family_id=1,
+            name=f"ラベル{i:04d}",
+            color="#FFB3BA" if i % 2 else None,
+            created_at=now,
+            updated_at=now + datetime.timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def current_path(labels: list[Label]) -> bytes:
+    envelope = PaginatedAPIResponse[LabelRead](data=labels, next_cursor=None)
+    validated = RESPONSE_MODEL_ADAPTER.validate_python(envelope.model_dump())
+    content = RESPONSE_MODEL_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def trusted_path(labels: list[Label]) -> bytes:
+    return dump_envelope(
+        [trusted_label_read(label) for label in labels], next_cursor=None
+    )
+
+
+def main(items: int, repeat: int, number: int) -> dict:
+    labels = build_labels(items)
+    # 出力が同じであることを先に確認する
+    assert json.loads(current_path(labels)) == json.loads(trusted_path(labels))
+
+    results = {}
+    for name, func in (("current", current_path), ("trusted", trusted_path)):
+        timings = timeit.repeat(
+            functools.partial(func, labels), repeat=repeat, number=number
+        )
+        results[name] = min(timings) / number * 1000
+    results["speedup"] = results["current"] / results["trusted"]
+    return {"items": items, "ms_per_response": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare APIResponse serialization paths for a label list."
+    )
+    parser.add_argument("--items", type=int, default=500, help="1レスポンスのラベル数")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument("--number", type=int, default=200, help="1回の計測での実行回数")
+    args = parser.parse_args()
+    report = main(items=args.items, repeat=args.repeat, number=args.number)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+# --- Path設定 (scripts/ と同様) ---
+script_path = os.path.abspath(__file__)
+benchmarks_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(benchmarks_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# --- 起動時間のベンチマーク ---
+# インポート時間を正しく測るため、計測は毎回新しいPythonプロセス (--child) で行い、
+# app のモジュールはそのプロセス内で初めてインポートする。1回の起動で次を計測する。
+#
+# import_ms:        app.main のインポート (エンジンはまだ作られない)
+# init_database_ms: エンジン・セッションファクトリの作成 (init_database)
+# startup_ms:       lifespan の起動処理 (接続プールのウォームアップ・OpenAPI の読み込み)
+# first_openapi_ms: 最初の GET /openapi.json (/docs が読み込むスキーマ)
+# first_query_ms:   最初のDBを使うリクエスト (GET /api/v1/families/{id}、認可のクエリ)
+#
+# シナリオ cold はウォームアップなし・スキーマは初回に生成、warm はウォームアップあり・
+# 事前生成した openapi.json を使う。DB は --database-url (省略時は一時ファイルの SQLite)。
+
+SCENARIOS = {
+    "cold": {"warmup": False, "prebuilt_openapi": False},
+    "warm": {"warmup": True, "prebuilt_openapi": True},
+}
+
+METRICS = (
+    "import_ms",
+    "init_database_ms",
+    "startup_ms",
+    "first_openapi_ms",
+    "first_query_ms",
+)
+
+
+async def measure_child(database_url: str) -> Dict[str, float]:
+    """(子プロセス内で) アプリをインポートして起動し、各段階の所要時間を返す"""
+    import httpx
+
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    from app.db.session import init_database
+    from app.main import app
+
+    timings["import_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    # lifespan の init_database はここで作成したものをそのまま使う
+    init_database(database_url)
+    timings["init_database_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = (time.perf_counter() - start) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            start = time.perf_counter()
+            response = await client.get("/openapi.json")
+            response.raise_for_status()
+            timings["first_openapi_ms"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            # 結果 (404 / 403 など) は問わない。認可のクエリが実行されるまでの時間を測る
+            await client.get("/api/v1/families/1")
+            timings["first_query_ms"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def run_child(
+    database_url: str, *, warmup_connections: int, openapi_path: str | None
+) -> Dict[str, float]:
+    """新しいプロセスで --child を実行し、計測結果を返す"""
+    env = dict(os.environ, DB_WARMUP_CONNECTIONS=str(warmup_connections))
+    env.pop("OPENAPI_SCHEMA_PATH", None)
+    if openapi_path:
+        env["OPENAPI_SCHEMA_PATH"] = openapi_path
+    completed = subprocess.run(
+        [sys.executable, script_path, "--child", "--database-url", database_url],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise RuntimeError("Benchmark child process failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """計測結果ごとの中央値と最小値 (ミリ秒)"""
+    return {
+        metric: {
+            "median": statistics.median(sample[metric] for sample in samples),
+            "min": min(sample[metric] for sample in samples),
+        }
+        for metric in METRICS
+    }
+
+
+async def prepare_database(database_url: str) -> None:
+    """一時ファイルの SQLite にテーブルを作成する"""
+    from sqlmodel import SQLModel
+
+    from app.db.session import create_engine_from_settings
+
+    engine = create_engine_from_settings(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
+
+
+def main(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_url = args.database_url
+        if database_url is None:
+            database_url = f"sqlite+aiosqlite:///{temp_dir}/bench.db"
+            with contextlib.redirect_stdout(sys.stderr):
+                asyncio.run(prepare_database(database_url))
+        # 事前生成のスキーマは scripts/export_openapi.py と同じ方法で出力する
+        openapi_path = os.path.join(temp_dir, "openapi.json")
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.join(project_root, "scripts", "export_openapi.py"),
+                "--output",
+                openapi_path,
+            ],
+            cwd=project_root,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+        scenarios = {}
+        for name, scenario in SCENARIOS.items():
+            samples = [
+                run_child(
+                    database_url,
+                    warmup_connections=(
+                        args.warmup_connections if scenario["warmup"] else 0
+                    ),
+                    openapi_path=(
+                        openapi_path if scenario["prebuilt_openapi"] else None
+                    ),
+                )
+                for _ in range(args.repeat)
+            ]
+            scenarios[name] = {**scenario, "results": summarize(samples)}
+            results = scenarios[name]["results"]
+            print(
+                f"{name}: import {results['import_ms']['median']:.0f} ms, "
+                f"startup {results['startup_ms']['median']:.0f} ms, "
+                f"first openapi {results['first_openapi_ms']['median']:.1f} ms",
+                file=sys.stderr,
+            )
+    return {
+        "database_url": args.database_url,
+        "repeat": args.repeat,
+        "warmup_connections": args.warmup_connections,
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure import time, startup time and first-request latency."
+    )
+    parser.add_argument(
+        "--database-url",
+        help="計測に使うDB (テーブル作成済みであること。省略時は一時ファイルの SQLite)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="シナリオごとの起動回数")
+    parser.add_argument(
+        "--warmup-connections",
+        type=int,
+        default=5,
+        help="warm シナリオで起動時に開く接続数",
+    )
+    parser.add_argument("--output", help="結果の出力先 (省略時は標準出力)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # アプリのデバッグ表示が結果のJSONと混ざらないよう、計測中は標準エラーに回す
+        with contextlib.redirect_stdout(sys.stderr):
+            timings = asyncio.run(measure_child(args.database_url))
+        print(json.dumps(timings))
+        sys.exit(0)
+
+    report = main(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
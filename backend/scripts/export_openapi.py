@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+# --- Path設定 (seed_data.py と同様) ---
+script_path = os.path.abspath(__file__)
+scripts_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(scripts_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.core.openapi import dump_openapi  # noqa: E402
+from app.main import app  # noqa: E402
+
+# OpenAPI スキーマを openapi.json に出力する。
+# 設定 OPENAPI_SCHEMA_PATH にこのファイルを指定すると、起動時に読み込まれる。
+# (DBには接続しない。エンドポイントを変更したら出力し直すこと)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the OpenAPI schema of the app to a JSON file."
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join(project_root, "openapi.json"),
+        help="出力先 (省略時はプロジェクトルートの openapi.json)",
+    )
+    args = parser.parse_args()
+    with open(args.output, "wb") as f:
+        f.write(dump_openapi(app))
+    print(f"Wrote OpenAPI schema to {args.output}")
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import sys
+
+# --- Path設定 (seed_data.py と同様) ---
+script_path = os.path.abspath(__file__)
+scripts_dir = os.path.dirname(script_path)
+project_root = os.path.dirname(scripts_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.db.session import dispose_database, get_database  # noqa: E402
+from app.services.recurrence_service import roll_forward_next_occurrences  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(today: datetime.date, chunk_size: int) -> None:
+    """定常タスクの次回発生日を今日以降に進める (cron などから毎晩実行する想定)"""
+    async with get_database().session_factory() as session:
+        updated = await roll_forward_next_occurrences(
+            session, today=today, chunk_size=chunk_size
+        )
+        await session.commit()
+    await dispose_database()
+    logger.info(f"Roll-forward finished: {updated} tasks updated.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Roll next_occurrence_date of routine tasks forward to today."
+    )
+    parser.add_argument(
+        "--today",
+        type=datetime.date.fromisoformat,
+        default=datetime.date.today(),
+        help="基準日 (YYYY-MM-DD、省略時は今日)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=10_000, help="1回に読み込むタスク数"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(today=args.today, chunk_size=args.chunk_size))
@@ -3,7 +3,11 @@ import asyncio
 import datetime  # 日付データ用
 import logging
 import os
+import random
 import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 
 # --- Path設定 (alembic/env.py や tests/conftest.py と同様) ---
 # このスクリプト(seed_data.py)自身の絶対パスを取得
@@ -25,11 +29,10 @@ print(f"DEBUG [Seed Script]: Modified sys.path = {sys.path}")
 # --- ここまで Path設定 --
 
 # --- 必要なものをインポート ---
-from app.db.session import AsyncSessionFactory
+from app.crud import crud_task
 
-# DB接続用のエンジンとセッションファクトリをインポート
-# (conftest.pyとは別に、このスクリプト用に直接作成しても良い)
-from app.db.session import engine as async_engine
+# DB接続用のエンジンとセッションファクトリ (get_database の最初の呼び出しで作成される)
+from app.db.session import dispose_database, get_database
 
 # 必要なモデルとEnumをインポート
 from app.models.family import Family
@@ -40,7 +43,8 @@ from app.models.task_label import TaskLabel
 from app.models.user import User
 
 # RoutineSettings スキーマもインポート (JSONデータ作成用)
-from app.schemas.task import RoutineSettings
+from app.schemas.task import RoutineSettings, TaskCreate
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncEngine  # Engineの型ヒント用
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -168,21 +172,280 @@ async def seed_initial_data(session: AsyncSession):
         raise
 
 
-async def main(reset: bool = False):
+# --- 大量データの生成 (容量・性能試験用) ---
+# 同じ --seed なら同じデータになる。ORMオブジェクトは作らず、チャンクごとに
+# 複数行 INSERT (タスクは crud_task.import_tasks: PostgreSQL では COPY) で
+# 書き込んでコミットする。
+# 保持するのは1チャンク分の行だけなので、件数によらずメモリ使用量は一定。
+
+SURNAMES = "佐藤 鈴木 高橋 田中 伊藤 渡辺 山本 中村 小林 加藤".split()
+GIVEN_NAMES = "太郎 花子 健 さくら 翔 美咲 大輔 陽菜 蓮 結衣".split()
+LABEL_NAMES = "家事 買い物 仕事 学校 子ども ペット お金 健康 車 庭".split()
+LABEL_COLORS = ["#FFB3BA", "#FFDFBA", "#FFFFBA", "#BAFFC9", "#BAE1FF", None]
+TASK_OBJECTS = (
+    "牛乳 ゴミ 洗濯物 お風呂 床 窓 食器 布団 植木 郵便物 "
+    "請求書 宿題 犬の散歩 車検 冷蔵庫 玄関 トイレ 書類 薬 夕飯"
+).split()
+TASK_VERBS = "を買う を片付ける を掃除する を確認する を準備する を出す".split()
+TASK_NOTES = [
+    "忘れずに",
+    "週末までに終わらせる",
+    "なくなりそうなら多めに",
+    "前回は時間がかかったので早めに始める",
+    "終わったら家族に連絡する",
+]
+# ラベル数の分布 (0〜3個) と優先度の分布 (None, 1:高, 2:中, 3:低)
+LABEL_COUNT_WEIGHTS = [0.35, 0.4, 0.2, 0.05]
+PRIORITIES = [None, 1, 2, 3]
+PRIORITY_WEIGHTS = [0.4, 0.15, 0.3, 0.15]
+
+
+@dataclass
+class SyntheticConfig:
+    """大量データ生成の設定 (件数は家族あたり。タスク数は家族ごとにばらつく平均値)"""
+
+    families: int
+    users_per_family: int = 3
+    tasks_per_family: int = 100
+    labels_per_family: int = 8
+    routine_ratio: float = 0.2
+    seed: int = 42
+    chunk_size: int = 5000
+
+
+def _task_count(rng: random.Random, mean: int) -> int:
+    """家族ごとのタスク数 (平均 mean の対数正規分布: 少数の家族が多くのタスクを持つ)"""
+    if mean <= 0:
+        return 0
+    sigma = 0.6
+    return max(1, round(mean * rng.lognormvariate(-(sigma**2) / 2, sigma)))
+
+
+def _routine_settings(rng: random.Random) -> RoutineSettings:
+    repeat_every = rng.choices(
+        ["daily", "weekly", "monthly", "yearly"], weights=[0.2, 0.55, 0.2, 0.05]
+    )[0]
+    if repeat_every == "weekly":
+        weekdays = sorted(rng.sample(range(7), rng.choice([1, 1, 2, 3])))
+        return RoutineSettings(repeat_every=repeat_every, weekdays=weekdays)
+    if repeat_every == "monthly":
+        return RoutineSettings(
+            repeat_every=repeat_every, day_of_month=rng.randint(1, 28)
+        )
+    return RoutineSettings(repeat_every=repeat_every)
+
+
+def _synthetic_task(
+    rng: random.Random,
+    *,
+    config: SyntheticConfig,
+    member_ids: List[int],
+    label_ids: List[int],
+    label_weights: List[float],
+    today: datetime.date,
+) -> TaskCreate:
+    """それらしい分布のタスクを1件作る (期日が過ぎたタスクほど完了済みが多い)"""
+    is_routine = rng.random() < config.routine_ratio
+    due_date = None
+    if rng.random() < 0.7:
+        # 期日は直近に集中させる (過去60日〜未来90日)
+        due_date = today + datetime.timedelta(days=round(rng.triangular(-60, 90, 3)))
+    is_done = rng.random() < (0.8 if due_date and due_date < today else 0.1)
+    label_count = min(
+        len(label_ids),
+        rng.choices(range(len(LABEL_COUNT_WEIGHTS)), weights=LABEL_COUNT_WEIGHTS)[0],
+    )
+    # よく使われるラベルに偏らせる (ラベルの重みは Zipf 分布)
+    labels = set(rng.choices(label_ids, weights=label_weights, k=label_count))
+    return TaskCreate(
+        title=rng.choice(TASK_OBJECTS) + rng.choice(TASK_VERBS),
+        notes=rng.choice(TASK_NOTES) if rng.random() < 0.3 else None,
+        priority=rng.choices(PRIORITIES, weights=PRIORITY_WEIGHTS)[0],
+        due_date=due_date,
+        task_type=TaskType.ROUTINE if is_routine else TaskType.SINGLE,
+        routine_settings=_routine_settings(rng) if is_routine else None,
+        is_done=is_done and not is_routine,
+        assignee_id=(
+            rng.choice(member_ids) if member_ids and rng.random() < 0.7 else None
+        ),
+        label_ids=sorted(labels),
+    )
+
+
+async def _insert_returning_ids(
+    session: AsyncSession, model: Any, rows: List[Dict[str, Any]]
+) -> List[int]:
+    """複数行 INSERT ... RETURNING で行を作り、id を rows の順に返す"""
+    if not rows:
+        return []
+    table = model.__table__
+    result = await session.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+    )
+    return list(result.scalars())
+
+
+async def _seed_family_batch(
+    session: AsyncSession,
+    rng: random.Random,
+    *,
+    config: SyntheticConfig,
+    first_family: int,
+    family_count: int,
+    today: datetime.date,
+) -> int:
+    """family_count 家族分のユーザー・家族・メンバー・ラベル・タスクを作る
+
+    作成したタスク数を返す。
+    """
+    now = datetime.datetime.now()
+    users = []
+    for family_index in range(first_family, first_family + family_count):
+        surname = SURNAMES[family_index % len(SURNAMES)]
+        for user_index in range(config.users_per_family):
+            key = f"{config.seed}.{family_index}.{user_index}"
+            users.append(
+                {
+                    "oidc_subject": f"seed|{key}",
+                    "email": f"seed.{key}@example.com",
+                    "name": f"{surname} {rng.choice(GIVEN_NAMES)}",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+    user_ids = await _insert_returning_ids(session, User, users)
+    family_ids = await _insert_returning_ids(
+        session,
+        Family,
+        [
+            {
+                "family_name": f"{SURNAMES[i % len(SURNAMES)]}家 #{i}",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(first_family, first_family + family_count)
+        ],
+    )
+
+    # 家族ごとのメンバー (先頭のユーザーが管理者) とラベル
+    members_by_family = [
+        user_ids[i * config.users_per_family : (i + 1) * config.users_per_family]
+        for i in range(family_count)
+    ]
+    memberships = [
+        {
+            "user_id": user_id,
+            "family_id": family_id,
+            "role": MembershipRole.ADMIN if index == 0 else MembershipRole.MEMBER,
+            "joined_at": now,
+        }
+        for family_id, member_ids in zip(family_ids, members_by_family)
+        for index, user_id in enumerate(member_ids)
+    ]
+    if memberships:
+        await session.execute(insert(FamilyMembership.__table__), memberships)
+    labels = [
+        {
+            "family_id": family_id,
+            "name": LABEL_NAMES[i % len(LABEL_NAMES)]
+            + (str(i // len(LABEL_NAMES)) if i >= len(LABEL_NAMES) else ""),
+            "color": rng.choice(LABEL_COLORS),
+            "created_by_id": member_ids[0] if member_ids else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for family_id, member_ids in zip(family_ids, members_by_family)
+        for i in range(config.labels_per_family)
+    ]
+    label_ids = await _insert_returning_ids(session, Label, labels)
+    label_weights = [1 / (i + 1) for i in range(config.labels_per_family)]
+
+    task_count = 0
+    for i, (family_id, member_ids) in enumerate(zip(family_ids, members_by_family)):
+        family_label_ids = label_ids[
+            i * config.labels_per_family : (i + 1) * config.labels_per_family
+        ]
+        remaining = _task_count(rng, config.tasks_per_family)
+        while remaining > 0:
+            size = min(remaining, config.chunk_size)
+            tasks_in = [
+                _synthetic_task(
+                    rng,
+                    config=config,
+                    member_ids=member_ids,
+                    label_ids=family_label_ids,
+                    label_weights=label_weights,
+                    today=today,
+                )
+                for _ in range(size)
+            ]
+            await crud_task.import_tasks(
+                session,
+                tasks_in=tasks_in,
+                family_id=family_id,
+                creator_id=member_ids[0] if member_ids else None,
+            )
+            remaining -= size
+            task_count += size
+    return task_count
+
+
+async def seed_synthetic_data(
+    session: AsyncSession, config: SyntheticConfig
+) -> Dict[str, int]:
+    """
+    config に従って大量のデータを作成し、作成件数を返す。
+    家族はタスクが約 chunk_size 件になる単位でまとめて作成し、その単位でコミットする。
+    """
+    rng = random.Random(config.seed)
+    today = datetime.date.today()
+    families_per_batch = max(1, config.chunk_size // max(1, config.tasks_per_family))
+    started = time.perf_counter()
+    task_count = 0
+    for first_family in range(0, config.families, families_per_batch):
+        family_count = min(families_per_batch, config.families - first_family)
+        task_count += await _seed_family_batch(
+            session,
+            rng,
+            config=config,
+            first_family=first_family,
+            family_count=family_count,
+            today=today,
+        )
+        await session.commit()
+        # ORMオブジェクトは作っていないが、念のためセッションが何も保持しないようにする
+        session.expunge_all()
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Seeded {first_family + family_count}/{config.families} families, "
+            f"{task_count} tasks ({task_count / elapsed:.0f} tasks/s)"
+        )
+    return {
+        "families": config.families,
+        "users": config.families * config.users_per_family,
+        "labels": config.families * config.labels_per_family,
+        "tasks": task_count,
+    }
+
+
+async def main(reset: bool = False, synthetic: Optional[SyntheticConfig] = None):
     """メイン処理: リセット（オプション）とシード実行"""
     logger.info("Starting data seeding script...")
     # このスクリプト用にエンジンとセッションファクトリを取得
-    # app.db.session からインポートしたものをそのまま使う
-    global async_engine, AsyncSessionFactory
+    database = get_database()
 
     if reset:
-        await reset_database(async_engine)
+        await reset_database(database.engine)
 
     logger.info("Proceeding to seed data...")
-    async with AsyncSessionFactory() as session:
-        await seed_initial_data(session)
+    async with database.session_factory() as session:
+        if synthetic is None:
+            await seed_initial_data(session)
+        else:
+            counts = await seed_synthetic_data(session, synthetic)
+            logger.info(f"Synthetic data seeded: {counts}")
 
-    await async_engine.dispose()  # スクリプト終了時にエンジンを破棄
+    await dispose_database()  # スクリプト終了時にエンジンを破棄
     logger.info("Data seeding script finished.")
 
 
@@ -194,7 +457,37 @@ if __name__ == "__main__":
         action="store_true",  # --reset が指定されたら True になる
         help="Reset the database (drop and create all tables) before seeding.",
     )
+    # --families を指定すると、固定の初期データの代わりに大量のデータを生成する
+    parser.add_argument(
+        "--families", type=int, help="生成する家族の数 (指定すると大量データを生成)"
+    )
+    parser.add_argument(
+        "--users-per-family", type=int, default=3, help="家族あたりのユーザー数"
+    )
+    parser.add_argument(
+        "--tasks-per-family", type=int, default=100, help="家族あたりの平均タスク数"
+    )
+    parser.add_argument("--labels", type=int, default=8, help="家族あたりのラベル数")
+    parser.add_argument(
+        "--routine-ratio", type=float, default=0.2, help="定常タスクの割合 (0〜1)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="乱数のシード")
+    parser.add_argument(
+        "--chunk-size", type=int, default=5000, help="1回に書き込むタスク数"
+    )
     args = parser.parse_args()
 
+    synthetic_config = None
+    if args.families is not None:
+        synthetic_config = SyntheticConfig(
+            families=args.families,
+            users_per_family=args.users_per_family,
+            tasks_per_family=args.tasks_per_family,
+            labels_per_family=args.labels,
+            routine_ratio=args.routine_ratio,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+        )
+
     # main コルーチンを実行
-    asyncio.run(main(reset=args.reset))
+    asyncio.run(main(reset=args.reset, synthetic=synthetic_config))
@@ -0,0 +1,41 @@
+import orjson
+import pytest
+from app.core.openapi import dump_openapi, load_prebuilt_openapi
+from app.main import app
+from httpx import AsyncClient
+
+# --- 事前生成した OpenAPI スキーマの読み込みのテスト ---
+
+
+@pytest.fixture
+def reset_openapi_schema():
+    app.openapi_schema = None
+    yield
+    # 読み込んだスキーマを後のテストに残さない
+    app.openapi_schema = None
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_openapi_is_served(
+    tmp_path, client: AsyncClient, reset_openapi_schema
+):
+    """読み込んだファイルがそのまま /openapi.json として返されることを確認"""
+    schema = orjson.loads(dump_openapi(app))
+    schema["info"]["description"] = "prebuilt"
+    path = tmp_path / "openapi.json"
+    path.write_bytes(orjson.dumps(schema))
+    app.openapi_schema = None
+
+    assert load_prebuilt_openapi(app, str(path)) is True
+    response = await client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.json()["info"]["description"] == "prebuilt"
+
+
+def test_prebuilt_openapi_with_other_version_is_ignored(tmp_path, reset_openapi_schema):
+    """バージョンが違う (古い) ファイルや存在しないファイルは使わないことを確認"""
+    path = tmp_path / "openapi.json"
+    path.write_bytes(orjson.dumps({"openapi": "3.1.0", "info": {"version": "0.0.0"}}))
+    assert load_prebuilt_openapi(app, str(path)) is False
+    assert load_prebuilt_openapi(app, str(tmp_path / "missing.json")) is False
+    assert app.openapi_schema is None
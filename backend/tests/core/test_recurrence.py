@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from app.core.recurrence import next_occurrence, next_occurrences
+
+# --- 定常タスクの次回発生日の計算のテスト ---
+
+D = datetime.date
+
+
+@pytest.mark.parametrize(
+    ("settings", "after", "anchor", "expected"),
+    [
+        ({"repeat_every": "daily"}, D(2024, 12, 31), None, D(2025, 1, 1)),
+        # 月曜・木曜
+        (
+            {"repeat_every": "weekly", "weekdays": [0, 3]},
+            D(2024, 5, 6),
+            None,
+            D(2024, 5, 9),
+        ),
+        (
+            {"repeat_every": "weekly", "weekdays": [0, 3]},
+            D(2024, 5, 9),
+            None,
+            D(2024, 5, 13),
+        ),
+        # 曜日の指定がなければ期日 (水曜) と同じ曜日
+        ({"repeat_every": "weekly"}, D(2024, 5, 9), D(2024, 5, 1), D(2024, 5, 15)),
+        # 月末を超える日はその月の末日
+        (
+            {"repeat_every": "monthly", "day_of_month": 31},
+            D(2024, 1, 31),
+            None,
+            D(2024, 2, 29),
+        ),
+        (
+            {"repeat_every": "monthly", "day_of_month": 31},
+            D(2023, 2, 1),
+            None,
+            D(2023, 2, 28),
+        ),
+        (
+            {"repeat_every": "monthly", "day_of_month": 31},
+            D(2024, 4, 29),
+            None,
+            D(2024, 4, 30),
+        ),
+        (
+            {"repeat_every": "monthly", "day_of_month": 15},
+            D(2024, 12, 15),
+            None,
+            D(2025, 1, 15),
+        ),
+        # 2/29 は平年では 2/28
+        ({"repeat_every": "yearly"}, D(2024, 3, 1), D(2020, 2, 29), D(2025, 2, 28)),
+        ({"repeat_every": "yearly"}, D(2027, 1, 1), D(2020, 2, 29), D(2027, 2, 28)),
+        ({"repeat_every": "yearly"}, D(2027, 3, 1), D(2020, 2, 29), D(2028, 2, 29)),
+        # 不正な設定は None
+        ({"repeat_every": "hourly"}, D(2024, 1, 1), None, None),
+        (None, D(2024, 1, 1), None, None),
+    ],
+)
+def test_next_occurrence(settings, after, anchor, expected):
+    assert next_occurrence(settings, after=after, anchor=anchor) == expected
+
+
+def test_next_occurrences_batch_matches_single():
+    """配列でまとめて計算しても、1件ずつ計算した結果と一致する"""
+    settings_list = [
+        {"repeat_every": "daily"},
+        {"repeat_every": "weekly", "weekdays": [6]},
+        {"repeat_every": "monthly", "day_of_month": 30},
+        {"repeat_every": "yearly"},
+    ] * 50
+    afters = [D(2024, 1, 1) + datetime.timedelta(days=i * 7) for i in range(200)]
+    anchors = [D(2023, 1, 31) if i % 3 else None for i in range(200)]
+
+    batch = next_occurrences(settings_list, after=afters, anchors=anchors)
+
+    assert batch == [
+        next_occurrence(settings, after=after, anchor=anchor)
+        for settings, after, anchor in zip(settings_list, afters, anchors)
+    ]
+    assert all(result > after for result, after in zip(batch, afters))
@@ -0,0 +1,65 @@
+from app.core.cache import CACHE_HIT, CACHE_MISS, CACHE_STALE, FamilyVersionedCache
+
+# --- 家族のバージョン付きレスポンスキャッシュのテスト ---
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_versioned_cache_hits_only_the_current_version():
+    cache = FamilyVersionedCache(maxsize=10)
+    cache.set(1, 0, "labels:list", (None, 100), "v0")
+
+    assert cache.get(1, 0, "labels:list", (None, 100)) == ("v0", CACHE_HIT)
+    # バージョンが上がれば (stale-while-revalidate なしでは) ミスになる
+    assert cache.get(1, 1, "labels:list", (None, 100)) == (None, CACHE_MISS)
+    assert cache.get(1, 0, "labels:list", (None, 1)) == (None, CACHE_MISS)
+    assert cache.get(2, 0, "labels:list", (None, 100)) == (None, CACHE_MISS)
+
+    # 新しいバージョンを登録すると古いエントリは消え、古いバージョンでの登録は無視される
+    cache.set(1, 1, "labels:list", (None, 100), "v1")
+    cache.set(1, 0, "labels:list", (None, 100), "late-v0")
+    assert len(cache) == 1
+    assert cache.get(1, 1, "labels:list", (None, 100)) == ("v1", CACHE_HIT)
+
+
+def test_versioned_cache_evicts_least_recently_used():
+    cache = FamilyVersionedCache(maxsize=2)
+    cache.set(1, 0, "labels:list", "a", "a")
+    cache.set(1, 0, "labels:list", "b", "b")
+    cache.get(1, 0, "labels:list", "a")
+    cache.set(1, 0, "labels:list", "c", "c")
+
+    assert cache.get(1, 0, "labels:list", "b") == (None, CACHE_MISS)
+    assert cache.get(1, 0, "labels:list", "a") == ("a", CACHE_HIT)
+    assert cache.stats()["evictions"] == 1
+
+    assert cache.invalidate_family(1) == 2
+    assert len(cache) == 0
+
+
+def test_versioned_cache_serves_stale_within_window():
+    timer = FakeTimer()
+    cache = FamilyVersionedCache(maxsize=10, stale_while_revalidate=5.0, timer=timer)
+    cache.set(1, 3, "tasks:list", "q", "v3")
+
+    # バージョンが上がっても、最初に検知してから5秒間は古い値を返す
+    timer.now = 100.0
+    assert cache.get(1, 4, "tasks:list", "q") == ("v3", CACHE_STALE)
+    timer.now = 105.0
+    assert cache.get(1, 4, "tasks:list", "q") == ("v3", CACHE_STALE)
+    timer.now = 105.1
+    assert cache.get(1, 4, "tasks:list", "q") == (None, CACHE_MISS)
+
+    # 再計算は同時に1つだけ
+    assert cache.begin_revalidation(1, "tasks:list", "q") is True
+    assert cache.begin_revalidation(1, "tasks:list", "q") is False
+    cache.set(1, 4, "tasks:list", "q", "v4")
+    cache.end_revalidation(1, "tasks:list", "q")
+    assert cache.get(1, 4, "tasks:list", "q") == ("v4", CACHE_HIT)
+    assert cache.begin_revalidation(1, "tasks:list", "q") is True
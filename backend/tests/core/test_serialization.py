@@ -0,0 +1,123 @@
+import datetime
+
+import orjson
+import pytest
+from app.core import serialization
+from app.core.serialization import (
+    ImportFormatError,
+    dump_envelope,
+    iter_ndjson_records,
+    trusted_label_read,
+    trusted_task_read,
+    type_adapter,
+)
+from app.models.label import Label
+from app.models.task import Task, TaskType
+from app.models.user import User
+from app.schemas.label import LabelRead
+from app.schemas.response import APIResponse, PaginatedAPIResponse
+from app.schemas.task import TaskRead
+
+# --- 検証を省いたシリアライズが通常の経路と同じJSONになることのテスト ---
+
+NOW = datetime.datetime(2024, 4, 1, 9, 30, 15, 123456)
+
+
+def _validated_json(data_type, data, *, paginated=False, **fields) -> dict:
+    """ハンドラ + response_model による通常の経路でのJSON"""
+    model = (PaginatedAPIResponse if paginated else APIResponse)[data_type]
+    return type_adapter(model).dump_python(model(data=data, **fields), mode="json")
+
+
+def test_type_adapter_is_reused():
+    assert type_adapter(LabelRead) is type_adapter(LabelRead)
+
+
+def test_trusted_label_list_matches_validated_output():
+    labels = [
+        Label(
+            id=1,
+            family_id=1,
+            name="買い物",
+            color="#FFB3BA",
+            created_at=NOW,
+            updated_at=NOW,
+        ),
+        Label(id=2, family_id=1, name="掃除", created_at=NOW, updated_at=NOW),
+    ]
+    trusted = orjson.loads(
+        dump_envelope([trusted_label_read(label) for label in labels], next_cursor="c")
+    )
+    assert trusted == _validated_json(
+        LabelRead,
+        [LabelRead.model_validate(label) for label in labels],
+        paginated=True,
+        next_cursor="c",
+    )
+
+
+def test_trusted_task_matches_validated_output():
+    user = User(
+        id=7, oidc_subject="sub", name="花子", avatar_url="https://example.com/a.png"
+    )
+    label = Label(id=3, family_id=1, name="料理", created_at=NOW, updated_at=NOW)
+    tasks = [
+        Task(
+            id=10,
+            family_id=1,
+            title="ゴミ出し",
+            task_type=TaskType.ROUTINE,
+            routine_settings={"repeat_every": "weekly", "weekdays": [0, 3]},
+            due_date=datetime.date(2024, 4, 2),
+            created_at=NOW,
+            updated_at=NOW,
+            assignee=user,
+            labels=[label],
+        ),
+        # 不正な routine_settings は通常の経路と同じく None になる
+        Task(
+            id=11,
+            family_id=1,
+            title="不正な設定",
+            task_type=TaskType.ROUTINE,
+            routine_settings={"repeat_every": "hourly"},
+            notes="メモ",
+            priority=1,
+            created_at=NOW,
+            updated_at=NOW,
+        ),
+    ]
+    trusted = orjson.loads(
+        dump_envelope([trusted_task_read(task) for task in tasks], message="ok")
+    )
+    assert trusted["data"][1]["routine_settings"] is None
+    assert trusted == _validated_json(
+        list[TaskRead], [TaskRead.model_validate(task) for task in tasks], message="ok"
+    )
+
+
+# --- インポートの行分割: 1レコードの上限はチャンクの区切り方によらず適用される ---
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_import_line_cap_applies_across_chunks(monkeypatch):
+    """改行を含むチャンクの後に続く長い行も、上限を超えた時点でエラーになる"""
+    monkeypatch.setattr(serialization, "IMPORT_MAX_RECORD_BYTES", 16)
+    records = iter_ndjson_records(
+        _chunks(b'{"title": "a"}\n{"title": "' + b"x" * 8, b'"}\n')
+    )
+    assert await anext(records) == (1, {"title": "a"})
+    with pytest.raises(ImportFormatError):
+        await anext(records)
+
+    # 上限以内の行は、チャンクをまたいでも1行として読める
+    records = iter_ndjson_records(_chunks(b'{"title":', b' "b"}\n{"title": "c"}'))
+    assert [record async for record in records] == [
+        (1, {"title": "b"}),
+        (2, {"title": "c"}),
+    ]
@@ -0,0 +1,16 @@
+from app.core.text_search import bigram_tokens, build_search_tokens
+
+# --- 全文検索用の文字バイグラム分割のテスト ---
+
+
+def test_bigram_tokens_splits_japanese_and_normalizes():
+    assert bigram_tokens("牛乳を買う") == ["牛乳", "乳を", "を買", "買う"]
+    # 全角英数字・大文字は NFKC + casefold で正規化され、記号・空白は区切りになる
+    assert bigram_tokens("ＡＢ-c 猫") == ["ab", "c", "猫"]
+    assert bigram_tokens(None) == []
+
+
+def test_build_search_tokens_deduplicates_across_texts():
+    assert (
+        build_search_tokens("ゴミ出し", "燃えるゴミ") == "ゴミ ミ出 出し 燃え える るゴ"
+    )
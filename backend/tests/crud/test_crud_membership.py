@@ -0,0 +1,70 @@
+import pytest
+from app.core.cache import membership_cache
+from app.crud import crud_family, crud_membership
+from app.models.family import Family
+from app.models.family_membership import FamilyMembership, MembershipRole
+from app.models.user import User
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- メンバーシップ削除時の認可キャッシュ無効化のテスト ---
+
+
+async def _create_member(db: AsyncSession, user: User) -> FamilyMembership:
+    family = Family(family_name="Family_for_Membership")
+    db.add(family)
+    await db.flush()
+    membership = FamilyMembership(
+        user_id=user.id, family_id=family.id, role=MembershipRole.ADMIN
+    )
+    db.add(membership)
+    await db.commit()
+    return membership
+
+
+@pytest.mark.asyncio
+async def test_delete_membership_invalidates_cache_after_commit(
+    db_session: AsyncSession, test_user: User
+):
+    """削除のフラッシュ後・コミット前にキャッシュし直された古いロールも、コミットで消える"""
+    membership = await _create_member(db_session, test_user)
+    key = (test_user.id, membership.family_id)
+
+    await crud_membership.delete_membership(db_session, db_membership=membership)
+    # コミット前に並行するリクエストが (まだ残っている) ロールを読んでキャッシュした状態
+    membership_cache.set(key, MembershipRole.ADMIN)
+    await db_session.commit()
+
+    assert membership_cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_family_invalidates_cache_after_commit(
+    db_session: AsyncSession, test_user: User
+):
+    """家族の削除も、コミット時にその家族の認可キャッシュをまとめて消す"""
+    membership = await _create_member(db_session, test_user)
+    family_id = membership.family_id
+    other_key = (test_user.id + 1, family_id)
+
+    await crud_membership.delete_membership(db_session, db_membership=membership)
+    await crud_family.delete_family(db_session, family_id=family_id)
+    membership_cache.set(other_key, MembershipRole.MEMBER)
+    await db_session.commit()
+
+    assert membership_cache.get(other_key) is None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_delete_does_not_invalidate_later_commit(
+    db_session: AsyncSession, test_user: User
+):
+    """ロールバックした削除の無効化予定は、次のトランザクションのコミットに持ち越さない"""
+    membership = await _create_member(db_session, test_user)
+    key = (test_user.id, membership.family_id)
+
+    await crud_membership.delete_membership(db_session, db_membership=membership)
+    await db_session.rollback()
+    membership_cache.set(key, MembershipRole.ADMIN)
+    await db_session.commit()
+
+    assert membership_cache.get(key) == MembershipRole.ADMIN
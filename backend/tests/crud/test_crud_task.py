@@ -0,0 +1,44 @@
+import pytest
+from app.crud import crud_task
+from app.models.family import Family
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- タスクの一括 INSERT のテスト ---
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_uses_one_insert_in_parameter_order(
+    db_session: AsyncSession, db_connection: AsyncConnection
+):
+    """件数によらずタスクの INSERT は1文で、IDは tasks_in の順に返る"""
+    family = Family(family_name="Family_for_Task_Insert")
+    db_session.add(family)
+    await db_session.flush()
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    tasks_in = [TaskCreate(title=f"task-{i}") for i in range(5)]
+    sync_engine = db_connection.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record_statement)
+    try:
+        task_ids = await crud_task.import_tasks(
+            db_session, tasks_in=tasks_in, family_id=family.id, creator_id=None
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record_statement)
+
+    inserts = [s for s in statements if s.lstrip().startswith("INSERT INTO task ")]
+    assert len(inserts) == 1
+    titles = (
+        await db_session.exec(select(Task.id, Task.title).where(Task.id.in_(task_ids)))
+    ).all()
+    assert [dict(titles)[task_id] for task_id in task_ids] == [
+        task_in.title for task_in in tasks_in
+    ]
@@ -0,0 +1,45 @@
+import pytest
+from app.crud import crud_task_label
+from app.models.family import Family
+from app.models.label import Label
+from app.models.task import Task, TaskType
+from app.models.task_label import TaskLabel
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- TaskとLabelの一括紐付けのテスト ---
+
+
+@pytest.mark.asyncio
+async def test_add_labels_to_tasks_ignores_existing_links(db_session: AsyncSession):
+    """既存の関連・重複した組は無視され、新たに作成した件数だけが返る"""
+    family = Family(family_name="Family_for_TaskLabel")
+    db_session.add(family)
+    await db_session.flush()
+    tasks = [
+        Task(family_id=family.id, title=f"task-{i}", task_type=TaskType.SINGLE)
+        for i in range(2)
+    ]
+    labels = [Label(family_id=family.id, name=f"label-{i}") for i in range(3)]
+    db_session.add_all(tasks + labels)
+    await db_session.flush()
+
+    first = await crud_task_label.add_label_to_task(
+        db_session, task_id=tasks[0].id, label_id=labels[0].id
+    )
+    assert first.label_id == labels[0].id
+
+    # 2タスク x 3ラベル = 6組 (うち1組は既存、1組は重複指定)
+    links = [(task.id, label.id) for task in tasks for label in labels]
+    inserted = await crud_task_label.add_labels_to_tasks(
+        db_session, links=links + [links[-1]]
+    )
+    assert inserted == 5
+
+    again = await crud_task_label.add_labels_to_task(
+        db_session, task_id=tasks[1].id, label_ids=[label.id for label in labels]
+    )
+    assert again == 0
+
+    result = await db_session.exec(select(TaskLabel))
+    assert len(result.all()) == 6
@@ -0,0 +1,32 @@
+import pytest
+from app.db.pool import InstrumentedAsyncQueuePool, pool_stats
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# --- 接続プールのメトリクスのテスト ---
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_reports_checkouts_and_timeouts(tmp_path):
+    """使用中の接続数・チェックアウト回数・タイムアウト回数が集計されることを確認"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    async with engine.connect():
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 1
+        # プールが枯渇しているので2本目はタイムアウトする
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["max_wait_ms"] >= 50
+    await engine.dispose()
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+from app.db.query_stats import QueryStats, fingerprint, instrument_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+# --- クエリ計測 (スロークエリログ) のテスト ---
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    """リテラル・パラメータ・IN リストの件数が違っても同じフィンガープリントになる"""
+    a = fingerprint("SELECT * FROM label WHERE id IN (1, 2, 3) AND name = 'a'")
+    b = fingerprint("SELECT *  FROM label\nWHERE id IN ($1, $2) AND name = $3")
+    assert a == b == "SELECT * FROM label WHERE id IN (...) AND name = ?"
+
+
+@pytest.mark.asyncio
+async def test_instrument_engine_records_and_logs_slow_queries(caplog):
+    """計測結果が集計され、しきい値を超えたクエリがWARNINGログに出ることを確認"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    stats = QueryStats()
+    # しきい値0msにして全クエリをスロークエリ扱いにする
+    instrument_engine(engine, slow_query_threshold_ms=0, stats=stats)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        async with engine.connect() as conn:
+            for value in (1, 2, 3):
+                await conn.execute(text(f"SELECT {value}"))
+
+    top = stats.top(5)
+    assert top[0]["fingerprint"] == "SELECT ?"
+    assert top[0]["count"] == 3
+    assert "Slow query" in caplog.text
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_instrument_engine_ignores_transaction_control_statements():
+    """SAVEPOINT / RELEASE などのトランザクション制御文はクエリとして数えない"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    stats = QueryStats()
+    instrument_engine(engine, slow_query_threshold_ms=1000, stats=stats)
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SAVEPOINT sp1")
+        await conn.execute(text("SELECT 1"))
+        await conn.exec_driver_sql("RELEASE SAVEPOINT sp1")
+
+    assert [item["fingerprint"] for item in stats.top(5)] == ["SELECT ?"]
+    await engine.dispose()
@@ -0,0 +1,53 @@
+import pytest
+from app.db import session as db_session_module
+from app.db.session import Database, get_read_db
+from app.models.family import Family
+from app.models.user import User
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, select
+
+# --- 読み取り専用セッション (get_read_db) のテスト ---
+# conftest は get_read_db を上書きするため、一時ファイルの SQLite で本物を動かす
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_rejects_writes_and_never_commits(tmp_path, monkeypatch):
+    """get_read_db のセッションでは書き込みがエラーになり、COMMIT も発行されない"""
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'read.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    monkeypatch.setattr(db_session_module, "_database", database)
+
+    statements = []
+    commits = []
+
+    # 読み取り専用エンジンは元のエンジンのイベントも引き継ぐ
+    @event.listens_for(database.engine.sync_engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    @event.listens_for(database.engine.sync_engine, "commit")
+    def _record_commit(conn):
+        commits.append(conn)
+
+    dependency = get_read_db(current_user=User(id=1))
+    session = await anext(dependency)
+    assert (await session.exec(select(Family))).all() == []
+    session.add(Family(family_name="Written Through Read Session"))
+    with pytest.raises(OperationalError, match="read-only"):
+        await session.flush()
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+    # 実行されたのは SELECT だけで、COMMIT は発行されていない
+    assert statements and all(
+        statement.lstrip().upper().startswith("SELECT") for statement in statements
+    )
+    assert commits == []
+
+    # 書き込みは残っていない (プライマリのセッションで確認)
+    async with database.session_factory() as primary_session:
+        assert (await primary_session.exec(select(Family))).all() == []
+
+    await database.dispose()
@@ -0,0 +1,132 @@
+import httpx
+import pytest
+from app.core.middleware import ReadYourWritesMiddleware
+from app.db.routing import (
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesState,
+    ReplicaRouter,
+    current_read_your_writes,
+)
+from app.models.family import Family
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- ReplicaRouter のテスト (2つのSQLiteファイルをプライマリ/レプリカに見立てる) ---
+
+
+@pytest.mark.asyncio
+async def test_replica_router_read_your_writes(tmp_path):
+    """書き込み直後のユーザーはプライマリ、それ以外はレプリカから読むことを確認"""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    router = ReplicaRouter(
+        primary=primary, replicas=[replica], read_your_writes_window=60
+    )
+    Session = sessionmaker(class_=AsyncSession, expire_on_commit=False)
+
+    # プライマリにだけ書き込む (レプリカへの反映が遅れている状態を再現)
+    async with Session(bind=primary) as session:
+        session.add(Family(family_name="Written To Primary"))
+        await session.commit()
+
+    async def count_families(user_id: int) -> int:
+        async with Session(bind=router.read_engine_for(user_id)) as session:
+            result = await session.exec(select(Family))
+            return len(result.all())
+
+    # 書き込み前はレプリカから読む (まだ反映されていない)
+    assert router.read_engine_name_for(1) == "replica-0"
+    assert await count_families(1) == 0
+
+    # 書き込みを記録したユーザーはプライマリから読む
+    router.mark_write(1)
+    assert router.read_engine_name_for(1) == "primary"
+    assert await count_families(1) == 1
+    # 他のユーザーは引き続きレプリカ
+    assert router.read_engine_name_for(2) == "replica-0"
+
+    usage = router.stats()["usage"]
+    assert usage["primary:read"] == 1
+    assert usage["replica-0:read"] == 1
+    assert usage["primary:write"] == 1
+
+    await router.dispose()
+
+
+@pytest.mark.asyncio
+async def test_replica_router_read_your_writes_across_workers(tmp_path):
+    """別のワーカー (ルーター) でも、Cookie の書き込み時刻があればプライマリから読む"""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    now = 1_000_000.0
+    workers = [
+        ReplicaRouter(
+            primary=primary,
+            replicas=[replica],
+            read_your_writes_window=5,
+            clock=lambda: now,
+        )
+        for _ in range(2)
+    ]
+
+    # ワーカー0 で書き込む: プロセス内の記録に加え、レスポンスで返す時刻が設定される
+    write_state = ReadYourWritesState()
+    token = current_read_your_writes.set(write_state)
+    try:
+        workers[0].mark_write(1)
+    finally:
+        current_read_your_writes.reset(token)
+    assert write_state.committed_at == now
+
+    # ワーカー1 にはプロセス内の記録がないが、Cookie の時刻でプライマリに固定される
+    assert workers[1].read_engine_name_for(1) == "replica-0"
+    for client_last_write_at, expected in [
+        (write_state.committed_at, "primary"),
+        (now - 10, "replica-0"),  # 期間切れ
+        (now + 60, "replica-0"),  # 未来の時刻は無視する
+    ]:
+        token = current_read_your_writes.set(
+            ReadYourWritesState(client_last_write_at=client_last_write_at)
+        )
+        try:
+            assert workers[1].read_engine_name_for(1) == expected
+        finally:
+            current_read_your_writes.reset(token)
+
+    await workers[0].dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_middleware_round_trips_cookie():
+    """書き込んだレスポンスで Cookie を返し、次のリクエストでその時刻を読み取る"""
+    router = ReplicaRouter(
+        primary=create_async_engine("sqlite+aiosqlite://"),
+        replicas=[create_async_engine("sqlite+aiosqlite://")],
+        read_your_writes_window=5,
+    )
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(current_read_your_writes.get().client_last_write_at)
+        if scope["method"] == "POST":
+            router.mark_write(None)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(app, window_seconds=5))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/")
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
+        response = await client.post("/")
+        written_at = float(response.cookies[READ_YOUR_WRITES_COOKIE])
+        await client.get("/")
+
+    assert seen == [None, None, written_at]
+
+    await router.dispose()
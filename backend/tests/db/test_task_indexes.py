@@ -0,0 +1,145 @@
+import datetime
+
+import pytest
+from app.crud.crud_task import (
+    build_agenda_candidates_statement,
+    build_task_export_statement,
+    build_task_rows_by_family_statement,
+    build_tasks_by_family_statement,
+)
+from app.models.task import Task
+from app.schemas.task import TaskSortKey
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+
+# --- タスク一覧クエリが複合インデックス・部分インデックスを使うことを EXPLAIN で確認する ---
+
+
+async def _explain(conn, statement) -> str:
+    compiled = statement.compile(conn.sync_connection)
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params.values())
+    )
+    plan = " / ".join(row[3] for row in result.all())
+    print(f"DEBUG [Test]: {plan}")
+    return plan
+
+
+# expected_search: カーソル以降のページでは、カーソルの条件がインデックスの範囲
+# (SEARCH の条件) に含まれていること (残余のフィルタだと毎ページ家族の先頭から読み直す)
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("statement", "expected_index", "expected_search"),
+    [
+        (
+            build_tasks_by_family_statement(family_id=1),
+            "ix_task_family_id_due_date",
+            None,
+        ),
+        (
+            build_tasks_by_family_statement(family_id=1, is_done=False),
+            "ix_task_family_id_is_done_due_date",
+            None,
+        ),
+        (
+            build_tasks_by_family_statement(
+                family_id=1,
+                is_done=False,
+                after=(datetime.date(2024, 1, 1), 10),
+            ),
+            "ix_task_family_id_is_done_due_date",
+            "(family_id=? AND is_done=? AND due_date>?)",
+        ),
+        (
+            build_task_rows_by_family_statement(
+                family_id=1, after=(datetime.date(2024, 1, 1), 10)
+            ),
+            "ix_task_family_id_due_date",
+            "(family_id=? AND due_date>?)",
+        ),
+        (
+            build_task_rows_by_family_statement(family_id=1, after=(None, 10)),
+            "ix_task_family_id_due_date",
+            "(family_id=? AND due_date=? AND id>?)",
+        ),
+        (
+            build_tasks_by_family_statement(family_id=1, sort=TaskSortKey.CREATED_AT),
+            "ix_task_family_id_created_at",
+            None,
+        ),
+        (
+            build_task_rows_by_family_statement(
+                family_id=1,
+                sort=TaskSortKey.CREATED_AT,
+                after=(datetime.datetime(2024, 1, 1, 9, 0), 10),
+            ),
+            "ix_task_family_id_created_at",
+            "(family_id=? AND created_at<?)",
+        ),
+        (
+            build_task_rows_by_family_statement(family_id=1, is_done=False),
+            "ix_task_family_id_is_done_due_date",
+            None,
+        ),
+        (
+            build_task_export_statement(family_id=1),
+            "ix_task_family_id_created_at",
+            None,
+        ),
+        (
+            select(Task)
+            .where(Task.assignee_id == 1, Task.is_done == False)  # noqa: E712
+            .order_by(Task.due_date),
+            "ix_task_assignee_id_is_done_due_date",
+            None,
+        ),
+        (
+            select(Task)
+            .where(Task.family_id == 1, Task.is_done == False)  # noqa: E712
+            .order_by(Task.priority, Task.due_date),
+            "ix_task_open_family_id_priority",
+            None,
+        ),
+    ],
+    ids=[
+        "family-by-due-date",
+        "family-open-by-due-date",
+        "family-open-by-due-date-after-cursor",
+        "family-rows-by-due-date-after-cursor",
+        "family-rows-by-due-date-after-null-cursor",
+        "family-by-created-at",
+        "family-rows-by-created-at-after-cursor",
+        "family-open-rows-with-assignee",
+        "family-export",
+        "assignee-open-by-due-date",
+        "family-open-by-priority",
+    ],
+)
+async def test_task_queries_use_indexes(statement, expected_index, expected_search):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        plan = await _explain(conn, statement)
+    await engine.dispose()
+
+    assert expected_index in plan
+    if expected_search is not None:
+        assert f"USING INDEX {expected_index} {expected_search}" in plan
+    # インデックスの順序でそのまま返せる (メモリ上でのソートが発生しない)
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_agenda_candidates_use_due_date_and_next_occurrence_indexes():
+    """アジェンダの候補取得は、単発・定常それぞれのインデックスを OR で組み合わせる"""
+    statement = build_agenda_candidates_statement(
+        family_id=1, start=datetime.date(2024, 1, 1), end=datetime.date(2024, 1, 31)
+    )
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        plan = await _explain(conn, statement)
+    await engine.dispose()
+
+    assert "ix_task_family_id_due_date" in plan
+    assert "ix_task_family_id_next_occurrence_date" in plan
@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from app.db import session as db_session_module
+from app.db.session import Database, dispose_database, get_database, init_database
+from app.db.warmup import warm_up_database
+from app.models.family_membership import FamilyMembership
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+# --- エンジンの遅延作成と起動時のウォームアップのテスト ---
+
+
+@pytest.mark.asyncio
+async def test_init_database_is_lazy_and_reused(tmp_path):
+    """init_database は1度だけ作成し、dispose_database の後は作り直せることを確認"""
+    await dispose_database()
+    assert db_session_module._database is None
+
+    database = init_database(f"sqlite+aiosqlite:///{tmp_path / 'lazy.db'}")
+    assert get_database() is database
+    assert init_database() is database
+
+    await dispose_database()
+    assert db_session_module._database is None
+
+
+@pytest.mark.asyncio
+async def test_warm_up_database_runs_common_queries(tmp_path):
+    """ウォームアップで接続を開き、一覧・認可のクエリを実行することを確認"""
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    statements = []
+
+    @event.listens_for(database.engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # SQLite は指定によらず1本だけ温める
+    assert await warm_up_database(database, connections=3) == 1
+    assert any("FROM task" in statement for statement in statements)
+    assert any("FROM label" in statement for statement in statements)
+    membership_table = FamilyMembership.__tablename__
+    assert any(membership_table in statement for statement in statements)
+    await database.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_database_failure_does_not_raise(tmp_path, caplog):
+    """テーブルがないなどでウォームアップに失敗しても、起動は続けられることを確認"""
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}")
+    with caplog.at_level(logging.WARNING, logger="app.db.warmup"):
+        assert await warm_up_database(database, connections=1) == 0
+    assert "Database warm-up failed" in caplog.text
+    assert await warm_up_database(database, connections=0) == 0
+    await database.dispose()
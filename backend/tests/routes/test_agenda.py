@@ -0,0 +1,82 @@
+import datetime
+from typing import List
+
+import pytest
+from app.core.cache import occurrence_cache
+from app.models.family import Family
+from app.models.family_membership import FamilyMembership, MembershipRole
+from app.models.user import User
+from app.schemas.agenda import AgendaDay
+from app.schemas.response import APIResponse
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- Agenda API のテスト ---
+
+
+@pytest.mark.asyncio
+async def test_read_agenda_expands_routines(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/agenda/?from=&to=
+    単発タスクは期日に、定常タスクは期間内の各発生日 (月末補正あり) に表示され、
+    2回目以降の同じ期間のリクエストでは展開結果がキャッシュから返る
+    """
+    family = Family(family_name=f"Family_for_Agenda_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    await db_session.commit()
+
+    payload = [
+        {"title": "歯医者", "due_date": "2030-02-10"},
+        {"title": "期間外の予定", "due_date": "2030-04-01"},
+        {
+            "title": "家賃の支払い",
+            "task_type": "routine",
+            "due_date": "2030-01-01",
+            "routine_settings": {"repeat_every": "monthly", "day_of_month": 31},
+        },
+        {
+            "title": "ゴミ出し",
+            "task_type": "routine",
+            "due_date": "2030-02-25",
+            "routine_settings": {"repeat_every": "weekly", "weekdays": [0, 3]},
+        },
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+
+    url = f"/api/v1/families/{family.id}/agenda/"
+    params = {"from": "2030-01-25", "to": "2030-03-03"}
+    response = await authenticated_client.get(url, params=params)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    agenda = APIResponse[List[AgendaDay]](**response.json()).data
+    titles_by_day = {day.date: [task.title for task in day.tasks] for day in agenda}
+    assert titles_by_day == {
+        datetime.date(2030, 1, 31): ["家賃の支払い"],
+        datetime.date(2030, 2, 10): ["歯医者"],
+        datetime.date(2030, 2, 25): ["ゴミ出し"],  # 月曜
+        datetime.date(2030, 2, 28): ["家賃の支払い", "ゴミ出し"],  # 月末・木曜
+    }
+
+    # 同じ期間をもう一度取得すると、定常タスクの展開はキャッシュから返る
+    hits_before = occurrence_cache.stats()["hits"]
+    second = await authenticated_client.get(url, params=params)
+    assert second.json() == response.json()
+    assert occurrence_cache.stats()["hits"] == hits_before + 2
+
+    too_long = await authenticated_client.get(
+        url, params={"from": "2030-01-01", "to": "2030-12-31"}
+    )
+    assert too_long.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
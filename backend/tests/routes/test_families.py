@@ -1,4 +1,5 @@
 import pytest
+from app.core.cache import membership_cache
 from app.models.family import Family
 from app.models.family_membership import FamilyMembership, MembershipRole
 from app.models.user import User
@@ -8,6 +9,8 @@ from app.schemas.family import FamilyCreate, FamilyRead
 from app.schemas.response import APIResponse
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 # --- Family API のテスト ---
@@ -117,3 +120,80 @@ async def test_read_family_not_member(
     error_data = response.json()
     assert "detail" in error_data
     assert "Not authorized" in error_data["detail"]
+
+
+@pytest.mark.asyncio
+async def test_read_family_uses_membership_cache(
+    authenticated_client: AsyncClient, test_user: User, db_session: AsyncSession
+):
+    """家族取得API - 2回目以降の認可チェックがキャッシュから返されることを確認"""
+    family = Family(family_name="Cached Family")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.MEMBER
+        )
+    )
+    await db_session.commit()
+    family_id = family.id
+
+    response1 = await authenticated_client.get(f"/api/v1/families/{family_id}")
+    assert response1.status_code == status.HTTP_200_OK
+    assert membership_cache.get((test_user.id, family_id)) == MembershipRole.MEMBER
+
+    hits_before = membership_cache.hits
+    response2 = await authenticated_client.get(f"/api/v1/families/{family_id}")
+    assert response2.status_code == status.HTTP_200_OK
+    assert membership_cache.hits > hits_before
+
+
+@pytest.mark.asyncio
+async def test_read_family_runs_at_most_one_authorization_query(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    db_connection: AsyncConnection,
+    assert_max_queries,
+):
+    """家族取得API - 認可クエリはキャッシュなしで1回、キャッシュありで0回"""
+    family = Family(family_name="Query Counted Family")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.MEMBER
+        )
+    )
+    await db_session.commit()
+    family_id = family.id
+
+    statements: list[str] = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def authorization_queries() -> int:
+        # メンバーシップのテーブルを参照するクエリ (認可クエリ) の件数
+        count = sum(
+            FamilyMembership.__tablename__ in statement for statement in statements
+        )
+        statements.clear()
+        return count
+
+    sync_engine = db_connection.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record_statement)
+    try:
+        # キャッシュなし: 家族の存在とメンバーシップを1回のJOINで確認する
+        response_cold = await authenticated_client.get(f"/api/v1/families/{family_id}")
+        assert response_cold.status_code == status.HTTP_200_OK
+        assert authorization_queries() == 1
+        assert_max_queries(response_cold, 2)
+
+        # キャッシュあり: 認可クエリは発行しない
+        response_warm = await authenticated_client.get(f"/api/v1/families/{family_id}")
+        assert response_warm.status_code == status.HTTP_200_OK
+        assert authorization_queries() == 0
+        assert_max_queries(response_warm, 2)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record_statement)
@@ -0,0 +1,193 @@
+import pytest
+from app.models.family import Family
+from app.models.family_membership import FamilyMembership, MembershipRole
+from app.models.label import Label
+from app.models.user import User
+from app.schemas.label import LabelRead
+from app.schemas.response import PaginatedAPIResponse
+from fastapi import status
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- Label API のテスト ---
+
+
+@pytest.mark.asyncio
+async def test_read_labels_keyset_pagination(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/labels/
+    カーソルをたどると全ラベルが (name, id) 順に重複なく返り、
+    途中で追加されたラベルもずれない
+    """
+    family = Family(family_name=f"Family_for_Label_List_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    # 同名のラベルも id で順序が決まる
+    names = ["掃除", "買い物", "洗濯", "掃除", "料理", "ゴミ出し", "買い物"]
+    labels = [Label(family_id=family.id, name=name) for name in names]
+    db_session.add_all(labels)
+    await db_session.commit()
+    expected_ids = [
+        label.id for label in sorted(labels, key=lambda label: (label.name, label.id))
+    ]
+
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await authenticated_client.get(
+            f"/api/v1/families/{family.id}/labels/", params=params
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        # 認可 (キャッシュ済みなら家族のバージョン)・ETag用の集計・ラベル取得
+        assert_max_queries(response, 3)
+        page = PaginatedAPIResponse[LabelRead](**response.json())
+        seen_ids.extend(label.id for label in page.data)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+        if len(seen_ids) == 3:
+            # 既に返した範囲 (名前順で先頭) にラベルが追加されても、次のページはずれない
+            db_session.add(Label(family_id=family.id, name="ア"))
+            await db_session.commit()
+    assert seen_ids == expected_ids
+
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/labels/", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_read_labels_conditional_get(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: If-None-Match 付きの GET /api/v1/families/{family_id}/labels/
+    ETag が一致すれば 304 (本文なし)、
+    ラベルが追加・更新されれば 200 で新しい ETag を返す
+    """
+    family = Family(family_name=f"Family_for_Label_ETag_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="買い物")
+    db_session.add(label)
+    await db_session.commit()
+    list_url = f"/api/v1/families/{family.id}/labels/"
+    detail_url = f"/api/v1/families/{family.id}/labels/{label.id}"
+
+    response = await authenticated_client.get(list_url)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = await authenticated_client.get(list_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert_max_queries(response, 2)  # 認可・ETag用の集計 (ラベル本体は読み込まない)
+
+    # ページ指定が違えば別の ETag
+    response = await authenticated_client.get(
+        list_url, params={"limit": 1}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await authenticated_client.get(detail_url)
+    assert response.status_code == status.HTTP_200_OK
+    detail_etag = response.headers["ETag"]
+    response = await authenticated_client.get(
+        detail_url, headers={"If-None-Match": f'"other", {detail_etag}'}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = await authenticated_client.post(list_url, json={"name": "掃除"})
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    response = await authenticated_client.get(list_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["data"]) == 2
+
+    response = await authenticated_client.put(detail_url, json={"color": "#FFB3BA"})
+    assert response.status_code == status.HTTP_200_OK, response.text
+    response = await authenticated_client.get(
+        detail_url, headers={"If-None-Match": detail_etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["color"] == "#FFB3BA"
+
+
+@pytest.mark.asyncio
+async def test_read_labels_response_cache(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/labels/ のレスポンスキャッシュ
+    2回目はキャッシュから返り、ラベルを書き込むと家族のバージョンが上がって再取得される
+    """
+    family = Family(family_name=f"Family_for_Label_Cache_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="買い物")
+    db_session.add(label)
+    await db_session.commit()
+    list_url = f"/api/v1/families/{family.id}/labels/"
+
+    response = await authenticated_client.get(list_url)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["X-Cache"] == "miss"
+
+    response = await authenticated_client.get(list_url)
+    assert response.headers["X-Cache"] == "hit"
+    assert [label["name"] for label in response.json()["data"]] == ["買い物"]
+    # 家族のバージョン・ETag用の集計 (ラベル本体は読まない)
+    assert_max_queries(response, 2)
+
+    # クエリが違えば別のエントリ
+    response = await authenticated_client.get(list_url, params={"limit": 1})
+    assert response.headers["X-Cache"] == "miss"
+
+    response = await authenticated_client.put(
+        f"{list_url}{label.id}", json={"name": "日用品"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    response = await authenticated_client.get(list_url)
+    assert response.headers["X-Cache"] == "miss"
+    assert [label["name"] for label in response.json()["data"]] == ["日用品"]
+
+    response = await authenticated_client.delete(f"{list_url}{label.id}")
+    assert response.status_code == status.HTTP_200_OK, response.text
+    response = await authenticated_client.get(list_url)
+    assert response.headers["X-Cache"] == "miss"
+    assert response.json()["data"] == []
+
+    await db_session.refresh(family)
+    assert family.cache_version == 2  # 更新・削除で1回ずつ
@@ -0,0 +1,39 @@
+import pytest
+from app.core.config import settings
+from fastapi import status
+from httpx import AsyncClient
+
+# --- 内部メトリクスのアクセス制御のテスト ---
+
+QUERIES_URL = "/api/v1/internal/metrics/queries"
+
+
+@pytest.mark.asyncio
+async def test_internal_metrics_are_hidden_by_default(client: AsyncClient, monkeypatch):
+    """無効な場合やトークン未設定の場合は、トークンを付けても 404 になることを確認"""
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_ENABLED", False)
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", "secret")
+    headers = {"Authorization": "Bearer secret"}
+    response = await client.get(QUERIES_URL, headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", None)
+    response = await client.get(QUERIES_URL, headers=headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_internal_metrics_require_token(client: AsyncClient, monkeypatch):
+    """有効な場合も、Bearer トークンが一致しなければ 401 になることを確認"""
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_ENABLED", True)
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", "secret")
+
+    response = await client.get(QUERIES_URL)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.get(QUERIES_URL, headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.get(QUERIES_URL, headers={"Authorization": "Bearer secret"})
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json(), list)
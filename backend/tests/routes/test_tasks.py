@@ -1,17 +1,27 @@
+import csv
+import datetime
+import io
+import json
+from typing import List
+
 import pytest
+from app.core.config import settings
 from app.models.family import Family  # テストデータ準備用
 from app.models.family_membership import (  # テストデータ準備用
     FamilyMembership,
     MembershipRole,
 )
-from app.models.task import TaskType  # Enum
+from app.models.label import Label  # テストデータ準備用
+from app.models.task import Task, TaskType  # Enum
+from app.models.task_label import TaskLabel
 from app.models.user import User  # test_userフィクスチャの型
 
 # --- 必要なモデル、スキーマ、Enumなどをインポート ---
-from app.schemas.response import APIResponse
+from app.schemas.response import APIResponse, PaginatedAPIResponse
 from app.schemas.task import TaskCreate, TaskRead  # 作成・参照スキーマ
 from fastapi import status
 from httpx import AsyncClient
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession  # DBセッション注入用
 
 # --- Task API のテスト ---
@@ -60,9 +70,9 @@ async def test_create_task_success(
 
     # --- Assert (検証) ---
     # 4. ステータスコードの検証
-    assert response.status_code == status.HTTP_201_CREATED, (
-        f"Expected 201, got {response.status_code}. Response: {response.text}"
-    )
+    assert (
+        response.status_code == status.HTTP_201_CREATED
+    ), f"Expected 201, got {response.status_code}. Response: {response.text}"
 
     # 5. レスポンスボディの構造検証 (APIResponse と TaskRead)
     try:
@@ -95,3 +105,675 @@ async def test_create_task_success(
     # assert db_task is not None
     # assert db_task.title == task_payload.title
     # assert db_task.created_by_id == test_user.id # creator_id が設定されているかなど
+
+
+@pytest.mark.asyncio
+async def test_create_task_with_labels_query_budget(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: POST /api/v1/families/{family_id}/tasks/ (ラベル付き)
+    発行されるクエリ件数が想定を超えて増えていないことを確認する
+    """
+    family = Family(family_name=f"Family_for_Task_Query_Budget_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    labels = [Label(family_id=family.id, name=f"label-{i}") for i in range(5)]
+    db_session.add_all(labels)
+    await db_session.commit()
+
+    task_payload = TaskCreate(
+        title="ラベル付きタスク",
+        assignee_id=test_user.id,
+        label_ids=[label.id for label in labels],
+    )
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/", json=task_payload.model_dump()
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    created_task = APIResponse[TaskRead](**response.json()).data
+    assert sorted(created_task.label_ids) == sorted(label.id for label in labels)
+    assert created_task.assignee.id == test_user.id
+    # 認可・タスクINSERT・家族のバージョン更新・refresh・担当者確認(2)・ラベル確認・
+    # ラベル紐付けINSERT(1文) (バージョン更新は1トランザクションで1回だけ)
+    assert_max_queries(response, 8)
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: POST /api/v1/families/{family_id}/tasks/bulk
+    正常系: 複数のタスクを担当者・ラベル付きでまとめて作成できる
+    """
+    family = Family(family_name=f"Family_for_Bulk_Task_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    labels = [Label(family_id=family.id, name=f"bulk-label-{i}") for i in range(3)]
+    db_session.add_all(labels)
+    await db_session.commit()
+
+    payload = [
+        TaskCreate(
+            title=f"一括タスク{i}",
+            assignee_id=test_user.id if i % 2 == 0 else None,
+            label_ids=[label.id for label in labels[: i % 4]],
+        ).model_dump(mode="json")
+        for i in range(10)
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    created_tasks = APIResponse[List[TaskRead]](**response.json()).data
+    assert [task.title for task in created_tasks] == [p["title"] for p in payload]
+    for task, requested in zip(created_tasks, payload):
+        assert task.label_ids == requested["label_ids"]
+        assert (task.assignee.id if task.assignee else None) == requested["assignee_id"]
+    linked = await db_session.exec(
+        select(TaskLabel).where(TaskLabel.task_id.in_([t.id for t in created_tasks]))
+    )
+    assert len(linked.all()) == sum(len(p["label_ids"]) for p in payload)
+    # 認可・参照検証・タスクINSERT・家族のバージョン更新・ラベル紐付けINSERT
+    # (件数によらず一定。タスクが増えても INSERT は1文のまま)
+    assert_max_queries(response, 5)
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_rejects_foreign_label(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """
+    テストケース: POST /api/v1/families/{family_id}/tasks/bulk
+    異常系: 他の家族のラベルが含まれる場合は404となり、タスクは1件も作成されない
+    """
+    family = Family(family_name=f"Family_for_Bulk_Task_Error_{test_user.id}")
+    other_family = Family(family_name=f"Other_Family_{test_user.id}")
+    db_session.add_all([family, other_family])
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    foreign_label = Label(family_id=other_family.id, name="foreign")
+    db_session.add(foreign_label)
+    await db_session.commit()
+
+    payload = [
+        {"title": "OKなタスク"},
+        {"title": "NGなタスク", "label_ids": [foreign_label.id]},
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND, response.text
+    result = await db_session.exec(select(Task).where(Task.family_id == family.id))
+    assert result.all() == []
+
+
+@pytest.mark.asyncio
+async def test_read_tasks_keyset_pagination(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    assert_max_queries,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/tasks/
+    カーソルをたどると全タスクが (期日の昇順, 期日なしは末尾) で重複なく返り、
+    ラベル・担当者の読み込みはページの件数によらず一定のクエリ数で済む
+    """
+    family = Family(family_name=f"Family_for_Task_List_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="list-label")
+    db_session.add(label)
+    await db_session.commit()
+
+    due_dates = [
+        datetime.date(2024, 1, 3),
+        None,
+        datetime.date(2024, 1, 1),
+        datetime.date(2024, 1, 3),
+        None,
+        datetime.date(2024, 1, 2),
+        datetime.date(2024, 1, 1),
+    ]
+    payload = [
+        {
+            "title": f"一覧タスク{i}",
+            "due_date": due_date.isoformat() if due_date else None,
+            "assignee_id": test_user.id,
+            "label_ids": [label.id],
+        }
+        for i, due_date in enumerate(due_dates)
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    created = APIResponse[List[TaskRead]](**response.json()).data
+    expected_ids = [
+        task.id
+        for task in sorted(
+            created, key=lambda t: (t.due_date is None, t.due_date or 0, t.id)
+        )
+    ]
+
+    seen_ids: List[int] = []
+    crossed_null_range = False
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await authenticated_client.get(
+            f"/api/v1/families/{family.id}/tasks/", params=params
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        page = PaginatedAPIResponse[TaskRead](**response.json())
+        # 認可 (キャッシュ済みなら家族のバージョン)・タスクと担当者 (JOIN)・ラベル
+        # 期限日ありの行から期限日なしの行にまたがるページだけは、期限日なしの区間を
+        # 別のインデックス範囲として読むため、タスクのクエリが1回増える
+        due_dates = {task.due_date is None for task in page.data}
+        crosses_null_range = cursor is not None and due_dates == {True, False}
+        assert_max_queries(response, 4 if crosses_null_range else 3)
+        crossed_null_range = crossed_null_range or crosses_null_range
+        for task in page.data:
+            assert task.label_ids == [label.id]
+            assert task.assignee.id == test_user.id
+        seen_ids.extend(task.id for task in page.data)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen_ids == expected_ids
+    assert crossed_null_range
+
+    # 作成日時の新しい順
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "sort": "created_at"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await authenticated_client.get(
+            f"/api/v1/families/{family.id}/tasks/", params=params
+        )
+        page = PaginatedAPIResponse[TaskRead](**response.json())
+        seen_ids.extend(task.id for task in page.data)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen_ids == sorted(expected_ids, reverse=True)
+
+    # 別の並び順のカーソルは受け付けない
+    first_page = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/", params={"limit": 1}
+    )
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/",
+        params={"sort": "created_at", "cursor": first_page.json()["next_cursor"]},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/tasks/search?q=
+    日本語のタイトル・メモを文字バイグラムで検索でき、更新後の内容も検索に反映される
+    """
+    family = Family(family_name=f"Family_for_Task_Search_{test_user.id}")
+    other_family = Family(family_name=f"Other_Family_for_Search_{test_user.id}")
+    db_session.add_all([family, other_family])
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    milk = Task(family_id=family.id, title="牛乳を買う", task_type=TaskType.SINGLE)
+    garbage = Task(
+        family_id=family.id,
+        title="週次のゴミ出し準備",
+        notes="資源ごみと燃えるゴミをまとめる",
+        task_type=TaskType.SINGLE,
+    )
+    bank = Task(family_id=family.id, title="銀行振込", task_type=TaskType.SINGLE)
+    other = Task(
+        family_id=other_family.id, title="牛乳を買う", task_type=TaskType.SINGLE
+    )
+    db_session.add_all([milk, garbage, bank, other])
+    await db_session.commit()
+
+    async def search(q: str) -> List[int]:
+        response = await authenticated_client.get(
+            f"/api/v1/families/{family.id}/tasks/search", params={"q": q}
+        )
+        assert response.status_code == status.HTTP_200_OK, response.text
+        return [task.id for task in APIResponse[List[TaskRead]](**response.json()).data]
+
+    assert await search("牛乳") == [milk.id]  # 他の家族のタスクは含まれない
+    assert await search("燃えるゴミ") == [garbage.id]  # メモも検索対象
+    assert await search("ｺﾞﾐ") == [garbage.id]  # 半角カナも同じ文字として扱う
+    assert await search("振") == [bank.id]  # 1文字はLIKE検索にフォールバック
+    assert await search("牛乳 振込") == []
+
+    # 更新するとインデックスも更新される
+    milk.title = "豆乳を買う"
+    await db_session.commit()
+    assert await search("牛乳") == []
+    assert await search("豆乳") == [milk.id]
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson_and_csv(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    テストケース: GET /api/v1/families/{family_id}/tasks/export?format=ndjson|csv
+    家族の全タスクがラベル・担当者付きで作成順に返り、チャンクの境界をまたいでも欠けない
+    """
+    # チャンクの境界をまたぐように、チャンクを小さくする
+    monkeypatch.setattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2)
+    family = Family(family_name=f"Family_for_Task_Export_{test_user.id}")
+    other_family = Family(family_name=f"Other_Family_for_Export_{test_user.id}")
+    db_session.add_all([family, other_family])
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label_a = Label(family_id=family.id, name="買い物")
+    label_b = Label(family_id=family.id, name="週末")
+    db_session.add_all([label_a, label_b])
+    db_session.add(
+        Task(family_id=other_family.id, title="他の家族", task_type=TaskType.SINGLE)
+    )
+    await db_session.commit()
+
+    payload = [
+        {
+            "title": f"エクスポート{i}",
+            "notes": "カンマ, と\n改行を含むメモ" if i == 0 else None,
+            "due_date": "2024-01-0{}".format(i + 1),
+            "assignee_id": test_user.id if i % 2 == 0 else None,
+            "label_ids": [label_a.id, label_b.id] if i % 2 == 0 else [label_b.id],
+        }
+        for i in range(5)
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    created = APIResponse[List[TaskRead]](**response.json()).data
+
+    # NDJSON: 1行に1つの TaskRead
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/export"
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    exported = [TaskRead(**json.loads(line)) for line in response.text.splitlines()]
+    assert [task.id for task in exported] == [task.id for task in created]
+    for task, expected in zip(exported, created):
+        assert task.label_ids == sorted(expected.label_ids)
+        assert task.assignee == expected.assignee
+        assert task.notes == expected.notes
+
+    # CSV: ヘッダー行 + 1行に1タスク (担当者・ラベルは列に展開)
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/export", params={"format": "csv"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [task.id for task in created]
+    assert rows[0]["notes"] == payload[0]["notes"]
+    assert rows[0]["assignee_id"] == str(test_user.id)
+    assert rows[0]["label_names"] == "買い物;週末"
+    assert rows[1]["assignee_id"] == ""
+    assert rows[1]["label_ids"] == str(label_b.id)
+    assert rows[1]["is_done"] == "false"
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_requires_membership(
+    authenticated_client: AsyncClient, db_session: AsyncSession
+):
+    """テストケース: メンバーでない家族のタスクはエクスポートできない (403)"""
+    family = Family(family_name="Family_without_test_user")
+    db_session.add(family)
+    await db_session.commit()
+
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/export"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def _chunked(body: bytes, size: int = 7):
+    """本文を小さなチャンクに分けて送る (マルチバイト文字や行の途中で区切られる)"""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_ndjson_reports_row_errors(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    テストケース: POST /api/v1/families/{family_id}/tasks/import
+    正しい行だけが (チャンクをまたいでも) 作成され、不正な行は行番号と理由が返る
+    """
+    monkeypatch.setattr(settings, "TASK_IMPORT_CHUNK_SIZE", 2)
+    family = Family(family_name=f"Family_for_Task_Import_{test_user.id}")
+    other_family = Family(family_name=f"Other_Family_for_Import_{test_user.id}")
+    db_session.add_all([family, other_family])
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="引っ越し")
+    foreign_label = Label(family_id=other_family.id, name="他の家族")
+    db_session.add_all([label, foreign_label])
+    await db_session.commit()
+
+    lines = [
+        {"title": "段ボールを捨てる", "label_ids": [label.id]},
+        {"title": "住所変更", "assignee_id": test_user.id, "due_date": "2024-05-01"},
+        "not json",
+        {"notes": "タイトルがない"},
+        {"title": "他の家族のラベル", "label_ids": [foreign_label.id]},
+        {
+            "title": "ゴミ出し",
+            "task_type": "routine",
+            "routine_settings": {"repeat_every": "weekly", "weekdays": [1]},
+        },
+    ]
+    body = "\n".join(
+        line if isinstance(line, str) else json.dumps(line, ensure_ascii=False)
+        for line in lines
+    ).encode()
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/import",
+        content=_chunked(body),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    result = response.json()["data"]
+    assert result["imported"] == 3
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [3, 4, 5]
+    assert result["errors"][1]["errors"][0].startswith("title")
+    assert "label_ids" in result["errors"][2]["errors"][0]
+
+    tasks = (
+        await db_session.exec(
+            select(Task).where(Task.family_id == family.id).order_by(Task.id)
+        )
+    ).all()
+    assert [task.title for task in tasks] == [
+        "段ボールを捨てる",
+        "住所変更",
+        "ゴミ出し",
+    ]
+    assert tasks[1].assignee_id == test_user.id
+    assert tasks[2].next_occurrence_date is not None
+    links = (
+        await db_session.exec(select(TaskLabel).where(TaskLabel.task_id == tasks[0].id))
+    ).all()
+    assert [link.label_id for link in links] == [label.id]
+
+    # インポートしたタスクも検索できる (search_tokens が作られている)
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/search", params={"q": "段ボール"}
+    )
+    assert [task["id"] for task in response.json()["data"]] == [tasks[0].id]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_csv_round_trip(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """
+    テストケース: エクスポートした CSV をそのままインポートすると、同じ内容のタスクが作られる。
+    ヘッダーに title 列がない CSV はリクエスト全体がエラーになり、何も作成されない
+    """
+    family = Family(family_name=f"Family_for_CSV_Import_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="掃除")
+    db_session.add(label)
+    await db_session.commit()
+
+    payload = [
+        {
+            "title": "窓を拭く",
+            "notes": 'カンマ, と\n改行と "引用符" を含むメモ',
+            "assignee_id": test_user.id,
+            "label_ids": [label.id],
+            "priority": 2,
+        },
+        {"title": "床掃除", "is_done": True},
+    ]
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/bulk", json=payload
+    )
+    assert response.status_code == status.HTTP_201_CREATED, response.text
+    export = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/export", params={"format": "csv"}
+    )
+
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/import",
+        params={"format": "csv"},
+        content=_chunked(export.content),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    assert response.json()["data"] == {
+        "imported": 2,
+        "failed": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+
+    response = await authenticated_client.get(
+        f"/api/v1/families/{family.id}/tasks/", params={"sort": "created_at"}
+    )
+    tasks = PaginatedAPIResponse[TaskRead](**response.json()).data
+    imported, originals = tasks[:2], tasks[2:]
+    fields = {"title", "notes", "is_done", "priority", "assignee", "label_ids"}
+    assert sorted(
+        (task.model_dump(include=fields) for task in imported),
+        key=lambda task: task["title"],
+    ) == sorted(
+        (task.model_dump(include=fields) for task in originals),
+        key=lambda task: task["title"],
+    )
+
+    # ヘッダー不正: リクエスト全体が 400 になり、何も作成されない
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/import",
+        params={"format": "csv"},
+        content="name,notes\nタイトルなし,メモ\n".encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    task_ids = (
+        await db_session.exec(select(Task.id).where(Task.family_id == family.id))
+    ).all()
+    assert len(task_ids) == 4
+
+
+@pytest.mark.asyncio
+async def test_import_exported_tasks_into_another_family(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """
+    テストケース: 別の家族のエクスポート (NDJSON) をインポートすると、親タスクは引き継がず、
+    ラベルは取り込み先の家族の同じ名前のラベルになる。同名のラベルがない行はエラー
+    """
+    source = Family(family_name=f"Source_Family_{test_user.id}")
+    target = Family(family_name=f"Target_Family_{test_user.id}")
+    db_session.add_all([source, target])
+    await db_session.flush()
+    db_session.add_all(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+        for family in (source, target)
+    )
+    source_label = Label(family_id=source.id, name="買い物")
+    source_only_label = Label(family_id=source.id, name="元の家族だけ")
+    target_label = Label(family_id=target.id, name="買い物")
+    parent = Task(family_id=source.id, title="週末の準備", task_type=TaskType.SINGLE)
+    db_session.add_all([source_label, source_only_label, target_label, parent])
+    await db_session.flush()
+    child = Task(
+        family_id=source.id,
+        title="牛乳を買う",
+        task_type=TaskType.SINGLE,
+        parent_task_id=parent.id,
+    )
+    unmatched = Task(
+        family_id=source.id, title="元の家族の用事", task_type=TaskType.SINGLE
+    )
+    db_session.add_all([child, unmatched])
+    await db_session.flush()
+    db_session.add_all(
+        [
+            TaskLabel(task_id=child.id, label_id=source_label.id),
+            TaskLabel(task_id=unmatched.id, label_id=source_only_label.id),
+        ]
+    )
+    await db_session.commit()
+
+    export = await authenticated_client.get(
+        f"/api/v1/families/{source.id}/tasks/export"
+    )
+    assert export.status_code == status.HTTP_200_OK
+    response = await authenticated_client.post(
+        f"/api/v1/families/{target.id}/tasks/import",
+        content=_chunked(export.content),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    result = response.json()["data"]
+    assert result["imported"] == 2
+    assert result["failed"] == 1
+    assert "元の家族だけ" in result["errors"][0]["errors"][0]
+
+    tasks = (
+        await db_session.exec(select(Task).where(Task.family_id == target.id))
+    ).all()
+    assert sorted(task.title for task in tasks) == sorted(["週末の準備", "牛乳を買う"])
+    assert all(task.parent_task_id is None for task in tasks)
+    imported_child = next(task for task in tasks if task.title == "牛乳を買う")
+    links = (
+        await db_session.exec(
+            select(TaskLabel).where(TaskLabel.task_id == imported_child.id)
+        )
+    ).all()
+    assert [link.label_id for link in links] == [target_label.id]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_rejects_malformed_label_names(
+    authenticated_client: AsyncClient,
+    test_user: User,
+    db_session: AsyncSession,
+):
+    """テストケース: label_names が文字列のリストでない行は、500 ではなく行のエラーになる"""
+    family = Family(family_name=f"Family_for_Label_Names_{test_user.id}")
+    db_session.add(family)
+    await db_session.flush()
+    db_session.add(
+        FamilyMembership(
+            user_id=test_user.id, family_id=family.id, role=MembershipRole.ADMIN
+        )
+    )
+    label = Label(family_id=family.id, name="家事")
+    db_session.add(label)
+    await db_session.commit()
+
+    lines = [
+        {"title": "混在", "label_names": [1, "家事"]},
+        {"title": "入れ子", "label_names": [["家事"]]},
+        {"title": "数値", "label_names": 5},
+        {"title": "文字列", "label_names": "家事"},
+        {"title": "正しい行", "label_names": ["家事"]},
+    ]
+    body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+    response = await authenticated_client.post(
+        f"/api/v1/families/{family.id}/tasks/import",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_200_OK, response.text
+    result = response.json()["data"]
+    assert result["imported"] == 1
+    assert [error["line"] for error in result["errors"]] == [1, 2, 3, 4]
+    for error in result["errors"]:
+        assert all(message.startswith("label_names") for message in error["errors"])
+
+    tasks = (
+        await db_session.exec(select(Task).where(Task.family_id == family.id))
+    ).all()
+    assert [task.title for task in tasks] == ["正しい行"]
+    links = (
+        await db_session.exec(select(TaskLabel).where(TaskLabel.task_id == tasks[0].id))
+    ).all()
+    assert [link.label_id for link in links] == [label.id]
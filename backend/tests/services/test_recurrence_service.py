@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from app.crud import crud_task
+from app.models.family import Family
+from app.models.task import Task, TaskType
+from app.schemas.task import RoutineSettings, TaskCreate
+from app.services.recurrence_service import roll_forward_next_occurrences
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# --- 定常タスクの次回発生日の一括更新のテスト ---
+
+
+@pytest.mark.asyncio
+async def test_roll_forward_next_occurrences(db_session: AsyncSession):
+    """過ぎた・未設定の次回発生日だけが、今日以降の最初の発生日に進む"""
+    family = Family(family_name="Family_for_Recurrence")
+    db_session.add(family)
+    await db_session.flush()
+    today = datetime.date(2024, 2, 10)
+    monthly = Task(
+        family_id=family.id,
+        title="家賃の支払い",
+        task_type=TaskType.ROUTINE,
+        routine_settings={"repeat_every": "monthly", "day_of_month": 31},
+        next_occurrence_date=datetime.date(2024, 1, 31),
+    )
+    not_due = Task(
+        family_id=family.id,
+        title="ゴミ出し",
+        task_type=TaskType.ROUTINE,
+        routine_settings={"repeat_every": "weekly", "weekdays": [0, 3]},
+        next_occurrence_date=datetime.date(2024, 2, 12),
+    )
+    unset = Task(
+        family_id=family.id,
+        title="水やり",
+        task_type=TaskType.ROUTINE,
+        routine_settings={"repeat_every": "daily"},
+    )
+    single = Task(family_id=family.id, title="単発", task_type=TaskType.SINGLE)
+    db_session.add_all([monthly, not_due, unset, single])
+    await db_session.commit()
+
+    updated = await roll_forward_next_occurrences(db_session, today=today, chunk_size=1)
+    await db_session.commit()
+
+    assert updated == 2
+    result = await db_session.exec(
+        select(Task.id, Task.next_occurrence_date).where(Task.family_id == family.id)
+    )
+    next_dates = dict(result.all())
+    assert next_dates[monthly.id] == datetime.date(2024, 2, 29)
+    assert next_dates[not_due.id] == datetime.date(2024, 2, 12)
+    assert next_dates[unset.id] == today
+    assert next_dates[single.id] is None
+
+
+@pytest.mark.asyncio
+async def test_create_routine_task_sets_next_occurrence(db_session: AsyncSession):
+    """定常タスクの作成時に、期日以降の最初の発生日が設定される"""
+    family = Family(family_name="Family_for_Recurrence_Create")
+    db_session.add(family)
+    await db_session.flush()
+
+    tasks = await crud_task.create_tasks(
+        db_session,
+        tasks_in=[
+            TaskCreate(
+                title="月末の締め",
+                task_type=TaskType.ROUTINE,
+                due_date=datetime.date(2030, 4, 1),
+                routine_settings=RoutineSettings(
+                    repeat_every="monthly", day_of_month=31
+                ),
+            ),
+            TaskCreate(title="単発", due_date=datetime.date(2030, 4, 1)),
+        ],
+        family_id=family.id,
+        creator_id=None,
+    )
+
+    assert tasks[0].next_occurrence_date == datetime.date(2030, 4, 30)
+    assert tasks[1].next_occurrence_date is None